@@ -0,0 +1,292 @@
+import math
+from collections import Counter
+from itertools import accumulate
+from lootbox_sim.loot_table import load_compiled_loot_table
+from lootbox_sim.simulation import DEFAULT_MIMIC_CHANCE
+
+# Completion-time integrals use Gauss-Legendre panels of this width in log(t)
+PANEL_WIDTH = 0.5
+PANEL_POINTS = 8
+
+# expected_inventory() advances at most this many steps, however many opens,
+# and shares one recurrence between chances equal to this many digits
+INVENTORY_STEPS = 64
+INVENTORY_DIGITS = 3
+
+# Chances summing past 1 by less than this are treated as summing to 1
+ROUNDING_TOLERANCE = 1e-9
+
+
+def gauss_legendre(n):
+    """Nodes and weights of n-point Gauss-Legendre quadrature on [-1, 1]"""
+    nodes, weights = [], []
+    for i in range(n):
+        x = math.cos(math.pi * (i + 0.75) / (n + 0.5))
+        for _ in range(100):
+            p0, p1 = 1.0, x
+            for k in range(2, n + 1):
+                p0, p1 = p1, ((2 * k - 1) * x * p1 - (k - 1) * p0) / k
+            derivative = n * (x * p1 - p0) / (x * x - 1)
+            step = p1 / derivative
+            x -= step
+            if abs(step) < 1e-15:
+                break
+        nodes.append(x)
+        weights.append(2 / ((1 - x * x) * derivative * derivative))
+    return nodes, weights
+
+
+GL_NODES, GL_WEIGHTS = gauss_legendre(PANEL_POINTS)
+
+
+def survival(groups, t):
+    """P(some item is still missing at time t) = 1 - prod (1 - e^(-q t))^k.
+
+    groups is a list of (q, k) pairs sorted by q, k being how many items
+    share probability q. Items with q*t > 40 contribute nothing measurable
+    and, once the product is below e^-50, the result is 1.0 to double
+    precision, so most evaluations stop early.
+    """
+    log_product = 0.0
+    for q, k in groups:
+        x = q * t
+        if x > 40:
+            break
+        log_product += k * math.log(-math.expm1(-x))
+        if log_product < -50:
+            return 1.0
+    return -math.expm1(log_product)
+
+
+class LootAnalytics:
+    """Exact drop statistics for a loot table and mimic chance, without simulation.
+
+    Follows the same rules as BatchSimulator: an open is a mimic with
+    probability ``mimic_chance`` (stealing one unit of a uniformly random
+    distinct held item), otherwise an item is drawn by its chance
+    (clipped where the running total passes 1). ``probabilities[i]`` is the chance that a
+    single open yields item i.
+
+    Collection-completion times use the Poissonized coupon collector:
+    with opens arriving as a rate-1 Poisson process, items are collected
+    independently, so P(all collected by t) = prod (1 - e^(-q_i t)). The
+    mean and variance derived from it are exact for discrete opens; CDF
+    and quantiles are those of the Poissonized process, which is very
+    close to the discrete one once t is more than a few opens.
+    """
+
+    def __init__(self, loot_table=None, mimic_chance=DEFAULT_MIMIC_CHANCE):
+        if loot_table is None:
+            loot_table = load_compiled_loot_table().entries
+        self.loot_table = loot_table
+        self.item_names = [item["name"] for item in loot_table]
+        self.index = {name: i for i, name in enumerate(self.item_names)}
+        self.mimic_chance = mimic_chance
+
+        # Each item keeps its own chance (so equal chances stay equal and can
+        # be grouped), clipped where the running total passes 1 by more
+        # than rounding error
+        cumulative = [0.0] + list(accumulate(item["chance"] for item in loot_table))
+        bands = [item["chance"] if item["chance"] <= 1.0 - previous + ROUNDING_TOLERANCE
+                 else max(0.0, 1.0 - previous)
+                 for item, previous in zip(loot_table, cumulative)]
+        self.bands = bands
+        self.probabilities = [(1 - mimic_chance) * band for band in bands]
+        empty = 1.0 - cumulative[-1]
+        self.empty_band = empty if empty > ROUNDING_TOLERANCE else 0.0
+        self.empty_chance = (1 - mimic_chance) * self.empty_band
+
+    def probability(self, name):
+        return self.probabilities[self.index[name]]
+
+    def item_probabilities(self):
+        """Item name -> chance per open"""
+        return dict(zip(self.item_names, self.probabilities))
+
+    def names_with_rarity(self, rarity):
+        return [item["name"] for item in self.loot_table if item.get("rarity") == rarity]
+
+    def rarity_probabilities(self):
+        """Rarity -> chance that one open yields an item of that rarity"""
+        totals = Counter()
+        for item, q in zip(self.loot_table, self.probabilities):
+            totals[item.get("rarity")] += q
+        return dict(totals)
+
+    def chance_of(self, names):
+        return sum(self.probabilities[self.index[name]] for name in names)
+
+    def expected_opens(self, names):
+        """Expected opens until the first drop of any of names (geometric mean 1/q).
+
+        Theft does not delay a first drop, so this is also the expected
+        wait before the item is held for the first time.
+        """
+        q = self.chance_of(names)
+        return 1 / q if q > 0 else math.inf
+
+    def expected_opens_for_rarity(self, rarity):
+        return self.expected_opens(self.names_with_rarity(rarity))
+
+    def first_drop_cdf(self, names, opens):
+        """P(at least one of names drops within `opens` opens)"""
+        q = self.chance_of(names)
+        return -math.expm1(opens * math.log1p(-q)) if q < 1 else 1.0
+
+    def opens_for_confidence(self, names, confidence):
+        """Fewest opens with P(at least one of names drops) >= confidence"""
+        q = self.chance_of(names)
+        if q <= 0:
+            return math.inf
+        if q >= 1:
+            return 1
+        return max(1, math.ceil(math.log1p(-confidence) / math.log1p(-q)))
+
+    def groups(self, names=None):
+        """(probability, multiplicity) pairs sorted by probability.
+
+        Equal probabilities are merged, which is what keeps the completion
+        integrals cheap on large tables where many items share a chance.
+        """
+        names = self.item_names if names is None else names
+        counts = Counter(self.probabilities[self.index[name]] for name in names)
+        if counts.get(0.0):
+            return [(0.0, counts[0.0])]
+        return sorted(counts.items())
+
+    def completion_cdf(self, t, names=None):
+        """P(every item in names has dropped by (Poissonized) open t)"""
+        groups = self.groups(names)
+        if not groups or t <= 0:
+            return 1.0 if not groups else 0.0
+        if groups[0][0] == 0:
+            return 0.0
+        return 1 - survival(groups, t)
+
+    def completion_stats(self, names=None):
+        """Mean and standard deviation of the opens needed to collect every item in names.
+
+        E[T] = int S(t) dt and E[T^2] = int 2t S(t) dt + E[T] (the Poisson
+        correction that turns continuous moments into discrete ones),
+        integrated over log(t) so scales from 1/q_max to 1/q_min all get
+        the same number of quadrature points.
+        """
+        groups = self.groups(names)
+        if not groups:
+            return 0.0, 0.0
+        q_min, q_max = groups[0][0], groups[-1][0]
+        if q_min == 0:
+            return math.inf, math.inf
+        items = sum(k for _, k in groups)
+        t_low = 1e-9 / q_max
+        t_high = (math.log(items) + 40) / q_min
+        u_low, u_high = math.log(t_low), math.log(t_high)
+        panels = max(1, math.ceil((u_high - u_low) / PANEL_WIDTH))
+        half = (u_high - u_low) / panels / 2
+
+        # Below t_low the survival function is 1 to within 1e-9
+        first, second = t_low, t_low * t_low
+        for panel in range(panels):
+            middle = u_low + (2 * panel + 1) * half
+            for node, weight in zip(GL_NODES, GL_WEIGHTS):
+                t = math.exp(middle + half * node)
+                s = survival(groups, t) * t * weight * half
+                first += s
+                second += 2 * t * s
+        mean = first
+        variance = second - mean - mean * mean
+        return mean, math.sqrt(max(0.0, variance))
+
+    def expected_completion(self, names=None):
+        return self.completion_stats(names)[0]
+
+    def completion_quantile(self, p, names=None):
+        """Opens t with P(complete by t) = p, by bisection on completion_cdf"""
+        groups = self.groups(names)
+        if not groups:
+            return 0.0
+        if groups[0][0] == 0:
+            return math.inf
+        low, high = 0.0, 1 / groups[0][0]
+        while 1 - survival(groups, high) < p:
+            low, high = high, high * 2
+        for _ in range(100):
+            middle = (low + high) / 2
+            if 1 - survival(groups, middle) < p:
+                low = middle
+            else:
+                high = middle
+            if high - low <= 1e-9 * high:
+                break
+        return high
+
+    def expected_inventory(self, opens):
+        """Expected count of each item held after `opens` opens, net of theft.
+
+        A mean-field approximation, not an exact result. Per item it tracks
+        the mean count and P(count = 0). A drop raises the count. A mimic
+        picks uniformly among the distinct held items, so item i is taken
+        with probability m * P(held) * E[1 / (1 + other held items)]. That
+        expectation is approximated to second order from the mean and
+        variance of the number of other held items, which are treated as
+        independent. P(count = 1) is estimated by a geometric tail.
+
+        Items whose chances agree to INVENTORY_DIGITS significant digits
+        share one recurrence, and each item's result is scaled by its own
+        chance. Up to INVENTORY_STEPS opens are advanced one at a time;
+        beyond that each step covers opens / INVENTORY_STEPS opens. Costs
+        O(chance groups x min(opens, INVENTORY_STEPS)), whatever the
+        number of opens.
+        """
+        m = self.mimic_chance
+        members = {}
+        for q in self.probabilities:
+            members.setdefault(float(f"{q:.{INVENTORY_DIGITS}g}"), []).append(q)
+        groups = sorted(members)
+        multiplicities = [len(members[key]) for key in groups]
+        chances = [sum(members[key]) / len(members[key]) for key in groups]
+        means = [0.0] * len(groups)
+        empty = [1.0] * len(groups)  # P(count = 0)
+        steps = min(opens, INVENTORY_STEPS)
+        width = opens / steps if steps else 0.0
+        # P(count = 0) relaxes towards its balance point by (1 - q) per
+        # open, applied exactly over a step (an Euler step overshoots for
+        # common items)
+        decays = [(1 - q) ** width for q in chances]
+        for _ in range(steps):
+            held = [1 - zero for zero in empty]
+            total = sum(h * k for h, k in zip(held, multiplicities))
+            variance = sum(h * (1 - h) * k for h, k in zip(held, multiplicities))
+            new_means, new_empty = [], []
+            for q, decay, mean, zero, h in zip(chances, decays, means, empty, held):
+                others = 1 + total - h
+                # Chance that a mimic takes this item, given that it is held
+                steal = m * (1 / others + (variance - h * (1 - h)) / (others * others * others))
+                new_means.append(max(0.0, mean + width * (q - steal * h)))
+                if q > 0:
+                    # Held counts as a geometric tail on 1, 2, ... with the held mean
+                    one = h * h / mean if mean > h else h
+                    settled = min(1.0, one * steal / q)
+                    new_empty.append(settled + (zero - settled) * decay)
+                else:
+                    new_empty.append(zero)
+            means, empty = new_means, new_empty
+        by_group = {key: (mean, q) for key, mean, q in zip(groups, means, chances)}
+        inventory = {}
+        for name, q in zip(self.item_names, self.probabilities):
+            mean, group_chance = by_group[float(f"{q:.{INVENTORY_DIGITS}g}")]
+            inventory[name] = mean * q / group_chance if group_chance > 0 else 0.0
+        return inventory
+
+    def print_report(self, opens=1000):
+        print(f"Mimic chance: {self.mimic_chance:.1%}  Empty chance: {self.empty_chance:.2%}")
+        for rarity, q in sorted(self.rarity_probabilities().items(), key=lambda kv: -kv[1]):
+            print(f"  {rarity}: {q:.3%} per open, first after {1 / q:,.1f} opens on average")
+        mean, std = self.completion_stats()
+        print(f"Collect everything: {mean:,.0f} opens on average (std {std:,.0f})")
+        inventory = self.expected_inventory(opens)
+        print(f"After {opens} opens: {sum(inventory.values()):,.1f} items expected")
+
+
+if __name__ == "__main__":
+    LootAnalytics().print_report()
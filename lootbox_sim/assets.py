@@ -0,0 +1,192 @@
+import io
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ASSET_DIRS = (os.path.join(PROJECT_DIR, "assets"), os.path.join(PROJECT_DIR, "sounds"))
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.gif', '.tga', '.webp')
+SOUND_EXTENSIONS = ('.wav', '.ogg', '.mp3')
+FONT_EXTENSIONS = ('.ttf', '.otf')
+
+# Main-thread time per poll() spent converting finished loads
+POLL_BUDGET = 0.004
+
+
+def asset_kind(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension in IMAGE_EXTENSIONS:
+        return "image"
+    if extension in SOUND_EXTENSIONS:
+        return "sound"
+    if extension in FONT_EXTENSIONS:
+        return "font"
+    return None
+
+
+def decode(path, kind):
+    """Worker-thread half of a load: read and decode without touching the display"""
+    if kind == "image":
+        return pygame.image.load(path)
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+class AssetManager:
+    """Loads images, sounds and fonts on a thread pool, with reference counting.
+
+    load(name) takes a reference and, on the first one, queues the file
+    for a worker thread, which reads and decodes it. poll(), called once
+    per frame on the main thread, finishes at most POLL_BUDGET seconds of
+    loads: images are converted to the display format (convert_alpha()
+    when they have transparency), sounds become mixer Sounds and fonts
+    keep their file bytes for font(). The mixer is started when the first
+    sound is queued; without an audio device sounds stay raw bytes.
+    Assets are released when their last reference is dropped.
+    ``progress`` goes from 0 to 1 as queued loads complete; failed loads
+    count as complete and are listed in ``errors``.
+    """
+
+    def __init__(self, directories=ASSET_DIRS, max_workers=4):
+        self.directories = directories
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="assets")
+        self.refs = {}  # name -> reference count
+        self.assets = {}  # name -> finished asset
+        self.loading = {}  # name -> Future
+        self.decoded = deque()  # (name, kind, future) finished by workers, awaiting poll()
+        self.fonts = {}  # (name, size) -> Font
+        self.errors = {}  # name -> error message
+        self.requested = 0
+        self.completed = 0
+        self.mixer_started = False
+
+    def path_for(self, name):
+        if os.path.isabs(name):
+            return name
+        for directory in self.directories:
+            path = os.path.join(directory, name)
+            if os.path.exists(path):
+                return path
+        return os.path.join(self.directories[0], name)
+
+    def discover(self):
+        """Names of every loadable file under the asset directories"""
+        names = []
+        for directory in self.directories:
+            if not os.path.isdir(directory):
+                continue
+            for root, _, files in os.walk(directory):
+                for file_name in sorted(files):
+                    if asset_kind(file_name):
+                        names.append(os.path.relpath(os.path.join(root, file_name), directory))
+        return names
+
+    def load_all(self):
+        """Queue everything discover() finds; returns the names"""
+        names = self.discover()
+        for name in names:
+            self.load(name)
+        return names
+
+    def load(self, name):
+        """Take a reference to name, queueing it for loading if needed"""
+        self.refs[name] = self.refs.get(name, 0) + 1
+        if name in self.assets or name in self.loading:
+            return
+        kind = asset_kind(name)
+        if kind is None:
+            self.errors[name] = "unsupported file type"
+            return
+        if kind == "sound":
+            self.start_mixer()
+        self.requested += 1
+        future = self.executor.submit(decode, self.path_for(name), kind)
+        self.loading[name] = future
+        future.add_done_callback(lambda done: self.decoded.append((name, kind, done)))
+
+    def start_mixer(self):
+        """Start audio once, on the main thread; run_game leaves it off until a sound is needed"""
+        if self.mixer_started:
+            return
+        self.mixer_started = True
+        if not pygame.mixer.get_init():
+            try:
+                pygame.mixer.init()
+            except pygame.error:
+                pass  # no audio device: sounds stay raw bytes
+
+    def release(self, name):
+        """Drop a reference; the asset is freed with the last one"""
+        count = self.refs.get(name, 0) - 1
+        if count > 0:
+            self.refs[name] = count
+            return
+        self.refs.pop(name, None)
+        self.assets.pop(name, None)
+        for key in [key for key in self.fonts if key[0] == name]:
+            del self.fonts[key]
+
+    def poll(self, budget=POLL_BUDGET):
+        """Finish decoded loads on the main thread; returns how many were finished"""
+        deadline = time.perf_counter() + budget
+        finished = 0
+        while self.decoded:
+            name, kind, future = self.decoded.popleft()
+            self.loading.pop(name, None)
+            self.completed += 1
+            finished += 1
+            try:
+                asset = self.finish(kind, future.result())
+            except (pygame.error, OSError, ValueError) as error:
+                self.errors[name] = str(error)
+            else:
+                if name in self.refs:  # not released while loading
+                    self.assets[name] = asset
+            if time.perf_counter() > deadline:
+                break
+        return finished
+
+    def finish(self, kind, raw):
+        if kind == "image":
+            if pygame.display.get_surface() is None:
+                return raw  # no display mode yet, nothing to convert to
+            if raw.get_flags() & pygame.SRCALPHA or raw.get_colorkey() is not None:
+                return raw.convert_alpha()
+            return raw.convert()
+        if kind == "sound" and pygame.mixer.get_init():
+            return pygame.mixer.Sound(file=io.BytesIO(raw))
+        return raw
+
+    def get(self, name):
+        """The loaded asset, or None while it is still loading (or failed)"""
+        return self.assets.get(name)
+
+    def font(self, name, size):
+        """A Font built from a loaded font file, or None until it is loaded"""
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            data = self.assets.get(name)
+            if data is None:
+                return None
+            font = pygame.font.Font(io.BytesIO(data), size)
+            self.fonts[key] = font
+        return font
+
+    @property
+    def progress(self):
+        return self.completed / self.requested if self.requested else 1.0
+
+    @property
+    def done(self):
+        return self.completed >= self.requested
+
+    def close(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.assets.clear()
+        self.fonts.clear()
+        self.decoded.clear()
+        self.loading.clear()
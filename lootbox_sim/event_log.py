@@ -0,0 +1,168 @@
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+LEVEL_NAMES = {DEBUG: "debug", INFO: "info", WARNING: "warning", ERROR: "error"}
+LEVELS = {name: level for level, name in LEVEL_NAMES.items()}
+
+
+class EventLogger:
+    """Structured event log written by a background thread.
+
+    log() checks the level, then appends a (timestamp, level, event,
+    fields) tuple to a bounded in-memory queue; nothing is formatted or
+    written on the caller's thread. When the queue is full, new records
+    are dropped and counted in ``dropped`` rather than blocking the frame
+    loop. The writer thread drains the queue every `flush_interval`
+    seconds: to `path` as JSON Lines and/or to `stream` as one readable
+    line per record (its "message" field, if it has one).
+    """
+
+    enabled = True
+
+    def __init__(self, path=None, stream=None, level=INFO, capacity=10000, flush_interval=0.25):
+        self.path = path
+        self.stream = stream
+        self.level = level
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.pending = deque()
+        self.dropped = 0
+        self.file = None
+        self.wake = threading.Event()
+        self.stopping = False
+        self.thread = None
+        self.lock = threading.Lock()  # serializes writes (thread vs flush())
+
+    def log(self, level, event, **fields):
+        if level < self.level:
+            return
+        if len(self.pending) >= self.capacity:
+            self.dropped += 1
+            return
+        self.pending.append((time.time(), level, event, fields))
+
+    def debug(self, event, **fields):
+        self.log(DEBUG, event, **fields)
+
+    def info(self, event, **fields):
+        self.log(INFO, event, **fields)
+
+    def warning(self, event, **fields):
+        self.log(WARNING, event, **fields)
+
+    def error(self, event, **fields):
+        self.log(ERROR, event, **fields)
+
+    def start(self):
+        if self.thread is None:
+            if self.path:
+                self.file = open(self.path, 'a', encoding='utf-8')
+            self.thread = threading.Thread(target=self.run, name="event-log", daemon=True)
+            self.thread.start()
+
+    def run(self):
+        while not self.stopping:
+            self.wake.wait(self.flush_interval)
+            self.wake.clear()
+            self.flush()
+
+    def flush(self):
+        """Write every queued record in one batch per output"""
+        with self.lock:
+            records = []
+            while self.pending:
+                records.append(self.pending.popleft())
+            if not records:
+                return
+            if self.file is not None:
+                self.file.write("".join(
+                    json.dumps({"ts": round(ts, 6), "level": LEVEL_NAMES.get(level, level),
+                                "event": event, **fields}, ensure_ascii=False) + "\n"
+                    for ts, level, event, fields in records))
+                self.file.flush()
+            if self.stream is not None:
+                self.stream.write("".join(
+                    str(fields.get("message", event)) + "\n" for _, _, event, fields in records))
+                self.stream.flush()
+
+    def close(self):
+        """Stop the writer and write out everything still queued"""
+        if self.thread is not None:
+            self.stopping = True
+            self.wake.set()
+            self.thread.join()
+            self.thread = None
+        self.flush()
+        if self.dropped and self.file is not None:
+            self.file.write(json.dumps({"ts": round(time.time(), 6), "level": "warning",
+                                        "event": "log_dropped", "records": self.dropped}) + "\n")
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class NullLogger:
+    """Logger that discards everything; each call is a single no-op method call"""
+
+    enabled = False
+    level = ERROR + 1
+
+    def log(self, level, event, **fields):
+        pass
+
+    def debug(self, event, **fields):
+        pass
+
+    def info(self, event, **fields):
+        pass
+
+    def warning(self, event, **fields):
+        pass
+
+    def error(self, event, **fields):
+        pass
+
+    def start(self):
+        pass
+
+    def close(self):
+        pass
+
+
+NULL_LOGGER = NullLogger()
+
+# Process-wide logger, for code without a screen to hold one (e.g. the loot table loader)
+_logger = NULL_LOGGER
+
+
+def get_logger():
+    return _logger
+
+
+def set_logger(logger):
+    global _logger
+    _logger = logger
+
+
+def logger_from_environment(environ=None):
+    """EventLogger configured from LOOTBOX_LOG and LOOTBOX_LOG_LEVEL.
+
+    LOOTBOX_LOG is a JSON Lines file path (default: readable lines on
+    stdout, still written off the frame loop); LOOTBOX_LOG_LEVEL is
+    debug, info, warning, error or off.
+    """
+    environ = os.environ if environ is None else environ
+    level_name = environ.get("LOOTBOX_LOG_LEVEL", "info").lower()
+    if level_name == "off":
+        return NULL_LOGGER
+    path = environ.get("LOOTBOX_LOG")
+    return EventLogger(path=path, stream=None if path else sys.stdout,
+                       level=LEVELS.get(level_name, INFO))
@@ -0,0 +1,39 @@
+from collections import OrderedDict
+import pygame
+
+TEXT_CACHE_SIZE = 256
+
+# Process-wide caches shared by every screen
+_fonts = {}  # (name, size) -> Font
+_text_cache = OrderedDict()  # (font, text, color, antialias) -> Surface
+
+
+def get_font(name, size):
+    """Return a SysFont, looking it up in the system font database only once"""
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.SysFont(name, size)
+        _fonts[key] = font
+    return font
+
+
+def render_text(font, text, color, antialias=True):
+    """Render text with font, reusing the Surface for repeated (text, color) pairs"""
+    key = (font, text, color, antialias)
+    surface = _text_cache.get(key)
+    if surface is not None:
+        _text_cache.move_to_end(key)
+        return surface
+
+    surface = font.render(text, antialias, color)
+    _text_cache[key] = surface
+    if len(_text_cache) > TEXT_CACHE_SIZE:
+        _text_cache.popitem(last=False)
+    return surface
+
+
+def clear():
+    """Drop all cached fonts and text (needed after pygame.quit())"""
+    _fonts.clear()
+    _text_cache.clear()
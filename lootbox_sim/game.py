@@ -1,41 +1,268 @@
+import os
+import random
+import time
 import pygame
 from lootbox_sim.menu import MenuScreen
-from lootbox_sim.game_screen import GameScreen
+from lootbox_sim import fonts
+from lootbox_sim.profiler import FrameProfiler, NULL_PROFILER
+from lootbox_sim.persistence import InventoryJournal
+from lootbox_sim.loop import FixedStepLoop, DEFAULT_STEP
+from lootbox_sim.replay import SessionRecorder
+from lootbox_sim.event_log import NULL_LOGGER, logger_from_environment, set_logger
+from lootbox_sim.startup import StartupTimer, Preloader
+from lootbox_sim.assets import AssetManager
+# The game screen, loot table and telemetry modules are imported on first
+# use (see build_game_screen), keeping them off the path to the first frame
 
-def run_game():
-    pygame.init()
+DEFAULT_SAVE_DIR = os.path.join(os.path.expanduser("~"), ".lootbox_sim")
+
+# Screen actions returned by handle_event -> name of the screen to show
+SCREEN_ACTIONS = {
+    "start_game": "game",
+    "back_to_menu": "menu",
+}
+
+
+class ScreenManager:
+    """Builds each screen once and switches between the live instances.
+
+    Screens keep their state (including the player's inventory) while
+    hidden; enter() and exit() are called on every switch.
+    """
+
+    def __init__(self, factories, profiler=NULL_PROFILER):
+        self.factories = factories  # screen name -> callable building the screen
+        self.profiler = profiler
+        self.screens = {}
+        self.current = None
+        self.current_name = None
+
+    def get(self, name):
+        screen = self.screens.get(name)
+        if screen is None:
+            screen = self.factories[name]()
+            screen.profiler = self.profiler
+            self.screens[name] = screen
+        return screen
+
+    def switch(self, name):
+        if name == self.current_name:
+            return self.current
+        if self.current is not None:
+            self.current.exit()
+        self.current = self.get(name)
+        self.current_name = name
+        self.current.enter()
+        return self.current
+
+
+def run_game(profile=None, trace_path=None, save_dir=None, fixed_step=None, max_frame_skip=5,
+             record_path=None, seed=None, telemetry_path=None, startup=None):
+    """Run the game window.
+
+    Profiling is opt-in: pass profile=True or set LOOTBOX_PROFILE=1 to
+    record per-phase frame timings (F3 toggles the overlay), and pass
+    trace_path or set LOOTBOX_TRACE to write a Chrome trace on exit. A
+    trace alone starts with the overlay hidden.
+
+    The inventory is saved under save_dir (LOOTBOX_SAVE_DIR, default
+    ~/.lootbox_sim); pass save_dir="" to disable saving.
+
+    With fixed_step (seconds, or LOOTBOX_FIXED_HZ), game logic advances
+    in fixed steps of that size, up to max_frame_skip per rendered frame,
+    and drawing interpolates between steps.
+
+    With record_path (or LOOTBOX_RECORD), the session's input is written
+    there for python -m lootbox_sim.replay. Recording always uses a fixed
+    step and a seeded game (seed, LOOTBOX_SEED or a random one), which is
+    what makes the replay exact.
+
+    With telemetry_path (or LOOTBOX_TELEMETRY), drop counts, a chi-square
+    check against the loot table and recent announcements are written
+    there as JSON every second.
+
+    Game events are logged from a background thread: to stdout by
+    default, as JSON Lines to LOOTBOX_LOG, filtered by LOOTBOX_LOG_LEVEL
+    (debug, info, warning, error or off).
+
+    Edits to loot_table.json are picked up while the game runs: a
+    background watcher compiles the new table and the game screen swaps
+    it in between frames. An invalid edit keeps the current table.
+
+    Only the display and font subsystems are initialized. The menu is
+    shown first; the game screen module and loot table are loaded on a
+    background thread once it is up. startup (a StartupTimer) collects
+    time-to-first-frame milestones, which are logged after the first
+    frame. Files under assets/ and sounds/ are loaded on a thread pool
+    while the menu shows a loading bar; Start works before they finish.
+    """
+    if startup is None:
+        startup = StartupTimer()
+    logger = logger_from_environment()
+    set_logger(logger)
+    logger.start()
+
+    if profile is None:
+        profile = bool(os.environ.get("LOOTBOX_PROFILE"))
+    trace_path = trace_path or os.environ.get("LOOTBOX_TRACE")
+    if profile or trace_path:
+        profiler = FrameProfiler(trace=bool(trace_path))
+    else:
+        profiler = NULL_PROFILER
+    # A trace alone records silently; F3 still shows the overlay on demand
+    show_overlay = bool(profile)
+
+    if fixed_step is None and os.environ.get("LOOTBOX_FIXED_HZ"):
+        fixed_step = 1 / float(os.environ["LOOTBOX_FIXED_HZ"])
+    if seed is None and os.environ.get("LOOTBOX_SEED"):
+        seed = int(os.environ["LOOTBOX_SEED"])
+
+    record_path = record_path or os.environ.get("LOOTBOX_RECORD")
+    recorder = None
+    if record_path:
+        fixed_step = fixed_step or DEFAULT_STEP
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        recorder = SessionRecorder(record_path, seed, fixed_step)
+    loop = FixedStepLoop(fixed_step, max_frame_skip) if fixed_step else None
+
+    if save_dir is None:
+        save_dir = os.environ.get("LOOTBOX_SAVE_DIR", DEFAULT_SAVE_DIR)
+    journal = InventoryJournal(save_dir) if save_dir else None
+
+    telemetry_path = telemetry_path or os.environ.get("LOOTBOX_TELEMETRY")
+    telemetry = None
+    if telemetry_path:
+        from lootbox_sim.telemetry import DropTelemetry
+        telemetry = DropTelemetry(telemetry_path)
+    preloader = Preloader()
+    watchers = []
+
+    def build_game_screen():
+        from lootbox_sim.game_screen import GameScreen
+        from lootbox_sim.loot_table import LOOT_TABLE_PATH, LootTableWatcher
+        game_screen = GameScreen(WINDOW_WIDTH, WINDOW_HEIGHT, seed=seed, loot_table=preloader.result())
+        if journal is not None:
+            journal.attach(game_screen.inventory)
+            game_screen.restore_sold(journal.sold)
+            game_screen.stock_listeners.append(journal.record)
+        if recorder is not None:
+            recorder.record_inventory(game_screen.inventory.items, game_screen.sold)
+            recorder.record_loot_table(game_screen.compiled_loot_table)
+            game_screen.reload_listeners.append(
+                lambda loot_table: recorder.record_loot_table(loot_table, loop.steps))
+        if telemetry is not None:
+            game_screen.attach_telemetry(telemetry)
+            telemetry.start()
+        watcher = LootTableWatcher(LOOT_TABLE_PATH, game_screen.compiled_loot_table.digest,
+                                   current=game_screen.compiled_loot_table)
+        game_screen.watch_loot_table(watcher)
+        watcher.start()
+        watchers.append(watcher)
+        return game_screen
+
+    # pygame.init() would also start audio, joystick and other subsystems
+    # the game never uses
+    pygame.display.init()
+    pygame.font.init()
     WINDOW_WIDTH, WINDOW_HEIGHT = 800, 600
     screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
     pygame.display.set_caption("Loot Box Simulator")
+    startup.mark("display")
+    # Requested after set_mode so finished images convert to the display format
+    assets = AssetManager()
+    assets.load_all()
     clock = pygame.time.Clock()
     FPS = 60
 
+    # Each screen is built on first use and then kept alive
+    screens = ScreenManager({
+        "menu": lambda: MenuScreen(WINDOW_WIDTH, WINDOW_HEIGHT, assets),
+        "game": build_game_screen,
+    }, profiler)
+
     # Start with menu
-    current_screen = MenuScreen(WINDOW_WIDTH, WINDOW_HEIGHT)
+    current_screen = screens.switch("menu")
+
+    force_redraw = True
 
     running = True
     while running:
         dt = clock.tick(FPS) / 1000
+        frame_start = time.perf_counter()
 
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
+        with profiler.phase("events"):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                    force_redraw = True
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3 and profiler.enabled:
+                    show_overlay = not show_overlay
+                    force_redraw = True
+                else:
+                    if recorder is not None:
+                        recorder.record(loop.steps, event)
+                    action = current_screen.handle_event(event)
+
+                    # Screen switching
+                    if action in SCREEN_ACTIONS:
+                        current_screen = screens.switch(SCREEN_ACTIONS[action])
+                        force_redraw = True
+                    elif action == "quit":
+                        running = False
+
+        with profiler.phase("update"):
+            # Finish background loads every frame, whichever screen is up
+            assets.poll()
+            if loop is None:
+                current_screen.update(dt)
             else:
-                action = current_screen.handle_event(event)
-
-                # Screen switching
-                if action == "start_game":
-                    current_screen = GameScreen(WINDOW_WIDTH, WINDOW_HEIGHT)
-                elif action == "back_to_menu":
-                    current_screen = MenuScreen(WINDOW_WIDTH, WINDOW_HEIGHT)
-                elif action == "quit":
+                loop.advance(dt, current_screen.update)
+                current_screen.set_render_offset(loop.alpha * loop.step)
+
+        # Only redraw when something changed; idle frames cost nothing.
+        # The overlay shows live numbers, so it forces a redraw every frame.
+        dirty_rects = current_screen.get_dirty_rects()
+        if force_redraw or show_overlay or dirty_rects is None:
+            with profiler.phase("draw"):
+                screen.fill((50, 50, 50))
+                current_screen.draw(screen)
+                if show_overlay:
+                    profiler.draw_overlay(screen, fonts.get_font(None, 20))
+            with profiler.phase("flip"):
+                pygame.display.flip()
+            force_redraw = False
+            if "first_frame" not in startup.marks:
+                startup.mark("first_frame")
+                logger.info("startup", message="Startup:\n" + startup.report(),
+                            **{name: round(seconds, 4) for name, seconds in startup.marks.items()})
+                preloader.start()
+                if startup.exit_after_first_frame:
                     running = False
+        elif dirty_rects:
+            with profiler.phase("draw"):
+                screen.fill((50, 50, 50))
+                current_screen.draw(screen)
+            with profiler.phase("flip"):
+                pygame.display.update(dirty_rects)
 
-        current_screen.update(dt)
-        screen.fill((50, 50, 50))
-        current_screen.draw(screen)
-        pygame.display.flip()
+        profiler.record("frame", frame_start, time.perf_counter())
 
+    if journal is not None:
+        journal.close()
+    if recorder is not None:
+        recorder.close(loop.steps)
+    if telemetry is not None:
+        telemetry.close()
+    for watcher in watchers:
+        watcher.close()
+    assets.close()
+    logger.close()
+    set_logger(NULL_LOGGER)
+    if trace_path:
+        profiler.dump_chrome_trace(trace_path)
+    fonts.clear()
     pygame.quit()
 
 
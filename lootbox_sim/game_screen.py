@@ -1,29 +1,95 @@
 import pygame
 import random
-import json
-import os
 import math
-from lootbox_sim.inventory import Inventory
+from lootbox_sim.inventory import CompactInventory
+from lootbox_sim.loot_table import CompiledLootTable, compile_loot_table, load_compiled_loot_table
+from lootbox_sim.simulation import BatchSimulator, SimulationResult
+from lootbox_sim.icon_cache import IconCache
+from lootbox_sim.inventory_view import SortedInventoryView
+from lootbox_sim.fonts import get_font, render_text
+from lootbox_sim.profiler import NULL_PROFILER
+from lootbox_sim.telemetry import NULL_TELEMETRY
+from lootbox_sim.event_log import get_logger
+from lootbox_sim.particles import ParticlePool, SPARKLE, GOLD, MAGENTA, RED
+
+# Particle burst per drop rarity: (count, speed, color)
+DROP_BURSTS = {
+    "common": (30, 120, SPARKLE),
+    "uncommon": (80, 160, SPARKLE),
+    "epic": (300, 220, GOLD),
+    "legendary": (1500, 300, GOLD),
+}
+
+# Keys for opening many boxes at once, see open_loot_boxes()
+BULK_OPEN_KEYS = {pygame.K_1: 10, pygame.K_2: 100, pygame.K_3: 1000}
+# Rarest drops listed under the popup after a bulk open
+BULK_SUMMARY_ITEMS = 5
 
 class GameScreen:
-    def __init__(self, width, height):
+    def __init__(self, width, height, seed=None, loot_table=None):
         self.width = width
         self.height = height
-        self.font = pygame.font.SysFont(None, 48)
+        self.font = get_font(None, 48)
+
+        # Game randomness (mimics, drops, thefts). With a seed the whole
+        # session is reproducible; without one the global random module is
+        # used. Visual effects draw from their own generator so the frame
+        # rate never shifts the game's random sequence.
+        self.seed = seed
+        self.rng = random.Random(seed) if seed is not None else random
+        self.effects_rng = random.Random(seed)
 
         # Loot box rectangle (make it bigger for the chest)
         self.loot_box_rect = pygame.Rect(width//2 - 75, height//2 - 60, 150, 120)
 
-        # Inventory
-        self.inventory = Inventory()
+        # Pre-rendered static chest parts, see get_chest_layers()
+        self.chest_layers = None
+        self.needs_redraw = True
+
+        # Extra seconds added to animation timers when drawing, so a
+        # fixed-step loop can render between simulation steps
+        self.render_time_offset = 0.0
+
+        # Sparkles and drop bursts
+        self.particles = ParticlePool(rng=self.effects_rng)
+
+        # Timing hooks for draw sub-steps; run_game swaps in a FrameProfiler
+        self.profiler = NULL_PROFILER
+
+        # Drop counters; see attach_telemetry()
+        self.telemetry = NULL_TELEMETRY
+
+        # Structured game events (drops, mimics), written off the frame loop
+        self.logger = get_logger()
+
+        # Inventory; held items are kept in a swap-remove list, so a mimic
+        # picks what to steal in O(1)
+        self.inventory = CompactInventory()
         self.show_inventory = False  # toggle display
+        # Grid order (rarest first by default), kept sorted as items change
+        self.inventory_view = SortedInventoryView(
+            self.inventory, lambda name: self.item_index.get(name).rarity)
 
-        # Load loot table from JSON
-        self.loot_table = self.load_loot_table()
+        # Icons are rendered once per (item, size) and then blitted
+        self.icon_cache = IconCache(self.draw_item_icon)
+
+        # Drops taken from limited-stock items, by name, so sales carry over
+        # reloads and (through stock_listeners) saves
+        self.sold = {}
+        self.stock_listeners = []  # callables taking ("sold", item_name), once per unit
+
+        # Load loot table from JSON (unless one was preloaded) and precompile its sampler
+        self.item_index = None
+        self.set_loot_table(loot_table if loot_table is not None else self.load_loot_table())
+
+        # Optional LootTableWatcher; new tables are swapped in by update()
+        self.loot_table_watcher = None
+        self.reload_listeners = []  # callables taking the swapped-in CompiledLootTable
 
         # Popup
         self.popup_text = ""
         self.popup_timer = 0
+        self.bulk_summary = []  # rarest drops of the last bulk open, shown with its popup
 
         # Chest opening animation
         self.chest_is_opening = False
@@ -37,6 +103,7 @@ class GameScreen:
         self.mimic_revealed = False
         self.mimic_timer = 0
         self.mimic_duration = 3.0  # 3 seconds mimic display
+        self.mimic_shake = (0, 0)  # offset of the revealed mimic, rolled in update()
         
         # Hilarious mimic roast lines (shorter for better screen fit)
         self.mimic_roasts = [
@@ -62,37 +129,15 @@ class GameScreen:
         self.inventory_slot_size = 60
         self.inventory_start_x = 50
         self.inventory_start_y = 200
+        self.inventory_scroll_row = 0  # first visible grid row
 
     def get_item_category(self, item_name):
-        """Categorize items based on their name"""
-        item_lower = item_name.lower()
-        
-        # Check legendary first (highest priority)
-        if any(legendary in item_lower for legendary in ['dragon', 'legendary', 'epic', 'universe', 'cosmic', 'infinity', 'god']):
-            return 'legendary'
-        
-        # Weapons
-        elif any(weapon in item_lower for weapon in ['sword', 'blade', 'dagger', 'bow', 'crossbow', 'staff', 'excalibur']):
-            return 'weapon'
-        
-        # Armor & Protection
-        elif any(armor in item_lower for armor in ['shield', 'armor', 'mail', 'helmet', 'boots', 'gauntlets', 'cloak']):
-            return 'armor'
-        
-        # Accessories
-        elif any(accessory in item_lower for accessory in ['ring', 'amulet', 'crown', 'crystal', 'orb', 'gauntlet']):
-            return 'accessory'
-        
-        # Consumables
-        elif any(consumable in item_lower for consumable in ['potion', 'scroll', 'feather']):
-            return 'consumable'
-        
-        # Default to misc
-        return 'misc'
+        """Categorize items using the loot table's item index"""
+        return self.item_index.get(item_name).category
 
     def draw_item_icon(self, surface, item_name, x, y, size=40):
-        """Draw an icon for the given item based on its category"""
-        category = self.get_item_category(item_name)
+        """Draw an icon for the given item based on its icon shape"""
+        icon = self.item_index.get(item_name).icon
         center_x = x + size // 2
         center_y = y + size // 2
         
@@ -100,79 +145,74 @@ class GameScreen:
         pygame.draw.circle(surface, (50, 50, 50), (center_x, center_y), size // 2)
         pygame.draw.circle(surface, (100, 100, 100), (center_x, center_y), size // 2, 2)
         
-        if category == 'weapon':
-            # Draw a sword icon
-            if 'bow' in item_name.lower() or 'crossbow' in item_name.lower():
-                # Bow shape
-                pygame.draw.arc(surface, (139, 90, 43), 
-                               (x + 8, y + 8, size - 16, size - 16), 0.5, 2.6, 3)
-                pygame.draw.line(surface, (139, 90, 43), 
-                               (center_x, y + 12), (center_x, y + size - 12), 2)
-            elif 'staff' in item_name.lower():
-                # Staff shape
-                pygame.draw.line(surface, (139, 90, 43), 
-                               (center_x, y + 8), (center_x, y + size - 8), 4)
-                pygame.draw.circle(surface, (255, 215, 0), (center_x, y + 12), 6)
-            else:
-                # Sword shape
-                pygame.draw.line(surface, (192, 192, 192), 
-                               (center_x, y + 8), (center_x, y + size - 12), 3)
-                pygame.draw.rect(surface, (139, 90, 43), 
-                               (center_x - 4, y + size - 12, 8, 6))
-                
-        elif category == 'armor':
-            if 'shield' in item_name.lower():
-                # Shield shape
-                pygame.draw.ellipse(surface, (100, 100, 100), 
-                                  (x + 10, y + 10, size - 20, size - 20))
-                pygame.draw.ellipse(surface, (150, 150, 150), 
-                                  (x + 10, y + 10, size - 20, size - 20), 2)
-            elif 'boots' in item_name.lower():
-                # Boot shape
-                pygame.draw.ellipse(surface, (139, 90, 43), 
-                                  (x + 12, y + 18, size - 24, size - 30))
-                pygame.draw.rect(surface, (139, 90, 43), 
-                               (x + 12, y + 25, size - 24, 8))
-            else:
-                # Generic armor (chest piece)
-                pygame.draw.rect(surface, (100, 100, 100), 
-                               (x + 12, y + 12, size - 24, size - 24))
-                pygame.draw.rect(surface, (150, 150, 150), 
-                               (x + 12, y + 12, size - 24, size - 24), 2)
-                
-        elif category == 'accessory':
-            if 'ring' in item_name.lower():
-                # Ring shape
-                pygame.draw.circle(surface, (255, 215, 0), (center_x, center_y), 8, 3)
-                pygame.draw.circle(surface, (255, 255, 0), (center_x, center_y - 4), 3)
-            elif 'crown' in item_name.lower():
-                # Crown shape
-                points = [(x + 10, y + 25), (x + 15, y + 15), (x + 20, y + 20), 
-                         (x + 25, y + 10), (x + 30, y + 20), (x + 35, y + 15), (x + 40, y + 25)]
-                pygame.draw.polygon(surface, (255, 215, 0), points)
-            else:
-                # Generic accessory (crystal/orb)
-                pygame.draw.polygon(surface, (100, 200, 255), 
-                                  [(center_x, y + 10), (x + 12, center_y), 
-                                   (center_x, y + size - 10), (x + size - 12, center_y)])
-                
-        elif category == 'consumable':
-            if 'potion' in item_name.lower():
-                # Potion bottle
-                pygame.draw.rect(surface, (100, 255, 100), 
-                               (x + 15, y + 15, size - 30, size - 25))
-                pygame.draw.rect(surface, (50, 150, 50), 
-                               (x + 17, y + 12, size - 34, 6))
-            else:
-                # Scroll
-                pygame.draw.rect(surface, (245, 245, 220), 
-                               (x + 10, y + 12, size - 20, size - 24))
-                pygame.draw.line(surface, (139, 90, 43), 
-                               (x + 15, y + 18), (x + size - 15, y + 18), 1)
-                pygame.draw.line(surface, (139, 90, 43), 
-                               (x + 15, y + 22), (x + size - 15, y + 22), 1)
-                
-        elif category == 'legendary':
+        if icon == 'bow':
+            # Bow shape
+            pygame.draw.arc(surface, (139, 90, 43), 
+                           (x + 8, y + 8, size - 16, size - 16), 0.5, 2.6, 3)
+            pygame.draw.line(surface, (139, 90, 43), 
+                           (center_x, y + 12), (center_x, y + size - 12), 2)
+        elif icon == 'staff':
+            # Staff shape
+            pygame.draw.line(surface, (139, 90, 43), 
+                           (center_x, y + 8), (center_x, y + size - 8), 4)
+            pygame.draw.circle(surface, (255, 215, 0), (center_x, y + 12), 6)
+        elif icon == 'sword':
+            # Sword shape
+            pygame.draw.line(surface, (192, 192, 192), 
+                           (center_x, y + 8), (center_x, y + size - 12), 3)
+            pygame.draw.rect(surface, (139, 90, 43), 
+                           (center_x - 4, y + size - 12, 8, 6))
+            
+        elif icon == 'shield':
+            # Shield shape
+            pygame.draw.ellipse(surface, (100, 100, 100), 
+                              (x + 10, y + 10, size - 20, size - 20))
+            pygame.draw.ellipse(surface, (150, 150, 150), 
+                              (x + 10, y + 10, size - 20, size - 20), 2)
+        elif icon == 'boots':
+            # Boot shape
+            pygame.draw.ellipse(surface, (139, 90, 43), 
+                              (x + 12, y + 18, size - 24, size - 30))
+            pygame.draw.rect(surface, (139, 90, 43), 
+                           (x + 12, y + 25, size - 24, 8))
+        elif icon == 'armor':
+            # Generic armor (chest piece)
+            pygame.draw.rect(surface, (100, 100, 100), 
+                           (x + 12, y + 12, size - 24, size - 24))
+            pygame.draw.rect(surface, (150, 150, 150), 
+                           (x + 12, y + 12, size - 24, size - 24), 2)
+            
+        elif icon == 'ring':
+            # Ring shape
+            pygame.draw.circle(surface, (255, 215, 0), (center_x, center_y), 8, 3)
+            pygame.draw.circle(surface, (255, 255, 0), (center_x, center_y - 4), 3)
+        elif icon == 'crown':
+            # Crown shape
+            points = [(x + 10, y + 25), (x + 15, y + 15), (x + 20, y + 20), 
+                     (x + 25, y + 10), (x + 30, y + 20), (x + 35, y + 15), (x + 40, y + 25)]
+            pygame.draw.polygon(surface, (255, 215, 0), points)
+        elif icon == 'gem':
+            # Generic accessory (crystal/orb)
+            pygame.draw.polygon(surface, (100, 200, 255), 
+                              [(center_x, y + 10), (x + 12, center_y), 
+                               (center_x, y + size - 10), (x + size - 12, center_y)])
+            
+        elif icon == 'potion':
+            # Potion bottle
+            pygame.draw.rect(surface, (100, 255, 100), 
+                           (x + 15, y + 15, size - 30, size - 25))
+            pygame.draw.rect(surface, (50, 150, 50), 
+                           (x + 17, y + 12, size - 34, 6))
+        elif icon == 'scroll':
+            # Scroll
+            pygame.draw.rect(surface, (245, 245, 220), 
+                           (x + 10, y + 12, size - 20, size - 24))
+            pygame.draw.line(surface, (139, 90, 43), 
+                           (x + 15, y + 18), (x + size - 15, y + 18), 1)
+            pygame.draw.line(surface, (139, 90, 43), 
+                           (x + 15, y + 22), (x + size - 15, y + 22), 1)
+            
+        elif icon == 'legendary':
             # Special glowing effect for legendary items
             pygame.draw.circle(surface, (255, 100, 255), (center_x, center_y), size // 2 - 2, 3)
             pygame.draw.circle(surface, (255, 215, 0), (center_x, center_y), size // 2 - 8)
@@ -192,24 +232,80 @@ class GameScreen:
                            (x + 12, y + 12, size - 24, size - 24), 2)
 
     def load_loot_table(self):
-        """Load loot table from JSON file"""
-        try:
-            # Get the directory of this script
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            loot_table_path = os.path.join(current_dir, 'loot_table.json')
-            
-            with open(loot_table_path, 'r') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            # Fallback to hardcoded table if file not found
-            return [
-                {"name": "Common Sword", "chance": 0.6},
-                {"name": "Rare Shield", "chance": 0.25},
-                {"name": "Epic Staff", "chance": 0.1},
-                {"name": "Legendary Dragon", "chance": 0.05}
-            ]
+        """Load and compile the loot table from its JSON file"""
+        return load_compiled_loot_table()
+
+    def set_loot_table(self, loot_table):
+        """Swap in a new loot table (a list of entries or a CompiledLootTable).
+
+        The sampler and lookups come prepared (see CompiledLootTable.prepare;
+        a LootTableWatcher prepares reloads on its thread), so the swap is
+        mostly reference assignments. Only what the change affects is
+        rebuilt: the grid order when a held item's rarity changed, and the
+        icon cache when a held item's icon changed. Weight changes start
+        over from the new table; limited stock is what the new table allows
+        less what has already sold.
+        """
+        if not isinstance(loot_table, CompiledLootTable):
+            loot_table = compile_loot_table(loot_table)
+        loot_table.prepare()
+        old_table = self.compiled_loot_table if self.item_index is not None else None
+        old_index = self.item_index
+
+        self.compiled_loot_table = loot_table
+        self.loot_table = loot_table.entries
+        # Drop weights can change per open (see set_item_weight), so they
+        # live in a Fenwick tree: O(log n) to change one, O(log n) to draw
+        self.loot_sampler = loot_table.take_sampler(self.rng)
+        self.loot_indices = loot_table.indices
+        self.item_index = loot_table.item_index
+        self.telemetry.set_loot_table(loot_table)
+        self.reset_stock()
+
+        if old_table is None:
+            self.inventory_view.rebuild()
+            self.icon_cache.clear()
+            return
+        held = self.inventory.items
+        if loot_table.base_digest is not None and loot_table.base_digest == old_table.digest:
+            # Changed names were worked out against old_table when it was prepared
+            rarity_changed = any(name in held for name in loot_table.rarity_changed)
+            icon_changed = any(name in held for name in loot_table.icon_changed)
+        else:
+            new_index = loot_table.item_index
+            changed = [(old_index.get(name), new_index.get(name)) for name in held]
+            rarity_changed = any(old.rarity != new.rarity for old, new in changed)
+            icon_changed = any(old.icon != new.icon for old, new in changed)
+        if rarity_changed:
+            self.inventory_view.rebuild()
+        if icon_changed:
+            self.icon_cache.clear()
+
+    def watch_loot_table(self, watcher):
+        """Pick up tables compiled by a LootTableWatcher between frames"""
+        self.loot_table_watcher = watcher
+
+    def apply_reloaded_loot_table(self):
+        if self.loot_table_watcher is None:
+            return
+        reloaded = self.loot_table_watcher.poll()
+        if reloaded is not None:
+            replaced = self.compiled_loot_table
+            self.set_loot_table(reloaded)
+            self.loot_table_watcher.release(replaced)
+            for listener in self.reload_listeners:
+                listener(reloaded)
+            self.announce("loot_table_reloaded", f"Loot table reloaded: {len(reloaded)} items",
+                          items=len(reloaded))
+
+    def attach_telemetry(self, telemetry):
+        """Count every open in telemetry and keep recent announcements in its snapshots"""
+        telemetry.set_loot_table(self.compiled_loot_table, self.mimic_chance, self.loot_sampler.weights)
+        self.telemetry = telemetry
 
     def handle_event(self, event):
+        # Input can change anything on screen (popup, inventory panel)
+        self.needs_redraw = True
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             if self.loot_box_rect.collidepoint(event.pos):
                 self.open_loot_box()
@@ -218,16 +314,50 @@ class GameScreen:
                 return "back_to_menu"  # back to menu
             elif event.key == pygame.K_i:
                 self.show_inventory = not self.show_inventory  # toggle
+            elif event.key in BULK_OPEN_KEYS:
+                self.open_loot_boxes(BULK_OPEN_KEYS[event.key])
+            elif self.show_inventory:
+                self.handle_inventory_key(event.key)
+        elif event.type == pygame.MOUSEWHEEL and self.show_inventory:
+            self.scroll_inventory(-event.y)
         return None
 
+    def handle_inventory_key(self, key):
+        """Scroll or re-sort the inventory grid from the keyboard"""
+        page = self.inventory_grid_rows
+        if key == pygame.K_UP:
+            self.scroll_inventory(-1)
+        elif key == pygame.K_DOWN:
+            self.scroll_inventory(1)
+        elif key == pygame.K_PAGEUP:
+            self.scroll_inventory(-page)
+        elif key == pygame.K_PAGEDOWN:
+            self.scroll_inventory(page)
+        elif key == pygame.K_HOME:
+            self.inventory_scroll_row = 0
+        elif key == pygame.K_END:
+            self.scroll_inventory(self.max_inventory_scroll())
+        elif key == pygame.K_s:
+            self.inventory_view.next_mode()
+
+    def max_inventory_scroll(self):
+        total_rows = -(-len(self.inventory_view) // self.inventory_grid_cols)
+        return max(0, total_rows - self.inventory_grid_rows)
+
+    def scroll_inventory(self, rows):
+        self.inventory_scroll_row = min(max(0, self.inventory_scroll_row + rows),
+                                        self.max_inventory_scroll())
+
     def open_loot_box(self):
         # Don't open if already opening or mimic is active
         if self.chest_is_opening or self.is_mimic:
             return
+        self.bulk_summary = []
             
         # Check for mimic first!
-        if random.random() < self.mimic_chance:
+        if self.rng.random() < self.mimic_chance:
             # It's a mimic! 
+            self.telemetry.record_mimic()
             self.is_mimic = True
             self.mimic_revealed = False
             self.mimic_timer = 0
@@ -239,22 +369,169 @@ class GameScreen:
         self.chest_is_opening = True
         self.chest_open_timer = 0
         
-        r = random.random()
-        cumulative = 0
-        for item in self.loot_table:
-            cumulative += item["chance"]
-            if r < cumulative:
-                self.inventory.add_item(item["name"])
-                self.popup_text = f"You got: {item['name']}"
-                self.popup_timer = 2.0  # seconds
-                print(self.popup_text)
-                break
+        index = self.loot_sampler.sample()
+        if index is None:
+            self.telemetry.record_empty()
+        else:
+            self.telemetry.record_drop(index)
+            if self.take_stock(index):
+                self.telemetry.set_weight(index, 0.0)
+            item = self.loot_table[index]
+            self.inventory.add_item(item["name"])
+            self.popup_text = f"You got: {item['name']}"
+            self.popup_timer = 2.0  # seconds
+            self.announce("drop", self.popup_text, item=item["name"], rarity=item.get("rarity"))
+            self.emit_drop_particles(item["name"])
 
-    def draw_treasure_chest(self, surface):
-        """Draw a detailed treasure chest with opening animation"""
-        x, y = self.loot_box_rect.x, self.loot_box_rect.y
-        w, h = self.loot_box_rect.width, self.loot_box_rect.height
-        
+    def open_loot_boxes(self, count):
+        """Open count boxes at once; returns the SimulationResult, or None if busy.
+
+        All outcomes are drawn in one call and folded in a single pass by
+        the BatchSimulator rules (a mimic steals one random held item),
+        then the inventory gets one merge of the net changes. Instead of
+        count animations there is one chest opening with the rarest drop's
+        burst, and a popup summarizing the rarest drops.
+        """
+        if self.chest_is_opening or self.is_mimic:
+            return None
+        # Draw with the current (possibly adjusted) weights
+        weights = self.loot_sampler.weights
+        total = self.loot_sampler.total
+        current_table = [{"name": entry["name"], "chance": weight / total if total > 0 else 0.0}
+                         for entry, weight in zip(self.loot_table, weights)]
+        simulator = BatchSimulator(current_table, self.mimic_chance, rng=self.rng)
+        outcomes = simulator.draw_outcomes(count)
+        sold_out = self.take_stock_for_outcomes(outcomes, simulator.empty_outcome) if self.stock else ()
+
+        # Seed the simulation with the current inventory; held items that
+        # are not in the loot table get ids past the outcome range, so they
+        # can be stolen but never drawn
+        before = dict(self.inventory.items)
+        names = simulator.item_names
+        result = SimulationResult(names)
+        result.restore(before)
+        simulator.apply(result, outcomes)
+
+        after = result.as_dict()
+        deltas = {name: after.get(name, 0) - before.get(name, 0) for name in {**before, **after}}
+        self.inventory.merge({name: delta for name, delta in deltas.items() if delta})
+
+        # Outcome ids line up with the telemetry layout: items..., mimic, empty
+        tally = [0] * (len(names) + 2)
+        for outcome in outcomes:
+            tally[outcome] += 1
+        if sold_out:
+            self.record_batch_with_sell_outs(outcomes, sold_out, len(tally), result.thefts)
+        else:
+            self.telemetry.record_batch(tally, result.thefts)
+
+        dropped = sorted((i for i in range(len(names)) if tally[i]),
+                         key=lambda i: self.loot_table[i]["chance"])
+        self.bulk_summary = [f"{names[i]} x{tally[i]}" for i in dropped[:BULK_SUMMARY_ITEMS]]
+        self.popup_text = f"x{count}: {result.drops} items, {result.thefts} eaten"
+        self.popup_timer = 3.0
+        self.announce("bulk_open", f"Opened {count} boxes: {result.drops} items, {result.mimics} mimics, "
+                      f"{result.thefts} stolen", opens=count, drops=result.drops, mimics=result.mimics,
+                      thefts=result.thefts, rarest=[names[i] for i in dropped[:BULK_SUMMARY_ITEMS]])
+
+        self.chest_is_opening = True
+        self.chest_open_timer = 0
+        if dropped:
+            self.emit_drop_particles(names[dropped[0]])
+        return result
+
+    def record_batch_with_sell_outs(self, outcomes, sold_out, bins, thefts):
+        """Report a batch to telemetry in pieces split at each sell-out, so its
+        expected counts switch weights at the draw where the batch did"""
+        start = 0
+        for position, index in sold_out:
+            segment = [0] * bins
+            for outcome in outcomes[start:position + 1]:
+                segment[outcome] += 1
+            self.telemetry.record_batch(segment)
+            self.telemetry.set_weight(index, 0.0)
+            start = position + 1
+        segment = [0] * bins
+        for outcome in outcomes[start:]:
+            segment[outcome] += 1
+        self.telemetry.record_batch(segment, thefts)
+
+    def reset_stock(self):
+        """Work out the drops left of the loot table's limited-stock items from self.sold"""
+        # index -> drops left; at zero the item's weight is zeroed
+        self.stock = {}
+        for index, name, stock in self.compiled_loot_table.stocked:
+            left = max(0, stock - self.sold.get(name, 0))
+            self.stock[index] = left
+            if not left:
+                self.loot_sampler.update(index, 0.0)
+                self.telemetry.set_weight(index, 0.0)
+
+    def restore_sold(self, sold):
+        """Take over the sales of an earlier session (e.g. from an InventoryJournal)"""
+        self.sold = dict(sold)
+        self.reset_stock()
+
+    def take_stock(self, index):
+        """Count one drop against a limited-stock item; returns True if that sold it out"""
+        left = self.stock.get(index)
+        if not left:
+            return False
+        self.stock[index] = left - 1
+        name = self.loot_table[index]["name"]
+        self.sold[name] = self.sold.get(name, 0) + 1
+        for listener in self.stock_listeners:
+            listener("sold", name)
+        if left == 1:
+            self.loot_sampler.update(index, 0.0)
+            return True
+        return False
+
+    def take_stock_for_outcomes(self, outcomes, empty_outcome):
+        """take_stock() for a batch drawn with the weights at its start.
+
+        A draw of an item that sold out earlier in the batch is redrawn
+        from the current weights, which gives each open the same odds as
+        opening the boxes one at a time. Returns (position, index) of each
+        sell-out.
+        """
+        stock = self.stock
+        sold_out = []
+        for position, outcome in enumerate(outcomes):
+            if outcome not in stock:
+                continue
+            while outcome in stock and not stock[outcome]:
+                index = self.loot_sampler.sample()
+                outcome = empty_outcome if index is None else index
+            outcomes[position] = outcome
+            if self.take_stock(outcome):
+                sold_out.append((position, outcome))
+        return sold_out
+
+    def item_weight(self, item_name):
+        return self.loot_sampler.weights[self.loot_indices[item_name]]
+
+    def set_item_weight(self, item_name, weight):
+        """Change one item's drop weight in O(log n), e.g. for event boosts or pity.
+
+        Weights are relative: drops are drawn in proportion to the current
+        weights of all items. Sold-out items stay at zero.
+        """
+        index = self.loot_indices[item_name]
+        if self.stock.get(index) == 0:
+            return
+        self.loot_sampler.update(index, weight)
+        self.telemetry.set_weight(index, weight)
+
+    def announce(self, event, message, **fields):
+        """Log a game event (queued, never blocks the frame) and pass it to telemetry"""
+        if self.logger.enabled:
+            self.logger.info(event, message=message, **fields)
+        if self.telemetry.enabled:
+            self.telemetry.message(message)
+
+    def draw_chest_body(self, surface, x, y, w, h):
+        """Draw the wooden chest body with grain lines"""
         # Main chest body (brown wood)
         chest_body = pygame.Rect(x, y + h//4, w, h*3//4)
         pygame.draw.rect(surface, (101, 67, 33), chest_body)  # Dark brown
@@ -266,46 +543,17 @@ class GameScreen:
             pygame.draw.line(surface, (80, 53, 25), 
                            (chest_body.x + 5, line_y), 
                            (chest_body.x + chest_body.width - 5, line_y), 2)
-        
-        # Calculate lid position based on opening animation
-        lid_offset_y = 0
-        lid_height = h//2
-        
-        if self.chest_is_opening:
-            # Animate the lid opening (moving up and rotating)
-            progress = min(self.chest_open_timer / self.chest_open_duration, 1.0)
-            # Smooth easing function for animation
-            eased_progress = 1 - (1 - progress) ** 3  # Ease-out cubic
-            lid_offset_y = -int(eased_progress * 20)  # Move lid up by 20 pixels
-            self.chest_lid_angle = eased_progress * 45  # Rotate up to 45 degrees
-        
-        # Draw the chest lid
-        lid_rect = pygame.Rect(x, y + lid_offset_y, w, lid_height)
+
+    def draw_chest_lid(self, surface, x, y, w, h):
+        """Draw the chest lid with its top-left corner at (x, y)"""
+        lid_rect = pygame.Rect(x, y, w, h//2)
         pygame.draw.rect(surface, (101, 67, 33), lid_rect)  # Dark brown
         pygame.draw.rect(surface, (139, 90, 43), lid_rect, 3)  # Brown outline
-        
-        # If chest is opening, show magical glow inside
-        if self.chest_is_opening and self.chest_open_timer > 0.2:
-            progress = min((self.chest_open_timer - 0.2) / (self.chest_open_duration - 0.2), 1.0)
-            glow_alpha = int(progress * 150)
-            
-            # Create a glowing effect inside the chest
-            glow_surf = pygame.Surface((w - 20, 30), pygame.SRCALPHA)
-            glow_color = (255, 215, 0, glow_alpha)  # Golden glow with alpha
-            pygame.draw.ellipse(glow_surf, glow_color, (0, 0, w - 20, 30))
-            
-            # Add magical sparkles
-            import math
-            for i in range(5):
-                sparkle_x = x + 20 + (i * (w - 40) // 5) + int(math.sin(self.chest_open_timer * 10 + i) * 5)
-                sparkle_y = y + h//2 + int(math.cos(self.chest_open_timer * 8 + i) * 8)
-                sparkle_size = 3 + int(math.sin(self.chest_open_timer * 15 + i) * 2)
-                pygame.draw.circle(surface, (255, 255, 150), (sparkle_x, sparkle_y), sparkle_size)
-            
-            surface.blit(glow_surf, (x + 10, y + h//3))
-        
-        # Metal bands (iron straps) - only on body, not on lid
+
+    def draw_chest_hardware(self, surface, x, y, w, h):
+        """Draw the metal bands and corner reinforcements on the body"""
         band_color = (64, 64, 64)  # Dark gray
+        chest_body = pygame.Rect(x, y + h//4, w, h*3//4)
         # Horizontal bands on body
         for i in range(2):
             band_y = chest_body.y + (i + 1) * chest_body.height // 3
@@ -318,26 +566,6 @@ class GameScreen:
         pygame.draw.rect(surface, band_color, left_band)
         pygame.draw.rect(surface, band_color, right_band)
         
-        # Lock mechanism (only show when closed)
-        if not self.chest_is_opening or self.chest_open_timer < 0.3:
-            lock_center_x = x + w//2
-            lock_center_y = y + h*2//3
-            lock_size = 12
-            
-            # Lock body (brass/gold)
-            lock_rect = pygame.Rect(lock_center_x - lock_size//2, lock_center_y - lock_size//2, 
-                                   lock_size, lock_size)
-            pygame.draw.rect(surface, (218, 165, 32), lock_rect)  # Golden rod
-            pygame.draw.rect(surface, (184, 134, 11), lock_rect, 2)  # Darker gold outline
-            
-            # Keyhole
-            keyhole_rect = pygame.Rect(lock_center_x - 2, lock_center_y - 2, 4, 4)
-            pygame.draw.rect(surface, (0, 0, 0), keyhole_rect)
-            
-            # Lock shackle (U-shaped)
-            shackle_rect = pygame.Rect(lock_center_x - 6, lock_center_y - 12, 12, 8)
-            pygame.draw.arc(surface, (184, 134, 11), shackle_rect, 0, 3.14159, 3)
-        
         # Corner reinforcements on body
         corner_size = 8
         corners = [
@@ -353,6 +581,95 @@ class GameScreen:
             # Add a small highlight
             pygame.draw.rect(surface, (96, 96, 96), corner_rect, 1)
 
+    def draw_chest_lock(self, surface, x, y, w, h):
+        """Draw the golden lock on the front of the chest"""
+        lock_center_x = x + w//2
+        lock_center_y = y + h*2//3
+        lock_size = 12
+        
+        # Lock body (brass/gold)
+        lock_rect = pygame.Rect(lock_center_x - lock_size//2, lock_center_y - lock_size//2, 
+                               lock_size, lock_size)
+        pygame.draw.rect(surface, (218, 165, 32), lock_rect)  # Golden rod
+        pygame.draw.rect(surface, (184, 134, 11), lock_rect, 2)  # Darker gold outline
+        
+        # Keyhole
+        keyhole_rect = pygame.Rect(lock_center_x - 2, lock_center_y - 2, 4, 4)
+        pygame.draw.rect(surface, (0, 0, 0), keyhole_rect)
+        
+        # Lock shackle (U-shaped)
+        shackle_rect = pygame.Rect(lock_center_x - 6, lock_center_y - 12, 12, 8)
+        pygame.draw.arc(surface, (184, 134, 11), shackle_rect, 0, 3.14159, 3)
+
+    def get_chest_layers(self):
+        """Bake the static parts of the chest into surfaces (built once per chest size)"""
+        w, h = self.loot_box_rect.width, self.loot_box_rect.height
+        if self.chest_layers is None or self.chest_layers["size"] != (w, h):
+            layers = {"size": (w, h)}
+            for name in ("body", "lid", "hardware", "lock", "closed"):
+                layers[name] = pygame.Surface((w, h), pygame.SRCALPHA)
+            self.draw_chest_body(layers["body"], 0, 0, w, h)
+            self.draw_chest_lid(layers["lid"], 0, 0, w, h)
+            self.draw_chest_hardware(layers["hardware"], 0, 0, w, h)
+            self.draw_chest_lock(layers["lock"], 0, 0, w, h)
+            for name in ("body", "lid", "hardware", "lock"):
+                layers["closed"].blit(layers[name], (0, 0))
+            self.chest_layers = layers
+        return self.chest_layers
+
+    def emit_drop_particles(self, item_name):
+        """Burst of particles from the chest, bigger for rarer drops"""
+        rarity = self.item_index.get(item_name).rarity
+        count, speed, color = DROP_BURSTS.get(rarity, DROP_BURSTS["common"])
+        center_x = self.loot_box_rect.centerx
+        top_y = self.loot_box_rect.y + self.loot_box_rect.height // 3
+        self.particles.emit(count, center_x, top_y, color, speed=speed, spread=math.pi, life=1.2)
+        if rarity == "legendary":
+            self.particles.emit(count // 2, center_x, top_y, MAGENTA, speed=speed * 1.5, life=1.6)
+
+    def draw_treasure_chest(self, surface):
+        """Draw a detailed treasure chest with opening animation"""
+        x, y = self.loot_box_rect.x, self.loot_box_rect.y
+        w, h = self.loot_box_rect.width, self.loot_box_rect.height
+        layers = self.get_chest_layers()
+
+        # Idle chest is a single pre-rendered blit
+        if not self.chest_is_opening:
+            surface.blit(layers["closed"], (x, y))
+            return
+
+        surface.blit(layers["body"], (x, y))
+        
+        open_timer = min(self.chest_open_timer + self.render_time_offset, self.chest_open_duration)
+
+        # Animate the lid opening (moving up and rotating)
+        progress = min(open_timer / self.chest_open_duration, 1.0)
+        # Smooth easing function for animation
+        eased_progress = 1 - (1 - progress) ** 3  # Ease-out cubic
+        lid_offset_y = -int(eased_progress * 20)  # Move lid up by 20 pixels
+        self.chest_lid_angle = eased_progress * 45  # Rotate up to 45 degrees
+        surface.blit(layers["lid"], (x, y + lid_offset_y))
+        
+        # Show magical glow inside
+        if open_timer > 0.2:
+            progress = min((open_timer - 0.2) / (self.chest_open_duration - 0.2), 1.0)
+            glow_alpha = int(progress * 150)
+            
+            # Create a glowing effect inside the chest
+            glow_surf = pygame.Surface((w - 20, 30), pygame.SRCALPHA)
+            glow_color = (255, 215, 0, glow_alpha)  # Golden glow with alpha
+            pygame.draw.ellipse(glow_surf, glow_color, (0, 0, w - 20, 30))
+            
+            # Magical sparkles come from the particle pool (see update)
+            surface.blit(glow_surf, (x + 10, y + h//3))
+        
+        # Metal bands and corners sit on top of the glow
+        surface.blit(layers["hardware"], (x, y))
+        
+        # Lock mechanism (only show while the chest is still closed)
+        if open_timer < 0.3:
+            surface.blit(layers["lock"], (x, y))
+
     def draw_mimic(self, surface):
         """Draw a scary mimic that has revealed itself"""
         x, y = self.loot_box_rect.x, self.loot_box_rect.y
@@ -385,8 +702,7 @@ class GameScreen:
                 self.mimic_revealed = True
         else:
             # Fully revealed mimic - scary!
-            shake_x = int(random.random() * 6 - 3)  # Shake effect
-            shake_y = int(random.random() * 6 - 3)
+            shake_x, shake_y = self.mimic_shake
             
             mimic_x = x + shake_x
             mimic_y = y + shake_y
@@ -439,16 +755,39 @@ class GameScreen:
                 pygame.draw.line(surface, (100, 100, 100), 
                                (spike_x, spike_y), (spike_end_x, spike_end_y), 5)
 
+    def enter(self):
+        """Called each time this screen becomes active"""
+        self.needs_redraw = True
+
+    def exit(self):
+        """Called when switching away; state is kept for the next enter()"""
+        pass
+
+    def set_render_offset(self, seconds):
+        """Time since the last fixed update, used to interpolate animations"""
+        self.render_time_offset = seconds
+
     def update(self, dt):
+        self.apply_reloaded_loot_table()
+
+        was_animating = self.chest_is_opening or self.is_mimic
+        previous_popup = self.popup_text
+
         # Update popup timer
         if self.popup_timer > 0:
             self.popup_timer -= dt
             if self.popup_timer <= 0:
                 self.popup_text = ""
+                self.bulk_summary = []
         
         # Update chest opening animation
         if self.chest_is_opening:
             self.chest_open_timer += dt
+            if self.chest_open_timer > 0.2 and not self.is_mimic:
+                # Sparkles drifting up out of the glow
+                self.particles.emit(max(1, int(dt * 90)), self.loot_box_rect.centerx,
+                                    self.loot_box_rect.y + self.loot_box_rect.height // 2,
+                                    SPARKLE, speed=50, spread=2.0, life=0.6)
             if self.chest_open_timer >= self.chest_open_duration:
                 # Animation finished, reset to closed state
                 self.chest_is_opening = False
@@ -465,16 +804,43 @@ class GameScreen:
                 self.mimic_revealed = True
                 
                 # Surprise! Show initial mimic reveal message
-                initial_roast = random.choice(self.mimic_roasts)
+                initial_roast = self.rng.choice(self.mimic_roasts)
                 self.popup_text = f"MIMIC! {initial_roast}"
                 self.popup_timer = 3.0
-                print(f"MIMIC ENCOUNTER! {initial_roast}")
+                self.announce("mimic", f"MIMIC ENCOUNTER! {initial_roast}", roast=initial_roast)
+                self.particles.emit(150, self.loot_box_rect.centerx, self.loot_box_rect.centery,
+                                    RED, speed=220, life=0.8)
+
+            if self.mimic_revealed:
+                # Shake effect
+                rand = self.effects_rng.random
+                self.mimic_shake = (int(rand() * 6 - 3), int(rand() * 6 - 3))
                 
             if self.mimic_timer >= self.mimic_duration:
                 # Mimic encounter ends
                 self.mimic_consequence()
                 self.reset_mimic()
 
+        if self.particles.count:
+            self.particles.update(dt)
+
+        # Popup changes and the final frame of an animation need a full redraw
+        if self.popup_text != previous_popup:
+            self.needs_redraw = True
+        if was_animating and not (self.chest_is_opening or self.is_mimic):
+            self.needs_redraw = True
+
+    def get_dirty_rects(self):
+        """Areas that changed since the last frame: None for the whole screen, [] for nothing"""
+        if self.needs_redraw or self.particles.count:
+            # Particles can fly anywhere on screen
+            self.needs_redraw = False
+            return None
+        if self.chest_is_opening or self.is_mimic:
+            # Room for the lifted lid, mimic shake and the glow outline
+            return [self.loot_box_rect.inflate(30, 50)]
+        return []
+
     def mimic_consequence(self):
         """Handle what happens when you encounter a mimic"""
         # Additional savage roast lines for stealing items (shorter!)
@@ -498,24 +864,22 @@ class GameScreen:
         
         if len(self.inventory.items) > 0:
             # Mimic steals a random item with savage commentary!
-            items_list = list(self.inventory.items.keys())
-            stolen_item = random.choice(items_list)
-            steal_roast = random.choice(steal_roasts)
+            stolen_item = self.inventory.steal_random(self.rng)
+            steal_roast = self.rng.choice(steal_roasts)
             
-            if self.inventory.items[stolen_item] > 1:
-                self.inventory.items[stolen_item] -= 1
-            else:
-                del self.inventory.items[stolen_item]
+            self.telemetry.record_theft()
             
             self.popup_text = f"Ate {stolen_item}! {steal_roast}"
             self.popup_timer = 3.0
-            print(f"Mimic stole: {stolen_item} - {steal_roast}")
+            self.announce("theft", f"Mimic stole: {stolen_item} - {steal_roast}",
+                          item=stolen_item, roast=steal_roast)
         else:
             # No items to steal, extra savage roast
-            no_items_roast = random.choice(no_items_roasts)
+            no_items_roast = self.rng.choice(no_items_roasts)
             self.popup_text = f"No items! {no_items_roast}"
             self.popup_timer = 2.5
-            print(f"Mimic found no items - {no_items_roast}")
+            self.announce("theft_failed", f"Mimic found no items - {no_items_roast}",
+                          roast=no_items_roast)
 
     def reset_mimic(self):
         """Reset mimic state back to normal chest"""
@@ -524,6 +888,7 @@ class GameScreen:
         self.mimic_timer = 0
         self.chest_is_opening = False
         self.chest_open_timer = 0
+        self.mimic_shake = (0, 0)
 
     def draw_inventory_grid(self, surface):
         """Draw the inventory as a grid with icons"""
@@ -539,13 +904,22 @@ class GameScreen:
         pygame.draw.rect(panel_surface, (100, 100, 100), (0, 0, panel_width, panel_height), 2)
         surface.blit(panel_surface, (panel_rect.x, panel_rect.y))
         
-        # Draw header
-        header_font = pygame.font.SysFont(None, 36)
-        header = header_font.render("Inventory", True, (255, 255, 255))
+        # Only the visible window of the sorted view is touched
+        self.inventory_view.sync()
+        self.inventory_scroll_row = min(self.inventory_scroll_row, self.max_inventory_scroll())
+        visible_slots = self.inventory_grid_rows * self.inventory_grid_cols
+        first_slot = self.inventory_scroll_row * self.inventory_grid_cols
+        visible_items = self.inventory_view.window(first_slot, visible_slots)
+        
+        # Draw header (with the visible range once the grid overflows)
+        total = len(self.inventory_view)
+        title = "Inventory"
+        if total > visible_slots:
+            title = f"Inventory {first_slot + 1}-{first_slot + len(visible_items)} of {total}"
+        header = render_text(get_font(None, 36), title, (255, 255, 255))
         surface.blit(header, (self.inventory_start_x, self.inventory_start_y - 30))
         
         # Draw grid slots
-        items_list = list(self.inventory.items.items())
         slot_index = 0
         
         for row in range(self.inventory_grid_rows):
@@ -560,19 +934,19 @@ class GameScreen:
                 pygame.draw.rect(surface, (80, 80, 100), slot_rect, 2)
                 
                 # Draw item if it exists
-                if slot_index < len(items_list):
-                    item_name, item_count = items_list[slot_index]
+                if slot_index < len(visible_items):
+                    item_name = visible_items[slot_index]
+                    item_count = self.inventory.items[item_name]
                     
                     # Draw item icon
                     icon_size = self.inventory_slot_size - 10
                     icon_x = slot_x + 5
                     icon_y = slot_y + 5
-                    self.draw_item_icon(surface, item_name, icon_x, icon_y, icon_size)
+                    self.icon_cache.blit(surface, item_name, icon_x, icon_y, icon_size)
                     
                     # Draw item count
                     if item_count > 1:
-                        count_font = pygame.font.SysFont(None, 24)
-                        count_text = count_font.render(str(item_count), True, (255, 255, 255))
+                        count_text = render_text(get_font(None, 24), str(item_count), (255, 255, 255))
                         count_bg_rect = pygame.Rect(slot_x + self.inventory_slot_size - 20, 
                                                    slot_y + self.inventory_slot_size - 20, 18, 18)
                         pygame.draw.rect(surface, (0, 0, 0, 150), count_bg_rect)
@@ -586,14 +960,17 @@ class GameScreen:
 
     def draw(self, surface):
         surface.fill((30, 30, 60))  # background
+        profiler = self.profiler
         
         # Draw mimic or treasure chest
         if self.is_mimic and self.mimic_timer > 0.5:
             # Draw the scary mimic
-            self.draw_mimic(surface)
+            with profiler.phase("draw_mimic"):
+                self.draw_mimic(surface)
         else:
             # Draw normal treasure chest
-            self.draw_treasure_chest(surface)
+            with profiler.phase("draw_treasure_chest"):
+                self.draw_treasure_chest(surface)
 
         # Add a glow effect around the chest (different color for mimic)
         if self.is_mimic and self.mimic_revealed:
@@ -607,11 +984,19 @@ class GameScreen:
                                    self.loot_box_rect.width + 10, self.loot_box_rect.height + 10)
             pygame.draw.rect(surface, (100, 80, 20), glow_rect, 3)  # Golden glow
 
+        with profiler.phase("draw_particles"):
+            self.particles.draw(surface)
+
         # Popup text
         if self.popup_text:
-            text_surf = self.font.render(self.popup_text, True, (255, 255, 255))
+            text_surf = render_text(self.font, self.popup_text, (255, 255, 255))
             surface.blit(text_surf, (self.width//2 - text_surf.get_width()//2, 100))
+            summary_font = get_font(None, 28)
+            for line_number, line in enumerate(self.bulk_summary):
+                line_surf = render_text(summary_font, line, (255, 215, 0))
+                surface.blit(line_surf, (self.width//2 - line_surf.get_width()//2, 140 + 24 * line_number))
 
         # Inventory display
         if self.show_inventory:
-            self.draw_inventory_grid(surface)
+            with profiler.phase("draw_inventory_grid"):
+                self.draw_inventory_grid(surface)
@@ -0,0 +1,81 @@
+from collections import OrderedDict
+import pygame
+
+
+class IconAtlas:
+    """Fixed-size texture atlas of same-sized icons with LRU slot reuse.
+
+    Icons are rendered once into a slot of one shared SRCALPHA surface by
+    ``render(surface, item_name, x, y, size)``; drawing is then a single
+    area blit. When every slot is taken, the least recently used icon's
+    slot is cleared and reused.
+    """
+
+    def __init__(self, render, size, capacity=64, columns=8):
+        self.render = render
+        self.size = size
+        self.capacity = capacity
+        self.columns = columns
+        rows = (capacity + columns - 1) // columns
+        self.surface = pygame.Surface((columns * size, rows * size), pygame.SRCALPHA)
+        self.slots = OrderedDict()  # item_name -> slot rect, oldest first
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.slots)
+
+    def __contains__(self, item_name):
+        return item_name in self.slots
+
+    def get(self, item_name):
+        """Return the atlas rect holding item_name's icon, rendering it on a miss"""
+        rect = self.slots.get(item_name)
+        if rect is not None:
+            self.slots.move_to_end(item_name)
+            self.hits += 1
+            return rect
+
+        self.misses += 1
+        if len(self.slots) < self.capacity:
+            index = len(self.slots)
+            rect = pygame.Rect((index % self.columns) * self.size,
+                               (index // self.columns) * self.size,
+                               self.size, self.size)
+        else:
+            _, rect = self.slots.popitem(last=False)
+            self.surface.fill((0, 0, 0, 0), rect)
+
+        self.render(self.surface, item_name, rect.x, rect.y, self.size)
+        self.slots[item_name] = rect
+        return rect
+
+    def blit(self, surface, item_name, x, y):
+        surface.blit(self.surface, (x, y), self.get(item_name))
+
+    def clear(self):
+        self.slots.clear()
+        self.surface.fill((0, 0, 0, 0))
+
+
+class IconCache:
+    """One IconAtlas per icon size"""
+
+    def __init__(self, render, capacity=64):
+        self.render = render
+        self.capacity = capacity
+        self.atlases = {}  # size -> IconAtlas
+
+    def atlas(self, size):
+        atlas = self.atlases.get(size)
+        if atlas is None:
+            atlas = IconAtlas(self.render, size, self.capacity)
+            self.atlases[size] = atlas
+        return atlas
+
+    def blit(self, surface, item_name, x, y, size):
+        self.atlas(size).blit(surface, item_name, x, y)
+
+    def clear(self):
+        for atlas in self.atlases.values():
+            atlas.clear()
@@ -1,11 +1,226 @@
+import random
+from array import array
+from collections.abc import MutableMapping
+
+
+def format_inventory(items):
+    """The inventory listing as one string, so it is written in a single call"""
+    return "\n".join(["Inventory:"] + [f"{name}: {count}" for name, count in items.items()])
+
+
 class Inventory:
     def __init__(self):
         self.items = {}  # item_name -> count
+        self.listeners = []  # callables taking ("add" | "remove", item_name)
+        self.version = 0  # bumped by restore(), which bypasses the listeners
 
     def add_item(self, item_name):
         self.items[item_name] = self.items.get(item_name, 0) + 1
+        for listener in self.listeners:
+            listener("add", item_name)
+
+    def remove_item(self, item_name):
+        """Remove one of item_name; returns False if there was none"""
+        count = self.items.get(item_name, 0)
+        if count > 1:
+            self.items[item_name] = count - 1
+        elif count == 1:
+            del self.items[item_name]
+        else:
+            return False
+        for listener in self.listeners:
+            listener("remove", item_name)
+        return True
+
+    def merge(self, deltas):
+        """Apply net count changes (item_name -> +/- count) in one pass.
+
+        Counts are updated first, then listeners get one "add" or "remove"
+        per unit of change, so journals and views see the same events as
+        the equivalent add_item/remove_item calls.
+        """
+        items = self.items
+        for item_name, delta in deltas.items():
+            count = items.get(item_name, 0) + delta
+            if count > 0:
+                items[item_name] = count
+            else:
+                items.pop(item_name, None)
+        for item_name, delta in deltas.items():
+            event = "add" if delta > 0 else "remove"
+            for listener in self.listeners:
+                for _ in range(abs(delta)):
+                    listener(event, item_name)
+
+    def restore(self, counts):
+        """Set counts directly (e.g. from a save), without per-unit listener events.
+
+        Views catch up through ``version`` (see SortedInventoryView.sync).
+        """
+        self.items.update(counts)
+        self.version += 1
+
+    def print_inventory(self):
+        print(format_inventory(self.items))
+
+
+class ItemCatalog:
+    """Dense integer ids for item names, shared by many CompactInventory objects"""
+
+    def __init__(self, names=()):
+        self.names = []  # id -> name
+        self.ids = {}  # name -> id
+        for name in names:
+            self.id_for(name)
+
+    def __len__(self):
+        return len(self.names)
+
+    def id_for(self, item_name):
+        item_id = self.ids.get(item_name)
+        if item_id is None:
+            item_id = len(self.names)
+            self.names.append(item_name)
+            self.ids[item_name] = item_id
+        return item_id
+
+
+class _CountsView(MutableMapping):
+    """Dict-style name -> count view over a CompactInventory"""
+
+    def __init__(self, inventory):
+        self.inventory = inventory
+
+    def __getitem__(self, item_name):
+        counts = self.inventory.counts
+        item_id = self.inventory.catalog.ids.get(item_name)
+        if item_id is None or item_id >= len(counts) or not counts[item_id]:
+            raise KeyError(item_name)
+        return counts[item_id]
+
+    def __setitem__(self, item_name, count):
+        self.inventory.set_count(self.inventory.catalog.id_for(item_name), count)
+
+    def __delitem__(self, item_name):
+        self[item_name]  # raises KeyError if absent
+        self.inventory.set_count(self.inventory.catalog.ids[item_name], 0)
+
+    def __iter__(self):
+        names = self.inventory.catalog.names
+        return iter([names[item_id] for item_id in self.inventory.held])
+
+    def __len__(self):
+        return len(self.inventory.held)
+
+
+class CompactInventory:
+    """Array-backed inventory keyed by integer item ids.
+
+    Counts live in an ``array('I')`` indexed by catalog id, and the ids of
+    items currently held are kept in a swap-remove list so adding, removing
+    and picking a random held item are all O(1). ``items`` offers the same
+    dict-style access as Inventory.items for the UI, and listeners get the
+    same events, so it can stand in for an Inventory. The game screen keeps
+    its items in one, and SimulationResult is one.
+    """
+
+    def __init__(self, catalog=None):
+        self.catalog = catalog if catalog is not None else ItemCatalog()
+        self.counts = array('I')  # id -> count
+        self.held = array('I')  # ids with a non-zero count
+        self.held_pos = array('I')  # id -> index in self.held (only valid while held)
+        self.items = _CountsView(self)
+        self.listeners = []  # callables taking ("add" | "remove", item_name)
+        self.version = 0  # bumped by restore(), which bypasses the listeners
+
+    def _grow(self, item_id):
+        missing = item_id + 1 - len(self.counts)
+        if missing > 0:
+            zeros = array('I', [0]) * max(missing, len(self.catalog) - len(self.counts))
+            self.counts.extend(zeros)
+            self.held_pos.extend(zeros)
+
+    def set_count(self, item_id, count):
+        self._grow(item_id)
+        was_held = self.counts[item_id] > 0
+        self.counts[item_id] = count
+        if count and not was_held:
+            self.held_pos[item_id] = len(self.held)
+            self.held.append(item_id)
+        elif not count and was_held:
+            # Swap-remove from the held list
+            pos = self.held_pos[item_id]
+            last = self.held.pop()
+            if last != item_id:
+                self.held[pos] = last
+                self.held_pos[last] = pos
+
+    def add_id(self, item_id, count=1):
+        self._grow(item_id)
+        if self.counts[item_id]:
+            self.counts[item_id] += count
+        else:
+            self.set_count(item_id, count)
+
+    def add_item(self, item_name):
+        self.add_id(self.catalog.id_for(item_name))
+        for listener in self.listeners:
+            listener("add", item_name)
+
+    def add_many(self, item_ids):
+        """Add one of each id in item_ids"""
+        counts = self.counts
+        for item_id in item_ids:
+            if item_id < len(counts) and counts[item_id]:
+                counts[item_id] += 1
+            else:
+                self.add_id(item_id)
+
+    def remove_id(self, item_id):
+        if item_id >= len(self.counts) or not self.counts[item_id]:
+            return False
+        self.set_count(item_id, self.counts[item_id] - 1)
+        return True
+
+    def remove_item(self, item_name):
+        item_id = self.catalog.ids.get(item_name)
+        if item_id is None or not self.remove_id(item_id):
+            return False
+        for listener in self.listeners:
+            listener("remove", item_name)
+        return True
+
+    def steal_random(self, rng=random):
+        """Remove one of a uniformly chosen held item (the mimic rule); returns its name"""
+        if not self.held:
+            return None
+        item_id = self.held[rng.randrange(len(self.held))]
+        self.remove_id(item_id)
+        item_name = self.catalog.names[item_id]
+        for listener in self.listeners:
+            listener("remove", item_name)
+        return item_name
+
+    def merge(self, deltas):
+        """Apply net count changes (item_name -> +/- count), like Inventory.merge"""
+        counts = self.counts
+        id_for = self.catalog.id_for
+        for item_name, delta in deltas.items():
+            item_id = id_for(item_name)
+            self._grow(item_id)
+            self.set_count(item_id, max(0, counts[item_id] + delta))
+        for item_name, delta in deltas.items():
+            event = "add" if delta > 0 else "remove"
+            for listener in self.listeners:
+                for _ in range(abs(delta)):
+                    listener(event, item_name)
+
+    def restore(self, counts):
+        """Set counts directly (e.g. from a save), like Inventory.restore"""
+        id_for = self.catalog.id_for
+        for item_name, count in counts.items():
+            self.set_count(id_for(item_name), count)
+        self.version += 1
 
     def print_inventory(self):
-        print("Inventory:")
-        for name, count in self.items.items():
-            print(f"{name}: {count}")
+        print(format_inventory(self.items))
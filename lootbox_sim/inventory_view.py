@@ -0,0 +1,76 @@
+from bisect import bisect_left, insort
+from lootbox_sim.items import RARITIES
+
+SORT_MODES = ('rarity', 'count', 'name')
+
+# Rarest first
+RARITY_RANK = {rarity: -rank for rank, rarity in enumerate(RARITIES)}
+
+
+class SortedInventoryView:
+    """Inventory item names kept in display order, updated incrementally.
+
+    The view listens to the inventory and re-inserts only the item that
+    changed (a bisect plus a list insert), so the grid never re-sorts per
+    frame. ``rarity_of(name)`` supplies the rarity used by the "rarity" mode.
+    """
+
+    def __init__(self, inventory, rarity_of, mode='rarity'):
+        self.inventory = inventory
+        self.rarity_of = rarity_of
+        self.mode = mode
+        self.order = []  # sorted sort keys; the item name is always the last element
+        self.keys = {}  # item name -> its current sort key
+        self.version = inventory.version  # inventory.version at the last rebuild
+        inventory.listeners.append(self.on_change)
+        self.rebuild()
+
+    def __len__(self):
+        return len(self.order)
+
+    def sort_key(self, item_name, count):
+        if self.mode == 'count':
+            return (-count, item_name)
+        if self.mode == 'rarity':
+            return (RARITY_RANK.get(self.rarity_of(item_name), 1), item_name)
+        return (item_name,)
+
+    def rebuild(self):
+        """Re-sort from scratch (after a mode change or direct edits to the inventory)"""
+        self.keys = {name: self.sort_key(name, count) for name, count in self.inventory.items.items()}
+        self.order = sorted(self.keys.values())
+        self.version = self.inventory.version
+
+    def set_mode(self, mode):
+        self.mode = mode
+        self.rebuild()
+
+    def next_mode(self):
+        self.set_mode(SORT_MODES[(SORT_MODES.index(self.mode) + 1) % len(SORT_MODES)])
+
+    def on_change(self, event, item_name):
+        """Inventory listener: move one item to its new position"""
+        count = self.inventory.items.get(item_name, 0)
+        if count and self.mode != 'count' and item_name in self.keys:
+            return  # only the count changed, and these modes don't sort by it
+        old_key = self.keys.pop(item_name, None)
+        if old_key is not None:
+            del self.order[bisect_left(self.order, old_key)]
+        if count:
+            key = self.sort_key(item_name, count)
+            self.keys[item_name] = key
+            insort(self.order, key)
+
+    def sync(self):
+        """Catch up with edits that bypassed the listeners, in O(1).
+
+        Inventory.restore() bumps the inventory's version; other direct
+        edits to ``items`` are only noticed when they change the number of
+        held names.
+        """
+        if self.version != self.inventory.version or len(self.keys) != len(self.inventory.items):
+            self.rebuild()
+
+    def window(self, start, count):
+        """Names of the items in display positions [start, start + count)"""
+        return [key[-1] for key in self.order[start:start + count]]
@@ -0,0 +1,92 @@
+import sys
+
+CATEGORIES = ('weapon', 'armor', 'accessory', 'consumable', 'legendary', 'misc')
+RARITIES = ('common', 'uncommon', 'epic', 'legendary')
+
+# Keyword fallbacks for loot tables without explicit metadata, checked in order
+CATEGORY_KEYWORDS = (
+    ('legendary', ('dragon', 'legendary', 'epic', 'universe', 'cosmic', 'infinity', 'god')),
+    ('weapon', ('sword', 'blade', 'dagger', 'bow', 'crossbow', 'staff', 'excalibur')),
+    ('armor', ('shield', 'armor', 'mail', 'helmet', 'boots', 'gauntlets', 'cloak')),
+    ('accessory', ('ring', 'amulet', 'crown', 'crystal', 'orb', 'gauntlet')),
+    ('consumable', ('potion', 'scroll', 'feather')),
+)
+
+# Icon shape keywords per category; the last entry of each is the default
+ICON_KEYWORDS = {
+    'weapon': (('bow', ('bow', 'crossbow')), ('staff', ('staff',)), ('sword', ())),
+    'armor': (('shield', ('shield',)), ('boots', ('boots',)), ('armor', ())),
+    'accessory': (('ring', ('ring',)), ('crown', ('crown',)), ('gem', ())),
+    'consumable': (('potion', ('potion',)), ('scroll', ())),
+    'legendary': (('legendary', ()),),
+    'misc': (('misc', ()),),
+}
+
+
+def guess_category(item_name):
+    """Categorize an item from keywords in its name"""
+    item_lower = item_name.lower()
+    for category, keywords in CATEGORY_KEYWORDS:
+        if any(keyword in item_lower for keyword in keywords):
+            return category
+    return 'misc'
+
+
+def guess_icon(item_name, category):
+    """Pick an icon shape for an item from keywords in its name"""
+    item_lower = item_name.lower()
+    shapes = ICON_KEYWORDS.get(category, ICON_KEYWORDS['misc'])
+    for shape, keywords in shapes:
+        if any(keyword in item_lower for keyword in keywords):
+            return shape
+    return shapes[-1][0]
+
+
+class ItemInfo:
+    """Display metadata for one item"""
+    __slots__ = ('name', 'category', 'rarity', 'icon')
+
+    def __init__(self, name, category, rarity, icon):
+        self.name = sys.intern(name)
+        self.category = sys.intern(category)
+        self.rarity = sys.intern(rarity)
+        self.icon = sys.intern(icon)
+
+    def __repr__(self):
+        return f"ItemInfo({self.name!r}, {self.category!r}, {self.rarity!r}, {self.icon!r})"
+
+
+class ItemIndex:
+    """Item name -> ItemInfo, compiled once from the loot table.
+
+    Entries may carry explicit "category", "rarity" and "icon" fields;
+    anything missing is filled in from the keyword heuristics. Names not in
+    the table are classified on first lookup and remembered.
+    """
+
+    def __init__(self, loot_table=()):
+        self.items = {}
+        for entry in loot_table:
+            info = self.build(entry["name"], entry)
+            self.items[info.name] = info
+
+    @staticmethod
+    def build(name, entry=None):
+        entry = entry or {}
+        category = entry.get("category") or guess_category(name)
+        rarity = entry.get("rarity") or "common"
+        icon = entry.get("icon") or guess_icon(name, category)
+        return ItemInfo(name, category, rarity, icon)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, item_name):
+        return item_name in self.items
+
+    def get(self, item_name):
+        info = self.items.get(item_name)
+        if info is None:
+            info = self.build(item_name)
+            self.items[info.name] = info
+        return info
@@ -0,0 +1,57 @@
+DEFAULT_STEP = 1 / 60
+
+
+class FixedStepLoop:
+    """Fixed-timestep accumulator that decouples game logic from rendering.
+
+    advance() runs update(step) as many times as the elapsed wall time
+    allows, at most `max_frame_skip` times per rendered frame. Time beyond
+    that is dropped (the game slows down instead of spiralling), so logic
+    always advances in identical steps. ``alpha`` is the leftover fraction
+    of a step, for interpolating what gets drawn.
+    """
+
+    def __init__(self, step=DEFAULT_STEP, max_frame_skip=5):
+        self.step = step
+        self.max_frame_skip = max_frame_skip
+        self.accumulator = 0.0
+        self.alpha = 0.0
+        self.steps = 0  # total fixed steps run
+        self.dropped_time = 0.0  # seconds discarded under load
+
+    def advance(self, elapsed, update):
+        """Feed elapsed wall time; returns the number of fixed steps run"""
+        self.accumulator += elapsed
+        steps = 0
+        while self.accumulator >= self.step and steps < self.max_frame_skip:
+            update(self.step)
+            self.accumulator -= self.step
+            steps += 1
+            self.steps += 1  # kept current, so update() can read its own step index
+        if self.accumulator >= self.step:
+            dropped = self.accumulator - self.accumulator % self.step
+            self.dropped_time += dropped
+            self.accumulator -= dropped
+        self.alpha = self.accumulator / self.step
+        return steps
+
+
+def run_headless(screen, steps, step=DEFAULT_STEP, events=None, surface=None):
+    """Drive a screen for a number of fixed steps as fast as possible.
+
+    events maps a step number to the events handled before that step's
+    update. If surface is given, every step is also drawn to it, which
+    exercises the render path without a window. Returns the actions the
+    screen returned from handle_event, as (step, action) pairs.
+    """
+    events = events or {}
+    actions = []
+    for index in range(steps):
+        for event in events.get(index, ()):
+            action = screen.handle_event(event)
+            if action:
+                actions.append((index, action))
+        screen.update(step)
+        if surface is not None:
+            screen.draw(surface)
+    return actions
@@ -0,0 +1,395 @@
+import hashlib
+import json
+import marshal
+import math
+import os
+import struct
+import threading
+from array import array
+from collections import deque
+from itertools import accumulate
+from lootbox_sim.sampler import AliasSampler, FenwickSampler
+from lootbox_sim.items import ItemIndex
+from lootbox_sim.event_log import get_logger
+
+LOOT_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'loot_table.json')
+
+# Used when the JSON file is missing or unreadable
+FALLBACK_LOOT_TABLE = [
+    {"name": "Common Sword", "chance": 0.6, "category": "weapon", "rarity": "common", "icon": "sword"},
+    {"name": "Rare Shield", "chance": 0.25, "category": "armor", "rarity": "uncommon", "icon": "shield"},
+    {"name": "Epic Staff", "chance": 0.1, "category": "weapon", "rarity": "epic", "icon": "staff"},
+    {"name": "Legendary Dragon", "chance": 0.05, "category": "legendary", "rarity": "legendary",
+     "icon": "legendary"}
+]
+
+# Compiled table sidecar: magic, format version, JSON sha256, item count
+CACHE_SUFFIX = '.cache'
+CACHE_MAGIC = b'LBTC'
+CACHE_VERSION = 1
+CACHE_HEADER = struct.Struct('<4sHH32sI')
+
+
+class LootTableError(ValueError):
+    """Raised when a loot table fails validation"""
+
+
+def load_loot_table(path=LOOT_TABLE_PATH):
+    """Load loot table from JSON file, falling back to a small built-in table"""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return [dict(item) for item in FALLBACK_LOOT_TABLE]
+
+
+def validate_loot_table(loot_table):
+    """Check the table's structure, raising LootTableError on the first problem"""
+    if not isinstance(loot_table, list) or not loot_table:
+        raise LootTableError("loot table must be a non-empty list")
+    names = set()
+    for position, entry in enumerate(loot_table):
+        if not isinstance(entry, dict):
+            raise LootTableError(f"entry {position} is not an object")
+        name = entry.get("name")
+        if not isinstance(name, str) or not name:
+            raise LootTableError(f"entry {position} has no name")
+        if name in names:
+            raise LootTableError(f"duplicate item {name!r}")
+        names.add(name)
+        chance = entry.get("chance")
+        if isinstance(chance, bool) or not isinstance(chance, (int, float)):
+            raise LootTableError(f"{name!r} has a non-numeric chance")
+        if not math.isfinite(chance) or chance < 0:
+            raise LootTableError(f"{name!r} has an invalid chance {chance!r}")
+        stock = entry.get("stock")
+        if stock is not None and (isinstance(stock, bool) or not isinstance(stock, int) or stock < 0):
+            raise LootTableError(f"{name!r} has an invalid stock {stock!r}")
+    if sum(entry["chance"] for entry in loot_table) <= 0:
+        raise LootTableError("loot table has no item with a positive chance")
+
+
+class CompiledLootTable:
+    """A validated loot table with normalized chances and precomputed samplers.
+
+    ``entries`` are copies of the source entries whose "chance" is
+    normalized to sum to 1. ``raw_total`` is what the source chances
+    summed to, ``dead`` lists items with zero chance and ``unreachable``
+    lists items a plain cumulative scan of the raw chances could never
+    reach (because earlier chances already sum to 1 or more).
+
+    prepare() adds what GameScreen swaps in (see its docstring); until
+    then those attributes are None.
+    """
+
+    def __init__(self, entries, cumulative, alias_prob, alias_index, raw_total, dead, unreachable,
+                 digest=None):
+        self.entries = entries
+        self.cumulative = cumulative
+        self.alias_prob = alias_prob
+        self.alias_index = alias_index
+        self.raw_total = raw_total
+        self.dead = dead
+        self.unreachable = unreachable
+        self.digest = digest
+        self.names = None
+        self.chances = None
+        self.chance_total = None
+        self.positive = None
+        self.indices = None
+        self.item_index = None
+        self.stocked = None
+        self.sampler = None
+        self.sampler_taken = False
+        self.base_digest = None
+        self.rarity_changed = self.icon_changed = frozenset()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def prepare(self, previous=None):
+        """Build the game-side lookups and sampler, once; returns self.
+
+        names, chances (an array, with chance_total and the number of
+        positive chances for DropTelemetry), indices (name -> index), item_index (an
+        ItemIndex), stocked ((index, name, stock) of limited-stock items)
+        and a FenwickSampler over the chances. LootTableWatcher calls this
+        on its thread, so swapping a reloaded table in costs the frame loop
+        only reference assignments. With previous, the prepared table it
+        replaces, the names whose rarity or icon changed are worked out
+        too, valid when swapped in over the table with base_digest.
+        """
+        if self.item_index is None:
+            entries = self.entries
+            self.names = [entry["name"] for entry in entries]
+            self.chances = array('d', [entry["chance"] for entry in entries])
+            self.chance_total = math.fsum(self.chances)
+            self.positive = len(entries) - self.chances.count(0.0)
+            self.indices = {name: index for index, name in enumerate(self.names)}
+            self.item_index = ItemIndex(entries)
+            self.stocked = [(index, entry["name"], entry["stock"])
+                            for index, entry in enumerate(entries) if "stock" in entry]
+            self.sampler = FenwickSampler(self.chances)
+        if previous is not None and previous.item_index is not None and previous.digest is not None:
+            self.rarity_changed, self.icon_changed = changed_items(previous.item_index, self.item_index)
+            self.base_digest = previous.digest
+        return self
+
+    def take_sampler(self, rng):
+        """The prepared FenwickSampler bound to rng; a table swapped in again gets a fresh one"""
+        if self.sampler_taken:
+            return FenwickSampler(self.chances, rng)
+        self.sampler_taken = True
+        self.sampler.rng = rng
+        return self.sampler
+
+    def problems(self):
+        """Human-readable warnings about the source table"""
+        messages = []
+        if abs(self.raw_total - 1.0) > 1e-9:
+            messages.append(f"chances sum to {self.raw_total:.6g}, normalized to 1")
+        if self.unreachable:
+            messages.append("unreachable before normalization: " + ", ".join(self.unreachable))
+        if self.dead:
+            messages.append("zero chance: " + ", ".join(self.dead))
+        return messages
+
+
+def changed_items(old_index, new_index):
+    """(names whose rarity changed, names whose icon changed) between two ItemIndexes"""
+    # Copied first: the game thread may still be adding guessed names to old_index
+    old_items = dict(old_index.items)
+    new_items = new_index.items
+    rarity, icon = set(), set()
+    for name in old_items.keys() | new_items.keys():
+        old = old_items.get(name) or ItemIndex.build(name)
+        new = new_items.get(name) or ItemIndex.build(name)
+        if old.rarity != new.rarity:
+            rarity.add(name)
+        if old.icon != new.icon:
+            icon.add(name)
+    return frozenset(rarity), frozenset(icon)
+
+
+def compile_loot_table(loot_table, digest=None):
+    """Validate and normalize a loot table and precompute its sampling arrays"""
+    validate_loot_table(loot_table)
+    raw = [entry["chance"] for entry in loot_table]
+    raw_total = math.fsum(raw)
+
+    dead = [entry["name"] for entry, chance in zip(loot_table, raw) if chance == 0]
+    unreachable = [entry["name"] for entry, start in zip(loot_table, accumulate([0] + raw))
+                   if start >= 1.0 and entry["chance"] > 0]
+
+    entries = []
+    for entry, chance in zip(loot_table, raw):
+        entry = dict(entry)
+        entry["chance"] = chance / raw_total
+        entries.append(entry)
+
+    # Pin the top of the cumulative array to exactly 1.0 so rounding can
+    # never leave a gap that yields no item
+    cumulative = list(accumulate(entry["chance"] for entry in entries))
+    top = cumulative[-1]
+    cumulative = [1.0 if c == top else c for c in cumulative]
+
+    alias = AliasSampler([entry["chance"] for entry in entries])
+    return CompiledLootTable(entries, cumulative, alias.prob, alias.alias,
+                             raw_total, dead, unreachable, digest)
+
+
+def cache_path_for(path):
+    return path + CACHE_SUFFIX
+
+
+def write_cache(compiled, cache_path):
+    """Write a compiled table to its binary sidecar (best effort)"""
+    n = len(compiled.entries)
+    payload = [
+        CACHE_HEADER.pack(CACHE_MAGIC, CACHE_VERSION, marshal.version, compiled.digest, n),
+        array('d', [compiled.raw_total]).tobytes(),
+        array('d', compiled.cumulative).tobytes(),
+        array('d', compiled.alias_prob).tobytes(),
+        array('i', compiled.alias_index).tobytes(),
+        marshal.dumps((compiled.entries, compiled.dead, compiled.unreachable)),
+    ]
+    tmp_path = cache_path + '.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(b''.join(payload))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+
+def read_cache(cache_path, digest):
+    """Load a compiled table from its sidecar, or None if missing or stale"""
+    try:
+        with open(cache_path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    if len(data) < CACHE_HEADER.size:
+        return None
+    magic, version, marshal_version, cached_digest, n = CACHE_HEADER.unpack_from(data)
+    if (magic, version, marshal_version, cached_digest) != (CACHE_MAGIC, CACHE_VERSION,
+                                                            marshal.version, digest):
+        return None
+
+    layout = (('d', 1), ('d', n), ('d', n), ('i', n))
+    if len(data) < CACHE_HEADER.size + sum(array(typecode).itemsize * count for typecode, count in layout):
+        return None  # truncated
+
+    view = memoryview(data)
+    offset = CACHE_HEADER.size
+    arrays = []
+    for typecode, count in layout:
+        values = array(typecode)
+        size = values.itemsize * count
+        values.frombytes(view[offset:offset + size])
+        arrays.append(values)
+        offset += size
+    try:
+        entries, dead, unreachable = marshal.loads(view[offset:])
+    except (EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(entries, list) or len(entries) != n:
+        return None
+    raw_total, cumulative, alias_prob, alias_index = arrays
+    return CompiledLootTable(entries, list(cumulative), list(alias_prob), list(alias_index),
+                             raw_total[0], dead, unreachable, digest)
+
+
+def load_compiled_loot_table(path=LOOT_TABLE_PATH, use_cache=True):
+    """Load and compile a loot table, reusing the binary sidecar when the JSON is unchanged.
+
+    Missing, unparseable or invalid tables fall back to FALLBACK_LOOT_TABLE.
+    """
+    try:
+        with open(path, 'rb') as f:
+            raw_bytes = f.read()
+    except FileNotFoundError:
+        return compile_loot_table(FALLBACK_LOOT_TABLE)
+
+    digest = hashlib.sha256(raw_bytes).digest()
+    cache_path = cache_path_for(path)
+    if use_cache:
+        compiled = read_cache(cache_path, digest)
+        if compiled is not None:
+            return compiled
+
+    try:
+        compiled = compile_loot_table(json.loads(raw_bytes), digest)
+    except (json.JSONDecodeError, UnicodeDecodeError, LootTableError) as error:
+        get_logger().error("loot_table_invalid", path=path, error=str(error),
+                           message=f"Invalid loot table {path}: {error}")
+        return compile_loot_table(FALLBACK_LOOT_TABLE)
+
+    for problem in compiled.problems():
+        get_logger().warning("loot_table_problem", path=path, problem=problem,
+                             message=f"Loot table {os.path.basename(path)}: {problem}")
+    if use_cache:
+        write_cache(compiled, cache_path)
+    return compiled
+
+
+class LootTableWatcher:
+    """Polls a loot table file and compiles changed versions off the frame loop.
+
+    A background thread stats the file every `interval` seconds. When
+    the mtime or size changes and the content hash differs from the
+    table in use, it parses, validates, compiles and prepares the new
+    table (relative to `current`, the prepared table in use). The result
+    waits in a one-slot mailbox until the game thread collects it
+    with poll() between frames. An invalid file is logged and kept in
+    ``error``, and the previous table stays in use.
+    """
+
+    def __init__(self, path=LOOT_TABLE_PATH, digest=None, interval=1.0, current=None):
+        self.path = path
+        self.digest = digest  # sha256 of the table in use (or being handed over)
+        self.current = current  # the table in use (or being handed over)
+        self.interval = interval
+        self.stat = self.stat_file()
+        self.pending = deque(maxlen=1)  # newest compiled table not yet collected
+        self.released = deque()  # swapped-out tables, dropped on the watcher thread
+        self.error = None
+        self.wake = threading.Event()
+        self.stopping = False
+        self.thread = None
+
+    def stat_file(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def check(self):
+        """Compile the file if it changed; returns the new table or None"""
+        stat = self.stat_file()
+        if stat is None or stat == self.stat:
+            return None
+        self.stat = stat
+        try:
+            with open(self.path, 'rb') as f:
+                raw_bytes = f.read()
+        except OSError:
+            return None
+        digest = hashlib.sha256(raw_bytes).digest()
+        if digest == self.digest:
+            return None
+        try:
+            compiled = compile_loot_table(json.loads(raw_bytes), digest)
+        except (json.JSONDecodeError, UnicodeDecodeError, LootTableError) as error:
+            self.error = str(error)
+            get_logger().error("loot_table_reload_failed", path=self.path, error=self.error,
+                               message=f"Keeping current loot table, {self.path} is invalid: {error}")
+            return None
+        self.error = None
+        self.digest = digest
+        for problem in compiled.problems():
+            get_logger().warning("loot_table_problem", path=self.path, problem=problem,
+                                 message=f"Loot table {os.path.basename(self.path)}: {problem}")
+        write_cache(compiled, cache_path_for(self.path))
+        compiled.prepare(self.current)
+        self.current = compiled
+        self.pending.append(compiled)
+        return compiled
+
+    def poll(self):
+        """Take the newest compiled table, if any (called from the game thread)"""
+        try:
+            return self.pending.pop()
+        except IndexError:
+            return None
+
+    def release(self, loot_table):
+        """Hand over a swapped-out table to be freed on the watcher thread.
+
+        Freeing tens of thousands of entries takes milliseconds, which
+        would otherwise land on the frame that swapped the table out.
+        """
+        if self.thread is not None:
+            self.released.append(loot_table)
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, name="loot-table-watcher", daemon=True)
+            self.thread.start()
+
+    def run(self):
+        while not self.stopping:
+            self.wake.wait(self.interval)
+            self.wake.clear()
+            if not self.stopping:
+                self.check()
+            self.released.clear()
+
+    def close(self):
+        if self.thread is None:
+            return
+        self.stopping = True
+        self.wake.set()
+        self.thread.join()
+        self.thread = None
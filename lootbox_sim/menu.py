@@ -1,10 +1,19 @@
 import pygame
+from lootbox_sim.fonts import get_font, render_text
 
 class MenuScreen:
-    def __init__(self, width, height):
+    def __init__(self, width, height, assets=None):
         self.width = width
         self.height = height
-        self.font = pygame.font.SysFont(None, 64)
+        self.font = get_font(None, 64)
+        self.needs_redraw = True
+
+        # Background asset loading (an AssetManager, polled by the main
+        # loop); the bar shows its progress
+        self.assets = assets
+        self.progress = 1.0 if assets is None else assets.progress
+        self.loading_bar = pygame.Rect(width//2 - 150, height//2 + 140, 300, 16)
+        self.loading_bar_dirty = False
 
         # Buttons
         self.buttons = {
@@ -13,6 +22,7 @@ class MenuScreen:
         }
 
     def handle_event(self, event):
+        self.needs_redraw = True
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             pos = event.pos
             if self.buttons["Start"].collidepoint(pos):
@@ -21,16 +31,60 @@ class MenuScreen:
                 return "quit"
         return None
 
-    def update(self, dt):
+    def enter(self):
+        """Called each time this screen becomes active"""
+        self.needs_redraw = True
+
+    def exit(self):
+        """Called when switching away; state is kept for the next enter()"""
         pass
 
+    def set_render_offset(self, seconds):
+        """The menu has no animations to interpolate"""
+        pass
+
+    def update(self, dt):
+        if self.assets is None:
+            return
+        progress = self.assets.progress
+        if progress != self.progress:
+            self.progress = progress
+            self.loading_bar_dirty = True
+
+    @property
+    def loading(self):
+        return self.progress < 1.0
+
+    def get_dirty_rects(self):
+        """The menu is static: redraw only after input, or the loading bar as it fills"""
+        if self.needs_redraw:
+            self.needs_redraw = False
+            self.loading_bar_dirty = False
+            return None
+        if self.loading_bar_dirty:
+            self.loading_bar_dirty = False
+            # The finishing frame clears the whole bar area
+            return [self.loading_bar.inflate(4, 4)]
+        return []
+
     def draw(self, surface):
         surface.fill((20, 20, 40))
-        title_surf = self.font.render("Loot Box Simulator", True, (255, 255, 255))
+        title_surf = render_text(self.font, "Loot Box Simulator", (255, 255, 255))
         surface.blit(title_surf, (self.width//2 - title_surf.get_width()//2, 100))
 
         for text, rect in self.buttons.items():
             pygame.draw.rect(surface, (200, 200, 50), rect)
-            text_surf = self.font.render(text, True, (0, 0, 0))
+            text_surf = render_text(self.font, text, (0, 0, 0))
             surface.blit(text_surf, (rect.x + rect.width//2 - text_surf.get_width()//2,
                                      rect.y + rect.height//2 - text_surf.get_height()//2))
+
+        if self.loading:
+            self.draw_loading_bar(surface)
+
+    def draw_loading_bar(self, surface):
+        bar = self.loading_bar
+        pygame.draw.rect(surface, (60, 60, 90), bar)
+        filled = bar.copy()
+        filled.width = int(bar.width * self.progress)
+        pygame.draw.rect(surface, (200, 200, 50), filled)
+        pygame.draw.rect(surface, (255, 255, 255), bar, 2)
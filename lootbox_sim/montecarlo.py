@@ -0,0 +1,116 @@
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from lootbox_sim.loot_table import load_compiled_loot_table
+from lootbox_sim.simulation import BatchSimulator, DEFAULT_MIMIC_CHANCE
+
+
+def player_rng(seed, player):
+    """Independent RNG stream for one simulated player.
+
+    Streams are keyed by (seed, player) rather than by worker, so results do
+    not depend on how players are sharded across processes.
+    """
+    return random.Random(f"{seed}:{player}")
+
+
+def simulate_shard(loot_table, mimic_chance, opens_per_player, seed, first_player, last_player):
+    """Simulate players [first_player, last_player) and return their merged histograms"""
+    start = time.perf_counter()
+    sim = BatchSimulator(loot_table, mimic_chance)
+    item_totals = [0] * len(sim.item_names)
+    net_items = Counter()  # net item count -> number of players
+    mimics = thefts = 0
+
+    for player in range(first_player, last_player):
+        sim.rng = player_rng(seed, player)
+        result = sim.run(opens_per_player)
+        counts = result.counts
+        for index in result.held:
+            item_totals[index] += counts[index]
+        net_items[sum(counts)] += 1
+        mimics += result.mimics
+        thefts += result.thefts
+
+    return {
+        "pid": os.getpid(),
+        "players": last_player - first_player,
+        "opens": (last_player - first_player) * opens_per_player,
+        "seconds": time.perf_counter() - start,
+        "item_totals": item_totals,
+        "net_items": net_items,
+        "mimics": mimics,
+        "thefts": thefts,
+    }
+
+
+class MonteCarloResult:
+    """Merged outcome of a Monte Carlo run"""
+
+    def __init__(self, item_names):
+        self.item_names = item_names
+        self.item_totals = [0] * len(item_names)
+        self.net_items = Counter()
+        self.players = 0
+        self.opens = 0
+        self.mimics = 0
+        self.thefts = 0
+        self.worker_stats = {}  # pid -> {"opens": ..., "seconds": ...}
+        self.wall_seconds = 0.0
+
+    def merge(self, shard):
+        for index, count in enumerate(shard["item_totals"]):
+            self.item_totals[index] += count
+        self.net_items.update(shard["net_items"])
+        self.players += shard["players"]
+        self.opens += shard["opens"]
+        self.mimics += shard["mimics"]
+        self.thefts += shard["thefts"]
+        stats = self.worker_stats.setdefault(shard["pid"], {"opens": 0, "seconds": 0.0})
+        stats["opens"] += shard["opens"]
+        stats["seconds"] += shard["seconds"]
+
+    def item_counts(self):
+        return dict(zip(self.item_names, self.item_totals))
+
+    def worker_throughput(self):
+        """Opens per second for each worker process"""
+        return {pid: stats["opens"] / stats["seconds"] if stats["seconds"] else 0.0
+                for pid, stats in self.worker_stats.items()}
+
+    def print_report(self):
+        print(f"Players: {self.players}  Opens: {self.opens}  Wall: {self.wall_seconds:.2f}s")
+        for pid, rate in sorted(self.worker_throughput().items()):
+            print(f"  worker {pid}: {rate:,.0f} opens/s")
+
+
+def run_monte_carlo(n_players, opens_per_player, seed=0, workers=None, loot_table=None,
+                    mimic_chance=DEFAULT_MIMIC_CHANCE, shards_per_worker=4):
+    """Simulate n_players independent players across a process pool.
+
+    For a given seed the merged result is identical for any worker count.
+    workers=1 runs in-process without a pool.
+    """
+    if loot_table is None:
+        loot_table = load_compiled_loot_table().entries
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    shard_count = max(1, min(n_players, workers * shards_per_worker))
+    bounds = [n_players * i // shard_count for i in range(shard_count + 1)]
+    jobs = [(loot_table, mimic_chance, opens_per_player, seed, bounds[i], bounds[i + 1])
+            for i in range(shard_count)]
+
+    result = MonteCarloResult([item["name"] for item in loot_table])
+    start = time.perf_counter()
+    if workers == 1:
+        shards = [simulate_shard(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            shards = list(pool.map(simulate_shard, *zip(*jobs)))
+    for shard in shards:
+        result.merge(shard)
+    result.wall_seconds = time.perf_counter() - start
+    return result
@@ -0,0 +1,153 @@
+import math
+import random
+from array import array
+import pygame
+
+# Palette shared by all particles; emit() takes an index into it
+PARTICLE_COLORS = (
+    (255, 255, 150),  # sparkle
+    (255, 215, 0),    # gold
+    (255, 100, 255),  # legendary magenta
+    (220, 40, 40),    # mimic red
+    (255, 255, 255),  # white
+)
+SPARKLE, GOLD, MAGENTA, RED, WHITE = range(len(PARTICLE_COLORS))
+
+# Particles shrink through these radii as they age
+SPRITE_RADII = (1, 2, 3, 4)
+
+
+class ParticlePool:
+    """Fixed-capacity particle pool stored in flat arrays.
+
+    Launch position, velocity, birth time, lifetime and color of every
+    particle live in preallocated ``array`` buffers; dead particles are
+    swap-removed, so there are no per-particle Python objects. Motion
+    under gravity has a closed form, so a particle's position is computed
+    from its age when it is drawn: update() only advances the clock, and
+    walks the particles only on frames where one has expired.
+
+    Particles are drawn with one ``Surface.blits`` call. Each slot owns a
+    ``[sprite, Rect]`` entry created with the pool and rewritten in place,
+    and the list handed to blits() is kept between frames, so drawing
+    builds no per-particle tuples.
+    """
+
+    def __init__(self, capacity=4096, gravity=120.0, rng=None):
+        self.capacity = capacity
+        self.gravity = gravity
+        self.rng = rng if rng is not None else random.Random()
+        self.count = 0
+        self.clock = 0.0  # seconds of update() so far
+        self.next_death = math.inf  # earliest clock at which a live particle expires
+        zeros = array('f', [0.0]) * capacity
+        self.x = array('f', zeros)  # launch position
+        self.y = array('f', zeros)
+        self.vx = array('f', zeros)  # launch velocity
+        self.vy = array('f', zeros)
+        self.born = array('d', bytes(8 * capacity))  # clock at emit()
+        self.max_life = array('f', zeros)
+        self.color = array('B', bytes(capacity))
+        self.sprites = None  # built lazily: sprites[color][size]
+        # One [sprite, dest] entry per slot, updated in place by draw()
+        self.entries = [[None, pygame.Rect(0, 0, 0, 0)] for _ in range(capacity)]
+        self.batch = []  # entries[:count] for blits(), kept between frames
+
+    def __len__(self):
+        return self.count
+
+    def build_sprites(self):
+        self.sprites = []
+        for color in PARTICLE_COLORS:
+            sizes = []
+            for radius in SPRITE_RADII:
+                sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+                pygame.draw.circle(sprite, color, (radius, radius), radius)
+                sizes.append(sprite)
+            self.sprites.append(sizes)
+
+    def emit(self, n, x, y, color, speed=120.0, life=1.0, spread=math.tau, direction=-math.pi / 2):
+        """Spawn up to n particles at (x, y); extra particles past capacity are dropped"""
+        n = min(n, self.capacity - self.count)
+        rand = self.rng.random
+        clock = self.clock
+        next_death = self.next_death
+        for i in range(self.count, self.count + n):
+            angle = direction + (rand() - 0.5) * spread
+            velocity = speed * (0.4 + 0.6 * rand())
+            self.x[i] = x
+            self.y[i] = y
+            self.vx[i] = math.cos(angle) * velocity
+            self.vy[i] = math.sin(angle) * velocity
+            self.max_life[i] = life * (0.6 + 0.4 * rand())
+            self.born[i] = clock
+            next_death = min(next_death, clock + self.max_life[i])
+            self.color[i] = color
+        self.next_death = next_death
+        self.count += n
+
+    def position(self, i):
+        """Current (x, y) of live particle i"""
+        age = self.clock - self.born[i]
+        return (self.x[i] + self.vx[i] * age,
+                self.y[i] + (self.vy[i] + 0.5 * self.gravity * age) * age)
+
+    def update(self, dt):
+        """Advance the clock and swap-remove the particles that expired"""
+        self.clock = clock = self.clock + dt
+        if clock < self.next_death:
+            return
+        xs, ys, vxs, vys, borns, max_lives, colors = (
+            self.x, self.y, self.vx, self.vy, self.born, self.max_life, self.color)
+        next_death = math.inf
+        i = 0
+        count = self.count
+        while i < count:
+            death = borns[i] + max_lives[i]
+            if death <= clock:
+                count -= 1
+                xs[i] = xs[count]
+                ys[i] = ys[count]
+                vxs[i] = vxs[count]
+                vys[i] = vys[count]
+                borns[i] = borns[count]
+                max_lives[i] = max_lives[count]
+                colors[i] = colors[count]
+                continue
+            if death < next_death:
+                next_death = death
+            i += 1
+        self.count = count
+        self.next_death = next_death
+
+    def draw(self, surface):
+        if not self.count:
+            return
+        if self.sprites is None:
+            self.build_sprites()
+        sprites = self.sprites
+        last_size = len(SPRITE_RADII) - 1
+        clock = self.clock
+        half_gravity = 0.5 * self.gravity
+        count = self.count
+        # Keep batch the first count entries; only growing it copies references
+        batch = self.batch
+        if len(batch) > count:
+            del batch[count:]
+        elif len(batch) < count:
+            batch.extend(self.entries[len(batch):count])
+        # zip() stops at the live count, batch being the shortest
+        for entry, x, y, vx, vy, born, max_life, color in zip(
+                batch, self.x, self.y, self.vx, self.vy, self.born, self.max_life, self.color):
+            age = clock - born
+            size = int((1 - age / max_life) * last_size + 0.5)
+            radius = SPRITE_RADII[size]
+            entry[0] = sprites[color][size]
+            dest = entry[1]
+            dest.x = int(x + vx * age) - radius
+            dest.y = int(y + (vy + half_gravity * age) * age) - radius
+        surface.blits(batch, doreturn=False)
+
+    def clear(self):
+        self.count = 0
+        self.next_death = math.inf
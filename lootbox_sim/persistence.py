@@ -0,0 +1,218 @@
+import json
+import os
+import struct
+import threading
+from collections import deque
+
+# Log records: opcode + item id; OP_NAME is followed by a length-prefixed UTF-8 name
+RECORD = struct.Struct('<BI')
+NAME_LENGTH = struct.Struct('<H')
+OP_ADD = 1
+OP_REMOVE = 2
+OP_NAME = 3
+OP_SOLD = 4  # one unit of a limited-stock item dropped
+EVENT_OPS = {"add": OP_ADD, "remove": OP_REMOVE, "sold": OP_SOLD}
+
+SNAPSHOT_FILE = 'inventory.snapshot'
+
+
+def log_file_name(generation):
+    return f'inventory.{generation}.log'
+
+
+def replay_log(data, names, counts, sold):
+    """Apply log records to names (id -> name), counts and sold (name -> count).
+
+    A truncated record at the end (e.g. after a crash mid-write) is ignored.
+    Returns the length of the complete records, where appending may resume.
+    """
+    offset = 0
+    complete = 0
+    end = len(data)
+    while offset + RECORD.size <= end:
+        op, item_id = RECORD.unpack_from(data, offset)
+        offset += RECORD.size
+        if op == OP_NAME:
+            if offset + NAME_LENGTH.size > end:
+                break
+            (length,) = NAME_LENGTH.unpack_from(data, offset)
+            offset += NAME_LENGTH.size
+            if offset + length > end:
+                break
+            name = bytes(data[offset:offset + length]).decode('utf-8')
+            offset += length
+            if item_id == len(names):
+                names.append(name)
+        elif item_id < len(names):
+            name = names[item_id]
+            if op == OP_ADD:
+                counts[name] = counts.get(name, 0) + 1
+            elif op == OP_REMOVE and counts.get(name, 0) > 0:
+                counts[name] -= 1
+                if not counts[name]:
+                    del counts[name]
+            elif op == OP_SOLD:
+                sold[name] = sold.get(name, 0) + 1
+        complete = offset
+    return complete
+
+
+class InventoryJournal:
+    """Append-only binary log of inventory changes with periodic snapshots.
+
+    record() only appends to an in-memory queue; a background thread
+    writes queued events to ``inventory.<generation>.log`` every
+    `flush_interval` seconds, so saving never blocks the frame loop.
+    Every `snapshot_every` events the writer snapshots the counts and
+    starts a new log generation, so load() replays at most one snapshot
+    plus the events written since.
+
+    Sales of limited-stock items ("sold" events from GameScreen's
+    stock_listeners) are journaled the same way and restored into
+    ``sold`` by load().
+    """
+
+    def __init__(self, directory, flush_interval=0.5, snapshot_every=10000):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.snapshot_every = snapshot_every
+        self.pending = deque()  # (op, item_name), appended from the game thread
+        self.names = []  # id -> name, owned by the writer
+        self.ids = {}
+        self.counts = {}
+        self.sold = {}
+        self.generation = 0
+        self.events_since_snapshot = 0
+        self.log_file = None
+        self.wake = threading.Event()
+        self.stopping = False
+        self.thread = None
+        self.lock = threading.Lock()  # serializes writer work (thread vs flush())
+
+    def path(self, file_name):
+        return os.path.join(self.directory, file_name)
+
+    def load(self):
+        """Recover counts from the snapshot and the tail of the current log"""
+        os.makedirs(self.directory, exist_ok=True)
+        names, counts, sold, generation = [], {}, {}, 0
+        try:
+            with open(self.path(SNAPSHOT_FILE), 'r') as f:
+                snapshot = json.load(f)
+            names = list(snapshot["names"])
+            counts = dict(snapshot["counts"])
+            sold = dict(snapshot.get("sold", {}))  # absent in older saves
+            generation = snapshot["generation"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            pass
+
+        try:
+            with open(self.path(log_file_name(generation)), 'r+b') as f:
+                data = f.read()
+                complete = replay_log(data, names, counts, sold)
+                if complete < len(data):
+                    # Drop the partial record so new ones are appended aligned
+                    f.truncate(complete)
+        except FileNotFoundError:
+            pass
+
+        self.names = names
+        self.ids = {name: item_id for item_id, name in enumerate(names)}
+        self.counts = counts
+        self.sold = sold
+        self.generation = generation
+        return dict(counts)
+
+    def attach(self, inventory):
+        """Restore saved items into inventory and log its future changes"""
+        inventory.restore(self.load())
+        inventory.listeners.append(self.record)
+        self.start()
+
+    def record(self, event, item_name):
+        """Inventory and stock listener: queue an "add", "remove" or "sold" event"""
+        self.pending.append((EVENT_OPS[event], item_name))
+
+    def start(self):
+        if self.thread is None:
+            self.log_file = open(self.path(log_file_name(self.generation)), 'ab')
+            self.thread = threading.Thread(target=self.run, name="inventory-journal", daemon=True)
+            self.thread.start()
+
+    def run(self):
+        while not self.stopping:
+            self.wake.wait(self.flush_interval)
+            self.wake.clear()
+            self.flush()
+
+    def encode(self, op, item_name, chunks):
+        item_id = self.ids.get(item_name)
+        if item_id is None:
+            item_id = len(self.names)
+            self.names.append(item_name)
+            self.ids[item_name] = item_id
+            encoded = item_name.encode('utf-8')
+            chunks.append(RECORD.pack(OP_NAME, item_id) + NAME_LENGTH.pack(len(encoded)) + encoded)
+        chunks.append(RECORD.pack(op, item_id))
+        if op == OP_ADD:
+            self.counts[item_name] = self.counts.get(item_name, 0) + 1
+        elif op == OP_SOLD:
+            self.sold[item_name] = self.sold.get(item_name, 0) + 1
+        elif self.counts.get(item_name, 0) > 0:
+            self.counts[item_name] -= 1
+            if not self.counts[item_name]:
+                del self.counts[item_name]
+
+    def flush(self):
+        """Write all queued events in one batch (runs on the writer thread)"""
+        with self.lock:
+            if self.log_file is None:
+                return
+            chunks = []
+            events = 0
+            while self.pending:
+                self.encode(*self.pending.popleft(), chunks)
+                events += 1
+            if chunks:
+                self.log_file.write(b''.join(chunks))
+                self.log_file.flush()
+                self.events_since_snapshot += events
+            if self.events_since_snapshot >= self.snapshot_every:
+                self.snapshot()
+
+    def snapshot(self):
+        """Persist current counts and sales and switch to a fresh log generation"""
+        old_generation = self.generation
+        new_generation = old_generation + 1
+        new_log = open(self.path(log_file_name(new_generation)), 'wb')
+
+        # Write the snapshot before dropping the old log, so a crash at any
+        # point leaves either the old or the new state recoverable
+        tmp_path = self.path(SNAPSHOT_FILE + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({"generation": new_generation, "names": self.names, "counts": self.counts,
+                       "sold": self.sold}, f)
+        os.replace(tmp_path, self.path(SNAPSHOT_FILE))
+
+        self.log_file.close()
+        self.log_file = new_log
+        self.generation = new_generation
+        self.events_since_snapshot = 0
+        try:
+            os.remove(self.path(log_file_name(old_generation)))
+        except FileNotFoundError:
+            pass
+
+    def close(self):
+        """Stop the writer, flush everything and take a final snapshot"""
+        if self.thread is None:
+            return
+        self.stopping = True
+        self.wake.set()
+        self.thread.join()
+        self.thread = None
+        self.flush()
+        with self.lock:
+            self.snapshot()
+            self.log_file.close()
+            self.log_file = None
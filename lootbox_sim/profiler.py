@@ -0,0 +1,140 @@
+import json
+import os
+import time
+from contextlib import nullcontext
+
+
+class RingBuffer:
+    """Fixed-size buffer keeping the most recent samples"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.data = [0.0] * capacity
+        self.index = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def add(self, value):
+        self.data[self.index] = value
+        self.index = (self.index + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def values(self):
+        if self.count < self.capacity:
+            return self.data[:self.count]
+        return self.data[self.index:] + self.data[:self.index]
+
+    def percentile(self, p):
+        if not self.count:
+            return 0.0
+        ordered = sorted(self.data[:self.count])
+        rank = min(self.count - 1, max(0, int(round(p / 100 * (self.count - 1)))))
+        return ordered[rank]
+
+
+class _Phase:
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, time.perf_counter())
+        return False
+
+
+class FrameProfiler:
+    """Records per-phase timings in milliseconds over the last `capacity` frames.
+
+    Use ``with profiler.phase("draw"):`` around a section. When `trace` is
+    on, every section is also kept (up to `max_trace_events`) for
+    dump_chrome_trace().
+    """
+
+    enabled = True
+
+    def __init__(self, capacity=300, trace=False, max_trace_events=200000):
+        self.capacity = capacity
+        self.samples = {}  # phase name -> RingBuffer of milliseconds
+        self.trace_events = [] if trace else None
+        self.max_trace_events = max_trace_events
+        self.origin = time.perf_counter()
+
+    def phase(self, name):
+        return _Phase(self, name)
+
+    def record(self, name, start, end):
+        buffer = self.samples.get(name)
+        if buffer is None:
+            buffer = self.samples[name] = RingBuffer(self.capacity)
+        buffer.add((end - start) * 1000)
+        if self.trace_events is not None and len(self.trace_events) < self.max_trace_events:
+            self.trace_events.append((name, start - self.origin, end - start))
+
+    def percentile(self, name, p):
+        buffer = self.samples.get(name)
+        return buffer.percentile(p) if buffer else 0.0
+
+    def summary(self):
+        """Phase name -> p50/p95/p99/max in milliseconds"""
+        return {
+            name: {
+                "p50": buffer.percentile(50),
+                "p95": buffer.percentile(95),
+                "p99": buffer.percentile(99),
+                "max": max(buffer.values()),
+            }
+            for name, buffer in self.samples.items() if len(buffer)
+        }
+
+    def draw_overlay(self, surface, font, x=5, y=5):
+        """Draw a small p50/p95 table in the corner of the screen"""
+        import pygame
+        lines = [f"{name}: {stats['p50']:.2f} / {stats['p95']:.2f} ms"
+                 for name, stats in sorted(self.summary().items())]
+        if not lines:
+            return
+        line_height = font.get_linesize()
+        width = max(font.size(line)[0] for line in lines) + 10
+        panel = pygame.Surface((width, line_height * len(lines) + 6), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        for i, line in enumerate(lines):
+            panel.blit(font.render(line, True, (180, 255, 180)), (5, 3 + i * line_height))
+        surface.blit(panel, (x, y))
+
+    def dump_chrome_trace(self, path):
+        """Write recorded sections as Chrome trace JSON (chrome://tracing, Perfetto)"""
+        events = [
+            {"name": name, "ph": "X", "ts": start * 1e6, "dur": duration * 1e6,
+             "pid": os.getpid(), "tid": 1}
+            for name, start, duration in (self.trace_events or [])
+        ]
+        with open(path, 'w') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+class NullProfiler:
+    """Drop-in profiler that records nothing"""
+
+    enabled = False
+
+    def phase(self, name):
+        return _NULL_PHASE
+
+    def record(self, name, start, end):
+        pass
+
+    def summary(self):
+        return {}
+
+
+_NULL_PHASE = nullcontext()
+NULL_PROFILER = NullProfiler()
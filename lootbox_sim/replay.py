@@ -0,0 +1,245 @@
+import json
+import sys
+import time
+import pygame
+from collections import deque
+from lootbox_sim.profiler import FrameProfiler
+from lootbox_sim.loop import DEFAULT_STEP
+from lootbox_sim.event_log import get_logger
+
+# Only input that can change game state is recorded; mouse motion and
+# window events are left out to keep recordings small
+RECORDED_EVENTS = (
+    pygame.KEYDOWN,
+    pygame.KEYUP,
+    pygame.MOUSEBUTTONDOWN,
+    pygame.MOUSEBUTTONUP,
+    pygame.MOUSEWHEEL,
+)
+EVENT_FIELDS = ('key', 'mod', 'unicode', 'scancode', 'button', 'pos', 'x', 'y')
+
+
+def encode_event(event):
+    """JSON-friendly dict with the event type and the fields screens read"""
+    entry = {"type": event.type}
+    for field in EVENT_FIELDS:
+        if field in event.dict:
+            value = event.dict[field]
+            entry[field] = list(value) if isinstance(value, tuple) else value
+    return entry
+
+
+def decode_event(entry):
+    fields = {field: tuple(value) if isinstance(value, list) else value
+              for field, value in entry.items() if field in EVENT_FIELDS}
+    return pygame.event.Event(entry["type"], fields)
+
+
+class SessionRecorder:
+    """Writes a session's input to a JSON Lines file for later replay.
+
+    The first line holds the seed and the fixed step size; every event
+    line holds the fixed step it was handled before plus the wall time
+    since recording started. The loot table the game started with and
+    every hot reload (with the step it was swapped in on) are recorded
+    too. Replaying the events at the same steps with the same seed and
+    tables reproduces the session exactly.
+    """
+
+    def __init__(self, path, seed, step=DEFAULT_STEP):
+        self.path = path
+        self.file = open(path, 'w')
+        self.start = time.perf_counter()
+        self.write({"seed": seed, "step": step, "pygame": pygame.version.ver})
+
+    def write(self, entry):
+        self.file.write(json.dumps(entry) + "\n")
+
+    def record(self, step_index, event):
+        """Log an event handed to a screen before fixed step step_index"""
+        if event.type not in RECORDED_EVENTS:
+            return
+        entry = encode_event(event)
+        entry["step"] = step_index
+        entry["time"] = round(time.perf_counter() - self.start, 6)
+        self.write(entry)
+
+    def record_inventory(self, items, sold=None):
+        """Log the items the player started with (e.g. restored from a save),
+        and the limited-stock sales made before this session"""
+        entry = {"inventory": dict(items)}
+        if sold:
+            entry["sold"] = dict(sold)
+        self.write(entry)
+
+    def record_loot_table(self, loot_table, step_index=None):
+        """Log a CompiledLootTable: the starting one, or one reloaded during step step_index"""
+        entry = {"loot_table": loot_table.entries, "digest": loot_table.digest}
+        if step_index is not None:
+            entry["step"] = step_index
+        self.write(entry)
+
+    def close(self, steps):
+        """Log the total number of fixed steps run and close the file"""
+        if self.file is None:
+            return
+        self.write({"end": steps})
+        self.file.close()
+        self.file = None
+
+
+def recorded_loot_table(entries, digest):
+    """Rebuild a recorded CompiledLootTable with the exact chances the session used"""
+    from lootbox_sim.loot_table import compile_loot_table
+    loot_table = compile_loot_table(entries, digest)
+    # Compiling renormalizes, which can move chances by a rounding error
+    loot_table.entries = [dict(entry) for entry in entries]
+    return loot_table
+
+
+class ReplayedReloads:
+    """Stands in for a LootTableWatcher, handing over recorded reloads at their steps"""
+
+    def __init__(self):
+        self.pending = deque(maxlen=1)
+
+    def poll(self):
+        return self.pending.popleft() if self.pending else None
+
+    def release(self, loot_table):
+        """Replays are not frame-bound: a swapped-out table is simply dropped"""
+
+
+def load_session(path):
+    """Read a recording: (header, inventory, events by step, total steps).
+
+    The header also gets "loot_table" (the starting table's entries and
+    digest, None in recordings made before tables were recorded),
+    "reloads" (step -> (entries, digest)) and "sold" (limited-stock sales
+    made before the session).
+    """
+    header = None
+    inventory = {}
+    events = {}
+    steps = 0
+    loot_table = None
+    reloads = {}
+    sold = {}
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            if header is None:
+                header = entry
+            elif "end" in entry:
+                steps = max(steps, entry["end"])
+            elif "inventory" in entry:
+                inventory = entry["inventory"]
+                sold = entry.get("sold", {})
+            elif "loot_table" in entry:
+                table = (entry["loot_table"], entry.get("digest"))
+                if "step" in entry:
+                    reloads[entry["step"]] = table
+                else:
+                    loot_table = table
+            else:
+                events.setdefault(entry["step"], []).append(decode_event(entry))
+                steps = max(steps, entry["step"] + 1)
+    if header is None:
+        raise ValueError(f"{path} is not a session recording")
+    header["loot_table"] = loot_table
+    header["reloads"] = reloads
+    header["sold"] = sold
+    return header, inventory, events, steps
+
+
+def replay_session(path, surface=None, profiler=None):
+    """Play a recording back headless, as fast as possible.
+
+    Mirrors run_game's frame loop one fixed step per frame: recorded
+    events go to the current screen, screen actions switch screens, and
+    the current screen is updated (and drawn, when surface is given).
+    The recorded loot table and its hot reloads are used, not the
+    loot_table.json on disk. Returns the ScreenManager, whose game screen
+    holds the final inventory; per-phase timings are in its profiler.
+    """
+    # Imported here: game.py imports this module for recording
+    from lootbox_sim.game import ScreenManager, SCREEN_ACTIONS
+    from lootbox_sim.menu import MenuScreen
+    from lootbox_sim.game_screen import GameScreen
+
+    header, inventory, events, steps = load_session(path)
+    step = header["step"]
+    if profiler is None:
+        profiler = FrameProfiler(capacity=max(1, steps))
+    if surface is None:
+        width, height = 800, 600
+    else:
+        width, height = surface.get_size()
+
+    reloads = ReplayedReloads()
+
+    def build_game_screen():
+        if header["loot_table"] is None:
+            # Older recording: only right if loot_table.json is unchanged since
+            get_logger().warning("replay_loot_table_unknown",
+                                 message=f"{path} has no recorded loot table; using the current one")
+            game_screen = GameScreen(width, height, seed=header["seed"])
+        else:
+            game_screen = GameScreen(width, height, seed=header["seed"],
+                                     loot_table=recorded_loot_table(*header["loot_table"]))
+        game_screen.inventory.restore(inventory)
+        game_screen.restore_sold(header["sold"])
+        game_screen.watch_loot_table(reloads)
+        return game_screen
+
+    screens = ScreenManager({
+        "menu": lambda: MenuScreen(width, height),
+        "game": build_game_screen,
+    }, profiler)
+    current_screen = screens.switch("menu")
+
+    for index in range(steps):
+        frame_start = time.perf_counter()
+        with profiler.phase("events"):
+            for event in events.get(index, ()):
+                action = current_screen.handle_event(event)
+                if action in SCREEN_ACTIONS:
+                    current_screen = screens.switch(SCREEN_ACTIONS[action])
+                elif action == "quit":
+                    return screens
+        if index in header["reloads"]:
+            reloads.pending.append(recorded_loot_table(*header["reloads"][index]))
+        with profiler.phase("update"):
+            current_screen.update(step)
+        if surface is not None:
+            with profiler.phase("draw"):
+                surface.fill((50, 50, 50))
+                current_screen.draw(surface)
+        profiler.record("frame", frame_start, time.perf_counter())
+    return screens
+
+
+def main(argv=None):
+    """python -m lootbox_sim.replay SESSION [--draw]"""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("usage: python -m lootbox_sim.replay SESSION [--draw]")
+        return 2
+    pygame.font.init()
+    surface = None
+    if "--draw" in argv:
+        surface = pygame.Surface((800, 600))
+    screens = replay_session(argv[0], surface=surface)
+    game_screen = screens.screens.get("game")
+    if game_screen is not None:
+        game_screen.inventory.print_inventory()
+    for name, stats in sorted(screens.profiler.summary().items()):
+        print(f"{name}: p50 {stats['p50']:.3f} ms  p95 {stats['p95']:.3f} ms  max {stats['max']:.3f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+import random
+from bisect import bisect_right
+from itertools import accumulate
+
+
+class CumulativeSampler:
+    """Inverse-CDF sampler over a list of weights using binary search.
+
+    The cumulative sums are built once, so every draw is a single
+    O(log n) bisect instead of re-walking the table. Weights are used as
+    given (not normalized): a uniform draw that lands past the total
+    yields ``None``, exactly like the original cumulative scan.
+    """
+
+    def __init__(self, weights, rng=random):
+        self.cumulative = list(accumulate(weights))
+        self.total = self.cumulative[-1] if self.cumulative else 0
+        self.rng = rng
+
+    @classmethod
+    def from_cumulative(cls, cumulative, rng=random):
+        """Build from precomputed cumulative sums (e.g. a compiled loot table)"""
+        sampler = cls.__new__(cls)
+        sampler.cumulative = list(cumulative)
+        sampler.total = sampler.cumulative[-1] if sampler.cumulative else 0
+        sampler.rng = rng
+        return sampler
+
+    def __len__(self):
+        return len(self.cumulative)
+
+    def index_for(self, r):
+        """Map a uniform value in [0, 1) to an index, or None if past the total"""
+        if r >= self.total:
+            return None
+        return bisect_right(self.cumulative, r)
+
+    def sample(self):
+        return self.index_for(self.rng.random())
+
+
+class AliasSampler:
+    """Walker/Vose alias table: O(n) to build, O(1) per draw.
+
+    Weights are normalized, so every draw returns a valid index.
+    """
+
+    def __init__(self, weights, rng=random):
+        n = len(weights)
+        total = sum(weights)
+        if n == 0 or total <= 0:
+            raise ValueError("AliasSampler needs at least one positive weight")
+        self.rng = rng
+        self.prob = [0.0] * n
+        self.alias = [0] * n
+
+        scaled = [w * n / total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] = (scaled[l] + scaled[s]) - 1.0
+            if scaled[l] < 1.0:
+                small.append(l)
+            else:
+                large.append(l)
+
+        # Whatever is left is 1.0 up to rounding error
+        for i in large + small:
+            self.prob[i] = 1.0
+            self.alias[i] = i
+
+    @classmethod
+    def from_tables(cls, prob, alias, rng=random):
+        """Build from precomputed probability and alias tables"""
+        sampler = cls.__new__(cls)
+        sampler.prob = list(prob)
+        sampler.alias = list(alias)
+        sampler.rng = rng
+        return sampler
+
+    def __len__(self):
+        return len(self.prob)
+
+    def index_for(self, r):
+        """Map a uniform value in [0, 1) to an index with a single lookup"""
+        n = len(self.prob)
+        u = r * n
+        i = min(int(u), n - 1)
+        if u - i < self.prob[i]:
+            return i
+        return self.alias[i]
+
+    def sample(self):
+        return self.index_for(self.rng.random())
+
+
+class FenwickSampler:
+    """Inverse-CDF sampler over weights that can change, backed by a Fenwick tree.
+
+    update() changes one weight in O(log n) and a draw walks down the
+    tree in O(log n), so per-open adjustments (stock running out, event
+    boosts, pity) never rebuild the whole cumulative array. Draws are
+    proportional to the current weights: index_for(r) maps r in [0, 1)
+    onto [0, total) and returns the index whose cumulative band contains
+    it, the same mapping as CumulativeSampler for weights summing to 1.
+    Returns None when every weight is zero.
+    """
+
+    def __init__(self, weights, rng=random):
+        self.weights = [float(w) for w in weights]
+        self.rng = rng
+        n = len(self.weights)
+        # tree[i] (1-based) holds the sum of weights (i - lowbit(i), i]
+        tree = [0.0] + self.weights
+        for i in range(1, n + 1):
+            parent = i + (i & -i)
+            if parent <= n:
+                tree[parent] += tree[i]
+        self.tree = tree
+        self.top_bit = 1 << (n.bit_length() - 1) if n else 0
+        self.total = self.prefix_sum(n)
+
+    def __len__(self):
+        return len(self.weights)
+
+    def prefix_sum(self, count):
+        """Sum of the first count weights"""
+        tree = self.tree
+        total = 0.0
+        while count > 0:
+            total += tree[count]
+            count &= count - 1
+        return total
+
+    def update(self, index, weight):
+        """Set the weight at index"""
+        if weight < 0:
+            raise ValueError("weights must be non-negative")
+        delta = weight - self.weights[index]
+        self.weights[index] = float(weight)
+        tree = self.tree
+        n = len(self.weights)
+        i = index + 1
+        while i <= n:
+            tree[i] += delta
+            i += i & -i
+        # Summed from the tree, so the walk in index_for() stays consistent with it
+        self.total = self.prefix_sum(n)
+
+    def index_for(self, r):
+        """Map a uniform value in [0, 1) to an index, or None if all weights are zero"""
+        total = self.total
+        if total <= 0:
+            return None
+        target = r * total
+        tree = self.tree
+        n = len(self.weights)
+        pos = 0
+        step = self.top_bit
+        while step:
+            nxt = pos + step
+            if nxt <= n and tree[nxt] <= target:
+                pos = nxt
+                target -= tree[nxt]
+            step >>= 1
+        # Rounding can walk past the last band or onto a zero weight
+        if pos >= n or self.weights[pos] <= 0:
+            return self.nearest_positive(min(pos, n - 1))
+        return pos
+
+    def nearest_positive(self, index):
+        weights = self.weights
+        for i in range(index, -1, -1):
+            if weights[i] > 0:
+                return i
+        for i in range(index + 1, len(weights)):
+            if weights[i] > 0:
+                return i
+        return None
+
+    def sample(self):
+        return self.index_for(self.rng.random())
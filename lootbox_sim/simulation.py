@@ -0,0 +1,115 @@
+import random
+from itertools import accumulate
+from lootbox_sim.inventory import Inventory, CompactInventory, ItemCatalog
+from lootbox_sim.loot_table import load_compiled_loot_table
+
+DEFAULT_MIMIC_CHANCE = 0.15
+
+
+class SimulationResult(CompactInventory):
+    """Aggregate state of one simulated player.
+
+    The items are a CompactInventory whose catalog ids are the loot table
+    indices, so outcomes index ``counts`` directly. Names added later (e.g.
+    held items that are not in the table) get ids past the table.
+    """
+
+    def __init__(self, item_names):
+        super().__init__(ItemCatalog(item_names))
+        if item_names:
+            self._grow(len(item_names) - 1)
+        self.opens = 0
+        self.drops = 0
+        self.mimics = 0
+        self.thefts = 0
+
+    @property
+    def item_names(self):
+        return self.catalog.names
+
+    @property
+    def inventory(self):
+        """Build a regular Inventory from the aggregate counts"""
+        inventory = Inventory()
+        inventory.restore(self.as_dict())
+        return inventory
+
+    def as_dict(self):
+        names, counts = self.catalog.names, self.counts
+        return {names[i]: counts[i] for i in self.held}
+
+
+class BatchSimulator:
+    """Headless loot box simulation following the same rules as GameScreen.
+
+    Each open is first checked against ``mimic_chance``; a mimic steals one
+    random distinct item (if any) and gives nothing, otherwise an item is
+    drawn from the loot table by cumulative chance. Outcomes are drawn a
+    batch at a time with ``random.choices`` and folded into flat count
+    arrays, so no Pygame display is needed.
+    """
+
+    def __init__(self, loot_table=None, mimic_chance=DEFAULT_MIMIC_CHANCE, rng=None, seed=None):
+        if loot_table is None:
+            loot_table = load_compiled_loot_table().entries
+        self.loot_table = loot_table
+        self.item_names = [item["name"] for item in loot_table]
+        self.mimic_chance = mimic_chance
+        self.rng = rng if rng is not None else random.Random(seed)
+
+        # Outcomes 0..n-1 are items, n is a mimic and n+1 is an empty draw.
+        # Item bands are clipped at 1.0 so a raw (uncompiled) table summing
+        # past 1 behaves like a plain cumulative scan.
+        n = len(self.item_names)
+        self.mimic_outcome = n
+        self.empty_outcome = n + 1
+        item_cumulative = [min(c, 1.0) for c in accumulate(item["chance"] for item in loot_table)]
+        self.population = [self.mimic_outcome] + list(range(n)) + [self.empty_outcome]
+        self.cum_weights = ([mimic_chance]
+                            + [mimic_chance + (1 - mimic_chance) * c for c in item_cumulative]
+                            + [1.0])
+
+    def draw_outcomes(self, k):
+        """Draw k raw outcomes (item index, mimic_outcome or empty_outcome)"""
+        return self.rng.choices(self.population, cum_weights=self.cum_weights, k=k)
+
+    def apply(self, result, outcomes):
+        """Fold a sequence of outcomes into result, in order"""
+        counts = result.counts
+        held = result.held
+        first_of_item = result.set_count
+        remove = result.remove_id
+        mimic = self.mimic_outcome
+        randbelow = self.rng.randrange
+        drops = mimics = thefts = 0
+
+        for outcome in outcomes:
+            if outcome < mimic:
+                count = counts[outcome]
+                if count:
+                    counts[outcome] = count + 1
+                else:
+                    first_of_item(outcome, 1)
+                drops += 1
+            elif outcome == mimic:
+                mimics += 1
+                if held:
+                    remove(held[randbelow(len(held))])
+                    thefts += 1
+
+        result.opens += len(outcomes)
+        result.drops += drops
+        result.mimics += mimics
+        result.thefts += thefts
+        return result
+
+    def run(self, n_opens, batch_size=65536, result=None):
+        """Simulate n_opens sequential opens for a single player"""
+        if result is None:
+            result = SimulationResult(self.item_names)
+        remaining = n_opens
+        while remaining > 0:
+            k = min(batch_size, remaining)
+            self.apply(result, self.draw_outcomes(k))
+            remaining -= k
+        return result
@@ -0,0 +1,83 @@
+import sys
+import threading
+import time
+
+
+class StartupTimer:
+    """Milestones from process start to the first rendered frame.
+
+    mark(name) records the seconds elapsed since `start` (a
+    time.perf_counter() value taken as early as possible, e.g. at the top
+    of main.py). The first mark of each name wins.
+    """
+
+    def __init__(self, start=None, exit_after_first_frame=False):
+        self.start = time.perf_counter() if start is None else start
+        self.exit_after_first_frame = exit_after_first_frame
+        self.marks = {}
+
+    def mark(self, name):
+        if name not in self.marks:
+            self.marks[name] = time.perf_counter() - self.start
+
+    def report(self):
+        return "\n".join(f"{name:>12}: {seconds * 1000:8.1f} ms" for name, seconds in self.marks.items())
+
+
+class Preloader:
+    """Imports the game screen and prepares the loot table on a background thread.
+
+    Started once the menu is on screen, so by the time the player clicks
+    Start the expensive part of building the game screen is already done.
+    result() waits for it, or does the work inline if it was never started.
+    """
+
+    def __init__(self):
+        self.thread = None
+        self.loot_table = None
+        self.seconds = None
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, name="preload", daemon=True)
+            self.thread.start()
+
+    def run(self):
+        start = time.perf_counter()
+        import lootbox_sim.game_screen  # noqa: F401  (warms the module cache)
+        from lootbox_sim.loot_table import load_compiled_loot_table
+        self.loot_table = load_compiled_loot_table().prepare()
+        self.seconds = time.perf_counter() - start
+
+    def result(self):
+        """The compiled loot table"""
+        if self.thread is None:
+            self.run()
+        else:
+            self.thread.join()
+        return self.loot_table
+
+
+def import_times(module="lootbox_sim.game", python=sys.executable):
+    """(self us, cumulative us, module) for each import of `module`, via python -X importtime"""
+    import subprocess
+    process = subprocess.run([python, "-X", "importtime", "-c", f"import {module}"],
+                             capture_output=True, text=True)
+    rows = []
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        try:
+            rows.append((int(fields[0]), int(fields[1]), fields[2].strip()))
+        except (IndexError, ValueError):
+            continue  # the header line
+    return rows
+
+
+def print_import_report(module="lootbox_sim.game", top=15):
+    rows = import_times(module)
+    total = max((cumulative for _, cumulative, _ in rows), default=0)
+    print(f"Importing {module}: {total / 1000:.1f} ms")
+    for self_us, cumulative, name in sorted(rows, key=lambda row: -row[1])[:top]:
+        print(f"  {cumulative / 1000:8.1f} ms cumulative {self_us / 1000:8.1f} ms self  {name}")
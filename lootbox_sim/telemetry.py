@@ -0,0 +1,335 @@
+import json
+import math
+import os
+import threading
+import time
+from array import array
+from collections import deque
+from lootbox_sim.analytics import LootAnalytics
+from lootbox_sim.loot_table import CompiledLootTable
+from lootbox_sim.event_log import get_logger
+
+# Chi-square bins expecting fewer draws than this are pooled into one bin
+MIN_EXPECTED = 5.0
+
+
+def regularized_gamma_q(a, x):
+    """Upper regularized incomplete gamma Q(a, x) = Gamma(a, x) / Gamma(a).
+
+    Series expansion below x = a + 1, Lentz's continued fraction above.
+    """
+    if x <= 0:
+        return 1.0
+    log_prefix = a * math.log(x) - x - math.lgamma(a)
+    if x < a + 1:
+        term = total = 1 / a
+        n = a
+        for _ in range(1000):
+            n += 1
+            term *= x / n
+            total += term
+            if abs(term) < abs(total) * 1e-15:
+                break
+        return max(0.0, 1 - total * math.exp(log_prefix))
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+    for i in range(1, 1000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+    return math.exp(log_prefix) * h
+
+
+def chi_square_p_value(statistic, dof):
+    """P(X >= statistic) for X chi-square distributed with dof degrees of freedom"""
+    if dof <= 0:
+        return 1.0
+    return regularized_gamma_q(dof / 2, statistic / 2)
+
+
+class DropTelemetry:
+    """Streaming counters of loot box outcomes with a goodness-of-fit check.
+
+    record_*() only bump fixed-size counters, so memory stays constant and
+    the frame loop pays a few array writes per open. chi_square() compares
+    the observed mimic / item / empty counts with the counts expected from
+    the loot table's chances; a p-value below `alpha` flags drift.
+
+    Items are drawn in proportion to their weights, which start as the
+    table's chances and can be changed with set_weight() (boosts,
+    sell-outs) in O(1). Expected counts are integrated lazily: ``scale``
+    is the sum of 1/total weight over all opens so far, and each item
+    expects weight * (scale - its mark) opens' worth of drops since its
+    last change, on top of what it had accrued before it. Weight changes
+    never reset the counters; only a new loot table does.
+
+    With a path, a background thread writes a JSON snapshot there every
+    `interval` seconds; a failed write is logged and retried on the next
+    tick.
+
+    message() keeps the game's latest drop and mimic announcements in a
+    bounded buffer that is included in snapshots.
+    """
+
+    enabled = True
+
+    def __init__(self, path=None, interval=1.0, alpha=0.001, recent=50):
+        self.path = path
+        self.interval = interval
+        self.alpha = alpha
+        self.recent = deque(maxlen=recent)
+        self.item_names = []
+        self.counts = array('Q')  # items..., mimic, empty
+        self.opens = 0
+        self.mimic_chance = 0.0
+        # Item weights (the table's empty band last), see set_weight()
+        self.weights = array('d')
+        self.marks = array('d')  # scale when each weight last changed
+        self.accrued = array('d')  # expected drops before that, per unit of (1 - mimic_chance)
+        self.total = 0.0
+        self.positive = 0  # weights above zero; total is exactly 0.0 when there are none
+        self.scale = 0.0  # sum of 1 / total over the opens before segment_start
+        self.segment_start = 0  # opens when the total last changed
+        self.unweighted_opens = 0  # opens while every weight was zero (those come up empty)
+        self.thefts = 0
+        self.started = time.time()
+        self.error = None  # last snapshot write failure, logged once
+        self.lock = threading.Lock()  # swaps of the counters vs the writer reading them
+        self.wake = threading.Event()
+        self.stopping = False
+        self.thread = None
+
+    def set_loot_table(self, loot_table, mimic_chance=None, weights=None):
+        """Reset the counters for a (new) loot table: a list of entries or a CompiledLootTable.
+
+        weights are the item weights drops are drawn with, when they are
+        not the table's chances (e.g. sold-out items already at zero). A
+        prepared CompiledLootTable without weights costs a few array copies.
+        """
+        if mimic_chance is not None:
+            self.mimic_chance = mimic_chance
+        if isinstance(loot_table, CompiledLootTable):
+            # Normalized chances: they are the bands, and nothing is left empty
+            loot_table.prepare()
+            item_names, bands, empty_band = loot_table.names, loot_table.chances, 0.0
+        else:
+            analytics = LootAnalytics(loot_table, self.mimic_chance)
+            item_names, bands, empty_band = analytics.item_names, analytics.bands, analytics.empty_band
+        item_weights = array('d', bands if weights is None else weights)
+        item_weights.append(empty_band)
+        if weights is None and isinstance(loot_table, CompiledLootTable):
+            total, positive = loot_table.chance_total, loot_table.positive
+        else:
+            total = math.fsum(item_weights)
+            positive = len(item_weights) - item_weights.count(0.0)
+        zeros = array('d', bytes(8 * len(item_weights)))
+        counts = array('Q', bytes(8 * (len(item_weights) + 1)))
+        # Swapped together, so the writer never pairs new weights with old counts
+        with self.lock:
+            self.item_names = item_names
+            self.weights = item_weights
+            self.marks = zeros
+            self.accrued = array('d', zeros)
+            self.total = total
+            self.positive = positive
+            self.scale = 0.0
+            self.segment_start = 0
+            self.unweighted_opens = 0
+            self.counts = counts
+            self.opens = 0
+            self.thefts = 0
+            self.started = time.time()
+
+    def set_weight(self, index, weight):
+        """Draws of item index follow this weight from the next open on, in O(1)"""
+        with self.lock:
+            self.close_segment()
+            weights = self.weights
+            old = weights[index]
+            self.accrued[index] += old * (self.scale - self.marks[index])
+            self.marks[index] = self.scale
+            weights[index] = weight
+            self.positive += (weight > 0) - (old > 0)
+            # Without a positive weight left, rounding must not leave a residue
+            self.total = self.total + weight - old if self.positive else 0.0
+
+    def close_segment(self):
+        """Fold the opens since the total weight last changed into scale"""
+        elapsed = self.opens - self.segment_start
+        if self.total > 0:
+            self.scale += elapsed / self.total
+        else:
+            self.unweighted_opens += elapsed
+        self.segment_start = self.opens
+
+    def expected_counts(self):
+        """Expected count of each bin (items..., mimic, empty) over the opens so far"""
+        elapsed = self.opens - self.segment_start
+        scale, unweighted = self.scale, self.unweighted_opens
+        if self.total > 0:
+            scale += elapsed / self.total
+        else:
+            unweighted += elapsed
+        item_chance = 1 - self.mimic_chance
+        expected = [item_chance * (accrued + weight * (scale - mark))
+                    for accrued, weight, mark in zip(self.accrued, self.weights, self.marks)]
+        expected[-1] += item_chance * unweighted
+        expected.insert(-1, self.mimic_chance * self.opens)
+        return expected
+
+    def record_drop(self, index):
+        self.counts[index] += 1
+        self.opens += 1
+
+    def record_mimic(self):
+        self.counts[-2] += 1
+        self.opens += 1
+
+    def record_empty(self):
+        self.counts[-1] += 1
+        self.opens += 1
+
+    def record_theft(self):
+        self.thefts += 1
+
+    def record_batch(self, counts, thefts=0):
+        """Add many opens at once; counts uses the same layout (items..., mimic, empty)"""
+        totals = self.counts
+        opens = 0
+        for index, count in enumerate(counts):
+            if count:
+                totals[index] += count
+                opens += count
+        self.opens += opens
+        self.thefts += thefts
+
+    def message(self, text):
+        self.recent.append(text)
+
+    def chi_square(self):
+        """(statistic, degrees of freedom) of observed vs expected outcome counts"""
+        counts = list(self.counts)
+        if not sum(counts):
+            return 0.0, 0
+        statistic = 0.0
+        bins = 0
+        pooled_observed = pooled_expected = 0.0
+        for observed, expected in zip(counts, self.expected_counts()):
+            if expected < MIN_EXPECTED:
+                pooled_observed += observed
+                pooled_expected += expected
+                continue
+            statistic += (observed - expected) ** 2 / expected
+            bins += 1
+        if pooled_expected > 0:
+            statistic += (pooled_observed - pooled_expected) ** 2 / pooled_expected
+            bins += 1
+        elif pooled_observed:
+            return math.inf, max(1, bins)  # an outcome that should never happen
+        return statistic, bins - 1
+
+    def p_value(self):
+        statistic, dof = self.chi_square()
+        if statistic == math.inf:
+            return 0.0
+        return chi_square_p_value(statistic, dof)
+
+    def snapshot(self):
+        with self.lock:
+            counts = list(self.counts)
+            statistic, dof = self.chi_square()
+            p_value = 0.0 if statistic == math.inf else chi_square_p_value(statistic, dof)
+            return {
+                "time": time.time(),
+                "seconds": time.time() - self.started,
+                "opens": sum(counts),
+                "mimics": counts[-2] if counts else 0,
+                "empty": counts[-1] if counts else 0,
+                "thefts": self.thefts,
+                "items": {name: count for name, count in zip(self.item_names, counts) if count},
+                "chi_square": statistic,
+                "dof": dof,
+                "p_value": p_value,
+                "drift": p_value < self.alpha,
+                "recent": list(self.recent),
+            }
+
+    def write_snapshot(self):
+        tmp_path = self.path + '.tmp'
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(self.snapshot(), f)
+            os.replace(tmp_path, self.path)
+        except OSError as error:
+            # Disk full, directory removed...: keep counting, retry next tick
+            if str(error) != self.error:
+                self.error = str(error)
+                get_logger().error("telemetry_write_failed", path=self.path, error=self.error,
+                                   message=f"Could not write telemetry to {self.path}: {error}")
+            return
+        self.error = None
+
+    def start(self):
+        if self.path and self.thread is None:
+            self.thread = threading.Thread(target=self.run, name="drop-telemetry", daemon=True)
+            self.thread.start()
+
+    def run(self):
+        while not self.stopping:
+            self.wake.wait(self.interval)
+            self.wake.clear()
+            self.write_snapshot()
+
+    def close(self):
+        """Stop the writer and write a final snapshot"""
+        if self.thread is None:
+            return
+        self.stopping = True
+        self.wake.set()
+        self.thread.join()
+        self.thread = None
+        self.write_snapshot()
+
+
+class NullTelemetry:
+    """Telemetry that records nothing"""
+
+    enabled = False
+
+    def set_loot_table(self, loot_table, mimic_chance=None, weights=None):
+        pass
+
+    def set_weight(self, index, weight):
+        pass
+
+    def record_drop(self, index):
+        pass
+
+    def record_mimic(self):
+        pass
+
+    def record_empty(self):
+        pass
+
+    def record_theft(self):
+        pass
+
+    def record_batch(self, counts, thefts=0):
+        pass
+
+    def message(self, text):
+        pass
+
+
+NULL_TELEMETRY = NullTelemetry()
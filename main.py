@@ -1,4 +1,17 @@
+import sys
+import time
+
+STARTED = time.perf_counter()
+
 from lootbox_sim.game import run_game
+from lootbox_sim.startup import StartupTimer, print_import_report
 
 if __name__ == "__main__":
-    run_game()
\ No newline at end of file
+    startup = StartupTimer(STARTED, exit_after_first_frame="--startup-report" in sys.argv)
+    startup.mark("imports")
+    if startup.exit_after_first_frame:
+        # Cold-start budget: per-module import times, then milestones up to the first frame
+        print_import_report()
+    run_game(startup=startup)
+    if startup.exit_after_first_frame:
+        print(startup.report())
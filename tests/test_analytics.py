@@ -0,0 +1,71 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import math
+import time
+from lootbox_sim.analytics import LootAnalytics
+from lootbox_sim.simulation import BatchSimulator
+
+TABLE = [
+    {"name": "Sword", "chance": 0.6, "rarity": "common"},
+    {"name": "Shield", "chance": 0.3, "rarity": "uncommon"},
+    {"name": "Crown", "chance": 0.1, "rarity": "legendary"},
+]
+
+def test_probabilities_include_mimic_chance():
+    analytics = LootAnalytics(TABLE, mimic_chance=0.2)
+    assert abs(analytics.probability("Crown") - 0.08) < 1e-12
+    assert abs(sum(analytics.probabilities) + 0.2 - 1) < 1e-12
+    assert abs(analytics.expected_opens_for_rarity("legendary") - 12.5) < 1e-9
+    assert analytics.opens_for_confidence(["Crown"], 0.5) == 9
+
+def test_equal_chances_match_coupon_collector():
+    table = [{"name": str(i), "chance": 0.1} for i in range(10)]
+    mean, std = LootAnalytics(table, mimic_chance=0.0).completion_stats()
+    harmonic = sum(1 / k for k in range(1, 11))
+    variance = sum(100 / (k * k) for k in range(1, 11)) - 10 * harmonic
+    assert abs(mean - 10 * harmonic) < 1e-6
+    assert abs(std - math.sqrt(variance)) < 1e-4
+
+def test_completion_quantile_inverts_cdf():
+    analytics = LootAnalytics(TABLE)
+    t = analytics.completion_quantile(0.9)
+    assert abs(analytics.completion_cdf(t) - 0.9) < 1e-6
+    assert analytics.completion_cdf(0) == 0.0
+
+def test_unreachable_item_never_completes():
+    table = TABLE + [{"name": "Ghost", "chance": 0.0}]
+    assert LootAnalytics(table).expected_completion() == math.inf
+
+def test_expected_inventory_matches_simulation():
+    analytics = LootAnalytics(TABLE, mimic_chance=0.3)
+    expected = analytics.expected_inventory(50)
+    sim = BatchSimulator(TABLE, mimic_chance=0.3, seed=5)
+    players = 2000
+    totals = [0] * len(TABLE)
+    for player in range(players):
+        sim.rng.seed(player)
+        result = sim.run(50)
+        for index in result.held:
+            totals[index] += result.counts[index]
+    for name, total in zip(analytics.item_names, totals):
+        assert abs(expected[name] - total / players) < 0.05 * expected[name] + 0.05
+
+def test_large_table_with_shared_chances():
+    table = [{"name": f"Item {i}", "chance": (1 + i % 4) / 25000} for i in range(10000)]
+    analytics = LootAnalytics(table, mimic_chance=0.0)
+    assert len(analytics.groups()) == 4
+    mean, std = analytics.completion_stats()
+    assert mean > 10000 and std > 0
+
+def test_expected_inventory_is_fast_on_large_tables():
+    total = 10000 * 10001 / 2
+    table = [{"name": f"Item {i}", "chance": (i + 1) / total} for i in range(10000)]
+    analytics = LootAnalytics(table, mimic_chance=0.15)
+    start = time.perf_counter()
+    inventory = analytics.expected_inventory(1000)
+    assert time.perf_counter() - start < 1.0
+    # Drops minus thefts: (1 - m) per open, less roughly m per open once items are held
+    assert 0.55 * 1000 < sum(inventory.values()) < 0.85 * 1000
+    assert inventory["Item 9999"] > inventory["Item 0"]
@@ -0,0 +1,76 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Headless Pygame setup
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+import time
+import pygame
+pygame.display.init()
+pygame.display.set_mode((1, 1))
+
+from lootbox_sim.assets import AssetManager
+
+def make_assets(tmp_path):
+    image = pygame.Surface((4, 3), pygame.SRCALPHA)
+    image.fill((255, 0, 0, 128))
+    pygame.image.save(image, str(tmp_path / "chest.png"))
+    (tmp_path / "broken.png").write_bytes(b"not a png")
+    (tmp_path / "click.wav").write_bytes(b"RIFF")
+    (tmp_path / "notes.txt").write_text("ignored")
+    return AssetManager(directories=(str(tmp_path),), max_workers=2)
+
+def wait_until_done(assets, timeout=5.0):
+    deadline = time.time() + timeout
+    while not assets.done and time.time() < deadline:
+        assets.poll()
+        time.sleep(0.001)
+
+def no_audio_device():
+    raise pygame.error("No such audio device")
+
+def test_loads_converts_and_reports_progress(tmp_path, monkeypatch):
+    monkeypatch.setattr(pygame.mixer, "init", no_audio_device)
+    assets = make_assets(tmp_path)
+    assert assets.progress == 1.0
+    assert sorted(assets.load_all()) == ["broken.png", "chest.png", "click.wav"]
+    wait_until_done(assets)
+    assert assets.progress == 1.0
+    chest = assets.get("chest.png")
+    assert chest.get_size() == (4, 3)
+    assert chest.get_flags() & pygame.SRCALPHA
+    assert assets.get("broken.png") is None
+    assert "broken.png" in assets.errors
+    assert assets.get("click.wav") == b"RIFF"  # no audio: raw bytes
+    assets.close()
+
+def test_mixer_starts_with_the_first_sound(tmp_path, monkeypatch):
+    started = []
+    monkeypatch.setattr(pygame.mixer, "get_init", lambda: None)
+    monkeypatch.setattr(pygame.mixer, "init", lambda: started.append(True))
+    assets = make_assets(tmp_path)
+    assets.load("chest.png")
+    assert not started
+    assets.load("click.wav")
+    assets.release("click.wav")
+    assets.load("click.wav")
+    assert started == [True]
+    assets.close()
+
+def test_reference_counting(tmp_path):
+    assets = make_assets(tmp_path)
+    assets.load("chest.png")
+    assets.load("chest.png")
+    wait_until_done(assets)
+    assert assets.requested == 1
+    assets.release("chest.png")
+    assert assets.get("chest.png") is not None
+    assets.release("chest.png")
+    assert assets.get("chest.png") is None
+
+    # Released before the worker finished: the result is discarded
+    assets.load("chest.png")
+    assets.release("chest.png")
+    wait_until_done(assets)
+    assert assets.get("chest.png") is None
+    assets.close()
@@ -0,0 +1,152 @@
+"""Speed benchmarks for loot draws, rendering and simulation.
+
+Each benchmark times the best of several runs and compares the per-call
+cost against tests/benchmark_baselines.json. A benchmark fails when it is
+more than LOOTBOX_BENCH_THRESHOLD (default 3.0) times slower than its
+baseline. Run with LOOTBOX_BENCH_UPDATE=1 to record new baselines.
+
+The baselines are absolute timings from one machine, so the benchmarks
+are skipped unless LOOTBOX_BENCH=1 (or LOOTBOX_BENCH_UPDATE=1) is set.
+"""
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Headless Pygame setup
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+import json
+import time
+import pygame
+import pytest
+
+from lootbox_sim import fonts
+from lootbox_sim.game_screen import GameScreen
+from lootbox_sim.inventory import Inventory
+from lootbox_sim.simulation import BatchSimulator
+from lootbox_sim.particles import ParticlePool, GOLD
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "benchmark_baselines.json")
+THRESHOLD = float(os.environ.get("LOOTBOX_BENCH_THRESHOLD", "3.0"))
+UPDATE = bool(os.environ.get("LOOTBOX_BENCH_UPDATE"))
+
+pytestmark = pytest.mark.skipif(not (os.environ.get("LOOTBOX_BENCH") or UPDATE),
+                                reason="benchmarks run only with LOOTBOX_BENCH=1")
+
+
+def load_baselines():
+    try:
+        with open(BASELINE_PATH) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+BASELINES = load_baselines()
+
+
+def measure(func, number, repeat=5):
+    """Best per-call time in seconds over `repeat` runs of `number` calls"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def check(name, seconds_per_call):
+    """Compare against the stored baseline (or record it when updating)"""
+    if UPDATE:
+        BASELINES[name] = seconds_per_call
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(BASELINES, f, indent=2, sort_keys=True)
+            f.write("\n")
+        return
+    baseline = BASELINES.get(name)
+    if baseline is None:
+        pytest.skip(f"no baseline for {name}")
+    assert seconds_per_call <= baseline * THRESHOLD, (
+        f"{name}: {seconds_per_call * 1e6:.1f}us per call vs baseline {baseline * 1e6:.1f}us")
+
+
+@pytest.fixture
+def game_screen(monkeypatch):
+    pygame.init()
+    display = pygame.display.set_mode((800, 600))
+    fonts.clear()
+    # Other test modules replace SysFont with mocks; benchmarks need real text
+    monkeypatch.setattr(pygame.font, "SysFont", lambda name, size: pygame.font.Font(None, size))
+    gs = GameScreen(800, 600)
+    yield gs, display
+    fonts.clear()
+
+
+def fill_inventory(gs, count):
+    for item in gs.loot_table[:count]:
+        gs.inventory.add_item(item["name"])
+        gs.inventory.add_item(item["name"])
+
+
+def test_bench_open_loot_box(game_screen, capsys):
+    gs, _ = game_screen
+    gs.mimic_chance = 0.0
+
+    def open_box():
+        gs.chest_is_opening = False
+        gs.open_loot_box()
+
+    check("open_loot_box", measure(open_box, 2000))
+
+
+@pytest.mark.parametrize("items", [0, 24, 32])
+def test_bench_draw_inventory(game_screen, items):
+    gs, display = game_screen
+    gs.show_inventory = True
+    fill_inventory(gs, items)
+    gs.popup_text = "You got: Steel Sword"
+    check(f"draw_inventory_{items}", measure(lambda: gs.draw(display), 50))
+
+
+def test_bench_draw_chest_opening(game_screen):
+    gs, display = game_screen
+    gs.chest_is_opening = True
+    gs.chest_open_timer = 0.6
+    check("draw_chest_opening", measure(lambda: gs.draw(display), 100))
+
+
+def test_bench_draw_mimic(game_screen):
+    gs, display = game_screen
+    gs.is_mimic = True
+    gs.mimic_revealed = True
+    gs.mimic_timer = 2.0
+    check("draw_mimic", measure(lambda: gs.draw(display), 100))
+
+
+def test_bench_inventory_add_item():
+    inventory = Inventory()
+    names = [f"Item {i}" for i in range(100)]
+
+    def add_all():
+        for name in names:
+            inventory.add_item(name)
+
+    check("inventory_add_item", measure(add_all, 100) / len(names))
+
+
+def test_bench_batch_simulation():
+    sim = BatchSimulator(seed=1)
+    check("batch_simulation_per_open", measure(lambda: sim.run(100000), 1) / 100000)
+
+
+def test_bench_particles(game_screen):
+    _, display = game_screen
+    pool = ParticlePool(capacity=3000)
+
+    def frame():
+        if len(pool) < 2000:
+            pool.emit(2000 - len(pool), 400, 300, GOLD, life=5.0)
+        pool.update(1 / 60)
+        pool.draw(display)
+
+    check("particles_2000_frame", measure(frame, 30))
@@ -0,0 +1,60 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import io
+import json
+from lootbox_sim import event_log
+from lootbox_sim.event_log import EventLogger, NULL_LOGGER, WARNING, logger_from_environment
+from lootbox_sim.inventory import Inventory
+
+def test_records_written_as_json_lines(tmp_path):
+    path = str(tmp_path / "events.jsonl")
+    logger = EventLogger(path, flush_interval=0.01)
+    logger.start()
+    logger.info("drop", item="Steel Sword", message="You got: Steel Sword")
+    logger.debug("noise")
+    logger.close()
+    with open(path) as f:
+        records = [json.loads(line) for line in f]
+    assert len(records) == 1
+    assert records[0]["event"] == "drop"
+    assert records[0]["level"] == "info"
+    assert records[0]["item"] == "Steel Sword"
+    assert "ts" in records[0]
+
+def test_nothing_written_on_callers_thread():
+    stream = io.StringIO()
+    logger = EventLogger(stream=stream, level=WARNING)
+    logger.info("drop", message="filtered out")
+    logger.warning("mimic", message="MIMIC ENCOUNTER!")
+    assert stream.getvalue() == ""
+    logger.flush()
+    assert stream.getvalue() == "MIMIC ENCOUNTER!\n"
+
+def test_full_queue_drops_instead_of_blocking(tmp_path):
+    path = str(tmp_path / "events.jsonl")
+    logger = EventLogger(path, capacity=3)
+    for i in range(10):
+        logger.info("drop", n=i)
+    assert logger.dropped == 7
+    logger.start()
+    logger.close()
+    with open(path) as f:
+        records = [json.loads(line) for line in f]
+    assert [r.get("n") for r in records[:3]] == [0, 1, 2]
+    assert records[-1] == {**records[-1], "event": "log_dropped", "records": 7}
+
+def test_environment_configuration():
+    assert logger_from_environment({"LOOTBOX_LOG_LEVEL": "off"}) is NULL_LOGGER
+    logger = logger_from_environment({"LOOTBOX_LOG": "x.jsonl", "LOOTBOX_LOG_LEVEL": "error"})
+    assert logger.path == "x.jsonl" and logger.level == event_log.ERROR
+    assert logger_from_environment({}).stream is sys.stdout
+
+def test_print_inventory_single_write(capsys):
+    inventory = Inventory()
+    inventory.add_item("Steel Sword")
+    inventory.add_item("Steel Sword")
+    inventory.add_item("Magic Ring")
+    inventory.print_inventory()
+    assert capsys.readouterr().out == "Inventory:\nSteel Sword: 2\nMagic Ring: 1\n"
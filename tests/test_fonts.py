@@ -0,0 +1,36 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pygame
+from unittest.mock import Mock
+from lootbox_sim import fonts
+
+def test_font_looked_up_once(monkeypatch):
+    fonts.clear()
+    sysfont = Mock(side_effect=lambda name, size: Mock())
+    monkeypatch.setattr(pygame.font, "SysFont", sysfont)
+    first = fonts.get_font(None, 36)
+    assert fonts.get_font(None, 36) is first
+    fonts.get_font(None, 24)
+    assert sysfont.call_count == 2
+
+def test_rendered_text_reused():
+    fonts.clear()
+    font = Mock()
+    font.render.side_effect = lambda text, antialias, color: Mock()
+    first = fonts.render_text(font, "Inventory", (255, 255, 255))
+    assert fonts.render_text(font, "Inventory", (255, 255, 255)) is first
+    fonts.render_text(font, "Inventory", (0, 0, 0))
+    assert font.render.call_count == 2
+
+def test_text_cache_is_bounded(monkeypatch):
+    fonts.clear()
+    monkeypatch.setattr(fonts, "TEXT_CACHE_SIZE", 3)
+    font = Mock()
+    font.render.side_effect = lambda text, antialias, color: Mock()
+    for count in range(5):
+        fonts.render_text(font, str(count), (255, 255, 255))
+    fonts.render_text(font, "0", (255, 255, 255))  # evicted, so rendered again
+    assert font.render.call_count == 6
+    fonts.clear()
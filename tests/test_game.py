@@ -0,0 +1,69 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Headless Pygame setup
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+
+import pygame
+import pytest
+from lootbox_sim import fonts, game
+from lootbox_sim.game import ScreenManager, SCREEN_ACTIONS
+from lootbox_sim.profiler import FrameProfiler
+from lootbox_sim.startup import StartupTimer
+
+class FakeScreen:
+    built = 0
+
+    def __init__(self):
+        FakeScreen.built += 1
+        self.entered = 0
+        self.exited = 0
+
+    def enter(self):
+        self.entered += 1
+
+    def exit(self):
+        self.exited += 1
+
+def test_screens_built_once_and_reused():
+    FakeScreen.built = 0
+    manager = ScreenManager({"menu": FakeScreen, "game": FakeScreen})
+    menu = manager.switch("menu")
+    game = manager.switch("game")
+    assert manager.switch("menu") is menu
+    assert manager.switch("game") is game
+    assert FakeScreen.built == 2
+
+def test_enter_and_exit_hooks():
+    manager = ScreenManager({"menu": FakeScreen, "game": FakeScreen})
+    menu = manager.switch("menu")
+    game = manager.switch("game")
+    manager.switch("menu")
+    assert menu.entered == 2 and menu.exited == 1
+    assert game.entered == 1 and game.exited == 1
+
+def test_switching_to_current_screen_is_noop():
+    manager = ScreenManager({"menu": FakeScreen})
+    menu = manager.switch("menu")
+    manager.switch("menu")
+    assert menu.entered == 1
+
+def test_actions_map_to_screens():
+    assert SCREEN_ACTIONS["start_game"] == "game"
+    assert SCREEN_ACTIONS["back_to_menu"] == "menu"
+
+@pytest.mark.parametrize("profile, overlay", [(False, False), (True, True)])
+def test_overlay_only_when_profiling(tmp_path, monkeypatch, profile, overlay):
+    monkeypatch.delenv("LOOTBOX_PROFILE", raising=False)
+    monkeypatch.setenv("LOOTBOX_LOG_LEVEL", "off")
+    # Real fonts: other test modules replace SysFont with a Mock
+    monkeypatch.setattr(pygame.font, "SysFont", lambda name, size: pygame.font.Font(None, size))
+    fonts.clear()
+    drawn = []
+    monkeypatch.setattr(FrameProfiler, "draw_overlay", lambda self, surface, font: drawn.append(True))
+    game.run_game(profile=profile, trace_path=str(tmp_path / "trace.json"), save_dir="",
+                  startup=StartupTimer(exit_after_first_frame=True))
+    pygame.quit()
+    assert bool(drawn) == overlay
+    assert os.path.exists(tmp_path / "trace.json")
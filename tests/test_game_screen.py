@@ -12,6 +12,7 @@ pygame.display.set_mode((1, 1))  # minimal dummy display
 import pytest
 from unittest.mock import Mock
 from lootbox_sim.game_screen import GameScreen
+from lootbox_sim.loot_table import compile_loot_table
 
 # Mock font for testing
 def mock_sysfont(name, size):
@@ -34,6 +35,15 @@ def test_loot_box_adds_item(monkeypatch):
     assert "Steel Sword" in gs.inventory.items
     assert gs.popup_text.startswith("You got:")
 
+def test_last_item_is_reachable(monkeypatch):
+    gs = GameScreen(800, 600)
+
+    # The shipped chances sum past 1; normalization keeps the rarest item reachable
+    monkeypatch.setattr("random.random", lambda: 0.9999)
+
+    gs.open_loot_box()
+    assert "Universe Crystal" in gs.inventory.items
+
 def test_inventory_toggle():
     gs = GameScreen(800, 600)
     assert gs.show_inventory == False
@@ -112,6 +122,25 @@ def test_inventory_grid_settings():
     assert gs.inventory_start_x == 50
     assert gs.inventory_start_y == 200
 
+def test_inventory_grid_scrolls():
+    gs = GameScreen(800, 600)
+    for i in range(40):
+        gs.inventory.add_item(f"Test Item {i:02d}")
+    gs.show_inventory = True
+    assert gs.max_inventory_scroll() == 3  # 7 rows of 6, 4 visible
+
+    class Wheel:
+        type = pygame.MOUSEWHEEL
+        y = -10
+    gs.handle_event(Wheel())
+    assert gs.inventory_scroll_row == 3
+
+    class Home:
+        type = pygame.KEYDOWN
+        key = pygame.K_HOME
+    gs.handle_event(Home())
+    assert gs.inventory_scroll_row == 0
+
 def test_mimic_initialization():
     gs = GameScreen(800, 600)
     
@@ -191,4 +220,125 @@ def test_mimic_consequence_with_items(monkeypatch):
     assert "Ate " in gs.popup_text  # New shorter format
     assert gs.popup_timer > 0
 
+def test_chest_layers_built_once():
+    gs = GameScreen(800, 600)
+    surface = pygame.Surface((800, 600))
+    gs.draw_treasure_chest(surface)
+    layers = gs.chest_layers
+    gs.chest_is_opening = True
+    gs.chest_open_timer = 0.5
+    gs.draw_treasure_chest(surface)
+    assert gs.chest_layers is layers
+
+def test_dirty_rects_idle_and_animating():
+    gs = GameScreen(800, 600)
+    assert gs.get_dirty_rects() is None  # first frame
+    gs.update(0.016)
+    assert gs.get_dirty_rects() == []  # idle
+    gs.chest_is_opening = True
+    gs.update(0.016)
+    rects = gs.get_dirty_rects()
+    assert len(rects) == 1 and rects[0].contains(gs.loot_box_rect)
+    gs.update(2.0)  # animation ends
+    assert gs.get_dirty_rects() is None
+
+def test_reloaded_table_swapped_in_between_frames():
+    gs = GameScreen(800, 600)
+    gs.inventory.add_item("Steel Sword")
+    watcher = Mock()
+    watcher.poll.return_value = compile_loot_table([
+        {"name": "Steel Sword", "chance": 0.5, "rarity": "common", "icon": "sword"},
+        {"name": "Gem", "chance": 0.5, "rarity": "legendary", "icon": "gem"},
+    ])
+    gs.watch_loot_table(watcher)
+    gs.icon_cache.clear = Mock()
+    gs.update(0.016)
+    assert [item["name"] for item in gs.loot_table] == ["Steel Sword", "Gem"]
+    assert gs.item_index.get("Gem").rarity == "legendary"
+    gs.icon_cache.clear.assert_not_called()  # held item's icon is unchanged
+
+def test_prepared_reload_only_swaps_references():
+    gs = GameScreen(800, 600)
+    gs.inventory.add_item("Steel Sword")
+    reloaded = compile_loot_table([dict(entry, rarity="legendary") if entry["name"] == "Steel Sword"
+                                   else entry for entry in gs.loot_table], b"new")
+    reloaded.prepare(gs.compiled_loot_table)  # as LootTableWatcher does, off the frame loop
+    assert reloaded.rarity_changed == {"Steel Sword"} and not reloaded.icon_changed
+    gs.inventory_view.rebuild = Mock()
+    gs.set_loot_table(reloaded)
+    assert gs.loot_sampler is reloaded.sampler and gs.loot_sampler.rng is gs.rng
+    assert gs.item_index is reloaded.item_index
+    gs.inventory_view.rebuild.assert_called_once()
+
+    # Swapped in again, it gets its own sampler
+    gs.set_item_weight("Steel Sword", 5.0)
+    gs.set_loot_table(reloaded)
+    assert gs.loot_sampler is not reloaded.sampler
+    assert gs.item_weight("Steel Sword") == reloaded.chances[gs.loot_indices["Steel Sword"]]
+
+def test_bulk_open_merges_results_in_one_pass():
+    from lootbox_sim.telemetry import DropTelemetry
+    gs = GameScreen(800, 600, seed=11)
+    telemetry = DropTelemetry()
+    gs.attach_telemetry(telemetry)
+    gs.inventory.add_item("Relic")  # not in the loot table, but a mimic can still eat it
+    result = gs.open_loot_boxes(1000)
+    assert result.opens == 1000
+    assert sum(gs.inventory.items.values()) == 1 + result.drops - result.thefts
+    assert telemetry.opens == 1000 and telemetry.thefts == result.thefts
+    assert gs.chest_is_opening and gs.popup_text.startswith("x1000:")
+
+    # Rarest drops first
+    chances = {item["name"]: item["chance"] for item in gs.loot_table}
+    listed = [line.rsplit(" x", 1)[0] for line in gs.bulk_summary]
+    assert listed == sorted(listed, key=chances.get)
+
+    # One bulk open at a time, like a single open
+    assert gs.open_loot_boxes(10) is None
+    gs.update(2.0)
+    gs.handle_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_1))
+    assert telemetry.opens == 1010
+
+def test_bulk_open_is_reproducible_with_a_seed():
+    first = GameScreen(800, 600, seed=4)
+    second = GameScreen(800, 600, seed=4)
+    first.open_loot_boxes(100)
+    second.open_loot_boxes(100)
+    assert first.inventory.items == second.inventory.items
+
+def test_limited_stock_sells_out():
+    gs = GameScreen(800, 600, seed=2, loot_table=[
+        {"name": "Coin", "chance": 0.5, "rarity": "common", "icon": "coin"},
+        {"name": "Crown", "chance": 0.5, "rarity": "legendary", "icon": "crown", "stock": 3},
+    ])
+    gs.mimic_chance = 0.0
+    for _ in range(100):
+        gs.chest_is_opening = False
+        gs.open_loot_box()
+    assert gs.inventory.items["Crown"] == 3
+    assert gs.stock == {1: 0} and gs.item_weight("Crown") == 0
+
+    # Sales carry over a reload; raising the stock restocks only the difference
+    gs.set_loot_table(gs.compiled_loot_table)
+    assert gs.stock == {1: 0} and gs.item_weight("Crown") == 0
+    gs.set_loot_table([dict(entry, stock=6) if "stock" in entry else entry for entry in gs.loot_table])
+    assert gs.stock == {1: 3} and gs.sold == {"Crown": 3}
+
+    # Bulk opens respect the stock too, and sold-out items can't be boosted back
+    gs.chest_is_opening = False
+    gs.open_loot_boxes(1000)
+    assert gs.inventory.items["Crown"] == 6
+    gs.set_item_weight("Crown", 10.0)
+    assert gs.item_weight("Crown") == 0
+
+def test_set_item_weight_boosts_drops():
+    gs = GameScreen(800, 600, seed=5)
+    gs.mimic_chance = 0.0
+    for entry in gs.loot_table:
+        gs.set_item_weight(entry["name"], 0.0)
+    gs.set_item_weight("Excalibur", 2.0)
+    gs.set_item_weight("Steel Sword", 2.0)
+    gs.open_loot_boxes(200)
+    assert set(gs.inventory.items) == {"Excalibur", "Steel Sword"}
+
 pygame.quit()
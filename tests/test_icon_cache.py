@@ -0,0 +1,46 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Headless Pygame setup
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+import pygame
+
+from lootbox_sim.icon_cache import IconAtlas, IconCache
+
+def make_renderer(calls):
+    def render(surface, item_name, x, y, size):
+        calls.append(item_name)
+        pygame.draw.rect(surface, (255, 0, 0), (x, y, size, size))
+    return render
+
+def test_icon_rendered_once():
+    calls = []
+    atlas = IconAtlas(make_renderer(calls), 20, capacity=4)
+    target = pygame.Surface((100, 100))
+    for _ in range(5):
+        atlas.blit(target, "Sword", 10, 10)
+    assert calls == ["Sword"]
+    assert atlas.hits == 4
+    assert target.get_at((15, 15))[:3] == (255, 0, 0)
+
+def test_least_recently_used_is_evicted():
+    calls = []
+    atlas = IconAtlas(make_renderer(calls), 20, capacity=2)
+    atlas.get("Sword")
+    atlas.get("Shield")
+    atlas.get("Sword")  # Shield is now the oldest
+    atlas.get("Crown")
+    assert "Shield" not in atlas
+    assert "Sword" in atlas and "Crown" in atlas
+    assert len(atlas) == 2
+
+def test_cache_keeps_one_atlas_per_size():
+    calls = []
+    cache = IconCache(make_renderer(calls))
+    target = pygame.Surface((100, 100))
+    cache.blit(target, "Sword", 0, 0, 20)
+    cache.blit(target, "Sword", 0, 0, 40)
+    cache.blit(target, "Sword", 0, 0, 40)
+    assert calls == ["Sword", "Sword"]
+    assert set(cache.atlases) == {20, 40}
@@ -2,7 +2,7 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from lootbox_sim.inventory import Inventory
+from lootbox_sim.inventory import Inventory, CompactInventory, ItemCatalog
 
 def test_add_single_item():
     inv = Inventory()
@@ -21,3 +21,70 @@ def test_add_different_items():
     inv.add_item("Shield")
     assert inv.items["Sword"] == 1
     assert inv.items["Shield"] == 1
+
+def test_remove_item():
+    inv = Inventory()
+    inv.add_item("Sword")
+    inv.add_item("Sword")
+    assert inv.remove_item("Sword")
+    assert inv.items["Sword"] == 1
+    assert inv.remove_item("Sword")
+    assert "Sword" not in inv.items
+    assert not inv.remove_item("Sword")
+
+def test_compact_inventory_dict_api():
+    inv = CompactInventory()
+    inv.add_item("Sword")
+    inv.add_item("Sword")
+    inv.add_item("Shield")
+    assert inv.items["Sword"] == 2
+    assert dict(inv.items) == {"Sword": 2, "Shield": 1}
+    assert len(inv.items) == 2
+    inv.items["Sword"] -= 1
+    del inv.items["Shield"]
+    assert dict(inv.items) == {"Sword": 1}
+
+def test_compact_inventory_shared_catalog_and_add_many():
+    catalog = ItemCatalog(["Sword", "Shield", "Crown"])
+    first = CompactInventory(catalog)
+    second = CompactInventory(catalog)
+    first.add_many([0, 0, 2])
+    second.add_many([1])
+    assert dict(first.items) == {"Sword": 2, "Crown": 1}
+    assert dict(second.items) == {"Shield": 1}
+
+def test_compact_inventory_steal_random():
+    import random
+    inv = CompactInventory()
+    for name in ["Sword", "Shield", "Shield", "Crown"]:
+        inv.add_item(name)
+    rng = random.Random(1)
+    stolen = [inv.steal_random(rng) for _ in range(4)]
+    assert sorted(stolen) == ["Crown", "Shield", "Shield", "Sword"]
+    assert len(inv.items) == 0
+    assert inv.steal_random(rng) is None
+
+def test_merge_applies_net_changes_and_notifies_per_unit():
+    inv = Inventory()
+    inv.add_item("Sword")
+    inv.add_item("Shield")
+    events = []
+    inv.listeners.append(lambda event, name: events.append((event, name)))
+    inv.merge({"Sword": 2, "Shield": -1, "Crown": 1})
+    assert inv.items == {"Sword": 3, "Crown": 1}
+    assert sorted(events) == [("add", "Crown"), ("add", "Sword"), ("add", "Sword"), ("remove", "Shield")]
+
+def test_compact_inventory_merge_restore_and_steal_notify_like_inventory():
+    import random
+    inv = CompactInventory()
+    events = []
+    inv.listeners.append(lambda event, name: events.append((event, name)))
+    inv.restore({"Sword": 1, "Shield": 2})
+    assert events == [] and inv.version == 1
+    inv.merge({"Sword": 2, "Shield": -2, "Crown": 1})
+    assert inv.items == {"Sword": 3, "Crown": 1}
+    assert sorted(events) == [("add", "Crown"), ("add", "Sword"), ("add", "Sword"),
+                              ("remove", "Shield"), ("remove", "Shield")]
+    events.clear()
+    stolen = inv.steal_random(random.Random(2))
+    assert events == [("remove", stolen)]
@@ -0,0 +1,55 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from lootbox_sim.inventory import Inventory
+from lootbox_sim.inventory_view import SortedInventoryView
+
+RARITY = {"Sword": "common", "Crown": "legendary", "Ring": "uncommon", "Staff": "epic"}
+
+def make_view(mode):
+    inventory = Inventory()
+    view = SortedInventoryView(inventory, RARITY.get, mode)
+    return inventory, view
+
+def test_rarity_order_rarest_first():
+    inventory, view = make_view("rarity")
+    for name in ["Sword", "Ring", "Crown", "Staff"]:
+        inventory.add_item(name)
+    assert view.window(0, 10) == ["Crown", "Staff", "Ring", "Sword"]
+
+def test_count_order_updates_incrementally():
+    inventory, view = make_view("count")
+    inventory.add_item("Sword")
+    inventory.add_item("Ring")
+    inventory.add_item("Ring")
+    assert view.window(0, 2) == ["Ring", "Sword"]
+    inventory.add_item("Sword")
+    inventory.add_item("Sword")
+    assert view.window(0, 2) == ["Sword", "Ring"]
+    inventory.remove_item("Ring")
+    inventory.remove_item("Ring")
+    assert view.window(0, 10) == ["Sword"]
+
+def test_mode_change_and_window():
+    inventory, view = make_view("rarity")
+    for name in ["Sword", "Ring", "Crown", "Staff"]:
+        inventory.add_item(name)
+    view.set_mode("name")
+    assert view.window(1, 2) == ["Ring", "Staff"]
+    view.next_mode()
+    assert view.mode == "rarity"
+
+def test_sync_picks_up_direct_edits():
+    inventory, view = make_view("name")
+    inventory.items["Sword"] = 3
+    view.sync()
+    assert view.window(0, 10) == ["Sword"]
+
+def test_sync_picks_up_restored_counts():
+    inventory, view = make_view("count")
+    inventory.add_item("Sword")
+    inventory.restore({"Sword": 1, "Crown": 5})
+    inventory.restore({"Sword": 9})  # same names, new counts
+    view.sync()
+    assert view.window(0, 10) == ["Sword", "Crown"]
@@ -0,0 +1,41 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from lootbox_sim.items import ItemIndex, guess_category, guess_icon
+from lootbox_sim.loot_table import load_loot_table
+
+def test_explicit_metadata_wins_over_keywords():
+    index = ItemIndex([
+        {"name": "Epic Staff", "chance": 0.5, "category": "weapon", "rarity": "epic", "icon": "staff"},
+    ])
+    info = index.get("Epic Staff")
+    assert info.category == "weapon"
+    assert info.rarity == "epic"
+    assert info.icon == "staff"
+    # The keyword heuristic alone would call it legendary
+    assert guess_category("Epic Staff") == "legendary"
+
+def test_legacy_entries_fall_back_to_keywords():
+    index = ItemIndex([{"name": "Wooden Bow", "chance": 1.0}])
+    info = index.get("Wooden Bow")
+    assert info.category == "weapon"
+    assert info.icon == "bow"
+    assert info.rarity == "common"
+
+def test_unknown_items_are_remembered():
+    index = ItemIndex()
+    first = index.get("Test Shield")
+    assert first.category == "armor"
+    assert index.get("Test Shield") is first
+
+def test_guess_icon_defaults_per_category():
+    assert guess_icon("Iron Helmet", "armor") == "armor"
+    assert guess_icon("Mystery Thing", "misc") == "misc"
+
+def test_shipped_table_has_metadata():
+    for entry in load_loot_table():
+        assert {"category", "rarity", "icon"} <= set(entry)
+    index = ItemIndex(load_loot_table())
+    assert index.get("Frost Gauntlets").category == "armor"
+    assert index.get("Dragon Scale Armor").category == "armor"
@@ -0,0 +1,39 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from unittest.mock import Mock
+
+from lootbox_sim.loop import FixedStepLoop, run_headless
+
+def test_fixed_steps_and_alpha():
+    loop = FixedStepLoop(step=0.1)
+    updates = []
+    assert loop.advance(0.25, updates.append) == 2
+    assert updates == [0.1, 0.1]
+    assert abs(loop.alpha - 0.5) < 1e-9
+    assert loop.advance(0.06, updates.append) == 1
+    assert len(updates) == 3
+
+def test_stall_is_capped_by_max_frame_skip():
+    loop = FixedStepLoop(step=0.1, max_frame_skip=3)
+    updates = []
+    assert loop.advance(5.0, updates.append) == 3
+    assert loop.dropped_time > 4.5
+    assert loop.accumulator < 0.1
+
+def test_run_headless_feeds_events_in_order():
+    screen = Mock()
+    screen.handle_event.side_effect = lambda event: "picked" if event == "click" else None
+    actions = run_headless(screen, 5, step=0.5, events={2: ["click"], 4: ["noop"]})
+    assert actions == [(2, "picked")]
+    assert screen.update.call_count == 5
+    assert screen.draw.call_count == 0
+
+def test_steps_is_the_running_step_index():
+    loop = FixedStepLoop(0.01)
+    seen = []
+    loop.advance(0.035, lambda dt: seen.append(loop.steps))
+    loop.advance(0.01, lambda dt: seen.append(loop.steps))
+    assert seen == [0, 1, 2, 3]
+    assert loop.steps == 4
@@ -0,0 +1,141 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+import time
+import pytest
+from lootbox_sim.loot_table import (LootTableError, compile_loot_table, cache_path_for,
+                                    load_compiled_loot_table, FALLBACK_LOOT_TABLE,
+                                    LootTableWatcher)
+from lootbox_sim.sampler import CumulativeSampler
+
+TABLE = [
+    {"name": "Sword", "chance": 0.6, "rarity": "common"},
+    {"name": "Shield", "chance": 0.5},
+    {"name": "Crown", "chance": 0.1},
+    {"name": "Pebble", "chance": 0},
+]
+
+def test_chances_are_normalized():
+    compiled = compile_loot_table(TABLE)
+    assert abs(sum(entry["chance"] for entry in compiled.entries) - 1.0) < 1e-12
+    assert compiled.cumulative[-1] == 1.0
+    assert compiled.entries[0]["rarity"] == "common"
+    assert abs(compiled.raw_total - 1.2) < 1e-12
+
+def test_dead_and_unreachable_entries_reported():
+    compiled = compile_loot_table(TABLE)
+    assert compiled.dead == ["Pebble"]
+    assert compiled.unreachable == ["Crown"]
+    assert len(compiled.problems()) == 3
+
+def test_normalized_table_reaches_last_item():
+    compiled = compile_loot_table(TABLE)
+    sampler = CumulativeSampler.from_cumulative(compiled.cumulative)
+    assert compiled.entries[sampler.index_for(0.999)]["name"] == "Crown"
+
+@pytest.mark.parametrize("table", [
+    [],
+    [{"chance": 0.5}],
+    [{"name": "Sword", "chance": "high"}],
+    [{"name": "Sword", "chance": -1}],
+    [{"name": "Sword", "chance": 0.5}, {"name": "Sword", "chance": 0.5}],
+    [{"name": "Sword", "chance": 0}],
+    [{"name": "Sword", "chance": 0.5, "stock": -1}],
+    [{"name": "Sword", "chance": 0.5, "stock": 2.5}],
+])
+def test_invalid_tables_rejected(table):
+    with pytest.raises(LootTableError):
+        compile_loot_table(table)
+
+def test_cache_round_trip(tmp_path, capsys):
+    path = tmp_path / "table.json"
+    path.write_text(json.dumps(TABLE))
+    first = load_compiled_loot_table(str(path))
+    assert os.path.exists(cache_path_for(str(path)))
+    cached = load_compiled_loot_table(str(path))
+    assert cached.entries == first.entries
+    assert cached.cumulative == first.cumulative
+    assert cached.alias_index == first.alias_index
+    assert cached.dead == ["Pebble"]
+
+def test_stale_cache_ignored(tmp_path, capsys):
+    path = tmp_path / "table.json"
+    path.write_text(json.dumps(TABLE))
+    load_compiled_loot_table(str(path))
+    path.write_text(json.dumps([{"name": "Gem", "chance": 1.0}]))
+    compiled = load_compiled_loot_table(str(path))
+    assert [entry["name"] for entry in compiled.entries] == ["Gem"]
+
+@pytest.mark.parametrize("keep", [30, 47, 90, 130, -5])
+def test_truncated_cache_recompiles(tmp_path, keep):
+    path = tmp_path / "table.json"
+    path.write_text(json.dumps(TABLE))
+    first = load_compiled_loot_table(str(path))
+    cache = cache_path_for(str(path))
+    with open(cache, "rb") as f:
+        data = f.read()
+    with open(cache, "wb") as f:
+        f.write(data[:keep])
+    compiled = load_compiled_loot_table(str(path))
+    assert compiled.entries == first.entries
+    assert compiled.cumulative == first.cumulative
+
+def test_invalid_file_falls_back(tmp_path, capsys):
+    path = tmp_path / "table.json"
+    path.write_text(json.dumps([{"name": "Sword", "chance": -1}]))
+    compiled = load_compiled_loot_table(str(path))
+    assert [entry["name"] for entry in compiled.entries] == [item["name"] for item in FALLBACK_LOOT_TABLE]
+
+def rewrite(path, table):
+    """Write a new table and bump the mtime so the watcher sees a change"""
+    path.write_text(json.dumps(table))
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+def test_watcher_compiles_changed_table(tmp_path):
+    path = tmp_path / "table.json"
+    path.write_text(json.dumps(TABLE))
+    watcher = LootTableWatcher(str(path), load_compiled_loot_table(str(path)).digest)
+    assert watcher.check() is None and watcher.poll() is None
+
+    rewrite(path, TABLE)  # touched but identical content
+    assert watcher.check() is None
+
+    rewrite(path, [{"name": "Gem", "chance": 1.0}])
+    watcher.check()
+    compiled = watcher.poll()
+    assert [entry["name"] for entry in compiled.entries] == ["Gem"]
+    assert compiled.sampler is not None and compiled.indices == {"Gem": 0}  # prepared
+    assert watcher.poll() is None
+
+def test_watcher_keeps_table_on_invalid_edit(tmp_path):
+    path = tmp_path / "table.json"
+    path.write_text(json.dumps(TABLE))
+    watcher = LootTableWatcher(str(path))
+    rewrite(path, [{"name": "Gem", "chance": -1}])
+    assert watcher.check() is None
+    assert watcher.poll() is None
+    assert "invalid chance" in watcher.error
+
+    path.write_text("{ not json")
+    rewrite_time = os.stat(path).st_mtime_ns + 2 * 10**9
+    os.utime(path, ns=(rewrite_time, rewrite_time))
+    assert watcher.check() is None and watcher.error
+
+def test_watcher_thread_picks_up_change(tmp_path):
+    path = tmp_path / "table.json"
+    path.write_text(json.dumps(TABLE))
+    watcher = LootTableWatcher(str(path), interval=0.01)
+    watcher.start()
+    try:
+        rewrite(path, [{"name": "Gem", "chance": 1.0}])
+        for _ in range(500):
+            compiled = watcher.poll()
+            if compiled is not None:
+                break
+            time.sleep(0.01)
+    finally:
+        watcher.close()
+    assert [entry["name"] for entry in compiled.entries] == ["Gem"]
@@ -54,4 +54,31 @@ def test_click_outside_buttons():
     action = menu.handle_event(Event())
     assert action is None
 
+class FakeAssets:
+    def __init__(self):
+        self.progress = 0.0
+
+def test_loading_bar_fills_and_start_still_works():
+    assets = FakeAssets()
+    menu = MenuScreen(800, 600, assets)
+    assert menu.get_dirty_rects() is None
+    assert menu.loading
+    assets.progress = 0.5
+    menu.update(1 / 60)
+    assert menu.get_dirty_rects() == [menu.loading_bar.inflate(4, 4)]
+    assert menu.get_dirty_rects() == []
+    surface = pygame.Surface((800, 600))
+    menu.draw_loading_bar(surface)
+    assert surface.get_at((menu.loading_bar.x + 10, menu.loading_bar.centery))[:3] == (200, 200, 50)
+    class Event:
+        type = pygame.MOUSEBUTTONDOWN
+        button = 1
+        pos = menu.buttons["Start"].center
+    assert menu.handle_event(Event()) == "start_game"
+    assert menu.get_dirty_rects() is None
+    assets.progress = 1.0
+    menu.update(1 / 60)
+    assert not menu.loading
+    assert menu.get_dirty_rects() == [menu.loading_bar.inflate(4, 4)]
+
 pygame.quit()
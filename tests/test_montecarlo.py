@@ -0,0 +1,31 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from lootbox_sim.montecarlo import run_monte_carlo
+
+TABLE = [
+    {"name": "Sword", "chance": 0.6},
+    {"name": "Shield", "chance": 0.3},
+    {"name": "Crown", "chance": 0.1},
+]
+
+def test_totals_cover_all_players():
+    result = run_monte_carlo(20, 100, seed=1, workers=1, loot_table=TABLE)
+    assert result.players == 20
+    assert result.opens == 2000
+    assert sum(result.net_items.values()) == 20
+    assert sum(result.item_totals) == sum(n * players for n, players in result.net_items.items())
+
+def test_results_do_not_depend_on_worker_count():
+    serial = run_monte_carlo(30, 200, seed=7, workers=1, loot_table=TABLE)
+    parallel = run_monte_carlo(30, 200, seed=7, workers=3, loot_table=TABLE)
+    assert serial.item_counts() == parallel.item_counts()
+    assert serial.net_items == parallel.net_items
+    assert serial.thefts == parallel.thefts
+
+def test_worker_throughput_reported():
+    result = run_monte_carlo(8, 50, seed=2, workers=2, loot_table=TABLE)
+    rates = result.worker_throughput()
+    assert len(rates) >= 1
+    assert all(rate > 0 for rate in rates.values())
@@ -0,0 +1,70 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Headless Pygame setup
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+import random
+import pygame
+
+from lootbox_sim.particles import ParticlePool, GOLD, RED
+
+def test_emit_respects_capacity():
+    pool = ParticlePool(capacity=100, rng=random.Random(1))
+    pool.emit(80, 10, 10, GOLD)
+    pool.emit(80, 10, 10, RED)
+    assert len(pool) == 100
+
+def test_expired_particles_removed():
+    pool = ParticlePool(capacity=100, rng=random.Random(2))
+    pool.emit(10, 0, 0, GOLD, life=0.1)
+    pool.emit(5, 0, 0, RED, life=10.0)
+    pool.update(0.2)
+    assert len(pool) == 5
+    assert all(pool.color[i] == RED for i in range(len(pool)))
+
+def test_particles_move_and_fall():
+    pool = ParticlePool(capacity=10, gravity=100.0, rng=random.Random(3))
+    pool.emit(1, 50, 50, GOLD, speed=0.0, life=5.0)
+    pool.update(0.5)
+    x, y = pool.position(0)
+    assert y > 50  # pulled down by gravity
+    assert abs(x - 50) < 1e-3
+
+def test_draw_blits_sprites():
+    pool = ParticlePool(capacity=10, rng=random.Random(4))
+    pool.emit(3, 20, 20, GOLD, speed=0.0, life=1.0)
+    surface = pygame.Surface((40, 40))
+    pool.draw(surface)
+    assert surface.get_at((20, 20))[:3] == (255, 215, 0)
+
+def test_draw_reuses_its_batch():
+    pool = ParticlePool(capacity=10, rng=random.Random(5))
+    pool.emit(6, 20, 20, GOLD, life=0.1)
+    pool.emit(2, 20, 20, RED, life=10.0)
+    surface = pygame.Surface((40, 40))
+    pool.draw(surface)
+    batch = pool.batch
+    assert len(batch) == 8
+    pool.update(0.2)
+    pool.draw(surface)
+    assert pool.batch is batch and len(batch) == 2
+
+def test_draw_rewrites_slot_entries_in_place():
+    pool = ParticlePool(capacity=4, gravity=0.0, rng=random.Random(6))
+    pool.emit(1, 20, 20, GOLD, speed=0.0, life=1.0)
+    entry = pool.entries[0]
+    surface = pygame.Surface((40, 40))
+    pool.draw(surface)
+    assert pool.batch[0] is entry and entry[1].topleft == (16, 16)
+    pool.update(0.55)  # lifetimes are 0.6 to 1.0
+    pool.draw(surface)
+    assert pool.batch[0] is entry and entry[0].get_width() < 8  # a smaller sprite
+
+def test_update_skips_frames_without_expiry():
+    pool = ParticlePool(capacity=10, rng=random.Random(7))
+    pool.emit(3, 0, 0, GOLD, life=1.0)
+    pool.update(0.1)
+    assert len(pool) == 3 and pool.next_death > pool.clock
+    pool.update(1.0)
+    assert len(pool) == 0 and pool.next_death == float("inf")
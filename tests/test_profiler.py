@@ -0,0 +1,42 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import json
+from lootbox_sim.profiler import FrameProfiler, NULL_PROFILER, RingBuffer
+
+def test_ring_buffer_keeps_latest_samples():
+    buffer = RingBuffer(3)
+    for value in range(5):
+        buffer.add(value)
+    assert len(buffer) == 3
+    assert buffer.values() == [2, 3, 4]
+    assert buffer.percentile(0) == 2
+    assert buffer.percentile(100) == 4
+
+def test_phase_records_milliseconds():
+    profiler = FrameProfiler(capacity=10)
+    profiler.record("draw", 1.0, 1.004)
+    profiler.record("draw", 2.0, 2.002)
+    with profiler.phase("update"):
+        pass
+    summary = profiler.summary()
+    assert set(summary) == {"draw", "update"}
+    assert abs(summary["draw"]["max"] - 4.0) < 1e-6
+    assert abs(profiler.percentile("draw", 0) - 2.0) < 1e-6
+
+def test_chrome_trace_dump(tmp_path):
+    profiler = FrameProfiler(trace=True)
+    with profiler.phase("frame"):
+        pass
+    path = tmp_path / "trace.json"
+    profiler.dump_chrome_trace(path)
+    events = json.loads(path.read_text())["traceEvents"]
+    assert len(events) == 1
+    assert events[0]["name"] == "frame" and events[0]["ph"] == "X"
+
+def test_null_profiler_records_nothing():
+    with NULL_PROFILER.phase("draw"):
+        pass
+    assert NULL_PROFILER.summary() == {}
+    assert not NULL_PROFILER.enabled
@@ -0,0 +1,112 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Headless Pygame setup
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+import pygame
+import pytest
+
+from lootbox_sim import fonts
+from lootbox_sim.game_screen import GameScreen
+from lootbox_sim.loop import run_headless
+from lootbox_sim.loot_table import compile_loot_table
+from lootbox_sim.replay import SessionRecorder, load_session, replay_session
+
+
+@pytest.fixture(autouse=True)
+def real_fonts(monkeypatch):
+    pygame.font.init()
+    fonts.clear()
+    monkeypatch.setattr(pygame.font, "SysFont", lambda name, size: pygame.font.Font(None, size))
+    yield
+    fonts.clear()
+
+
+def click(pos):
+    return pygame.event.Event(pygame.MOUSEBUTTONDOWN, {"button": 1, "pos": pos})
+
+
+def record_session(path, seed=7, opens=40):
+    """Start the game from the menu and click the chest every 80 steps"""
+    recorder = SessionRecorder(str(path), seed)
+    recorder.record(0, click((400, 275)))  # menu Start button
+    recorder.record_inventory({"Wooden Sword": 2})
+    for i in range(opens):
+        recorder.record(1 + i * 80, click((400, 300)))
+    recorder.record(2, pygame.event.Event(pygame.KEYDOWN, {"key": pygame.K_i, "mod": 0, "unicode": "i"}))
+    recorder.record(10, pygame.event.Event(pygame.MOUSEMOTION, {"pos": (1, 1), "rel": (0, 0), "buttons": (0, 0, 0)}))
+    recorder.close(opens * 80 + 200)
+
+
+def test_seeded_sessions_are_identical():
+    inventories = []
+    for _ in range(2):
+        gs = GameScreen(800, 600, seed=42)
+        events = {i * 80: [click(gs.loot_box_rect.center)] for i in range(60)}
+        run_headless(gs, 60 * 80 + 200, events=events)
+        inventories.append(dict(gs.inventory.items))
+    assert inventories[0] == inventories[1]
+    assert sum(inventories[0].values()) > 0
+
+
+def test_recording_round_trip(tmp_path):
+    path = tmp_path / "session.jsonl"
+    record_session(path)
+    header, inventory, events, steps = load_session(str(path))
+    assert header["seed"] == 7
+    assert inventory == {"Wooden Sword": 2}
+    assert steps == 40 * 80 + 200
+    # Mouse motion is not recorded; event fields survive the round trip
+    assert 10 not in events
+    assert events[1][0].pos == (400, 300) and events[1][0].button == 1
+
+
+def test_replay_reproduces_inventory(tmp_path):
+    path = tmp_path / "session.jsonl"
+    record_session(path, opens=5)
+    first = replay_session(str(path)).get("game")
+    second = replay_session(str(path), surface=pygame.Surface((800, 600)))
+    assert first.inventory.items == second.get("game").inventory.items
+    assert first.show_inventory
+    assert "frame" in second.profiler.summary()
+    assert "draw" in second.profiler.summary()
+
+
+def test_replay_uses_recorded_tables_and_reloads(tmp_path):
+    path = tmp_path / "session.jsonl"
+    recorder = SessionRecorder(str(path), seed=3)
+    recorder.record(0, click((400, 275)))
+    recorder.record_loot_table(compile_loot_table([{"name": "Pebble", "chance": 1.0}]))
+    recorder.record_loot_table(compile_loot_table([{"name": "Gem", "chance": 1.0}]), 2000)
+    for i in range(20):
+        recorder.record(1 + i * 200, click((400, 300)))  # spaced past a mimic encounter
+    recorder.close(4200)
+
+    header, _, _, _ = load_session(str(path))
+    assert 2000 in header["reloads"]
+    game = replay_session(str(path)).get("game")
+    assert [entry["name"] for entry in game.loot_table] == ["Gem"]
+    # The first ten opens use the starting table, the rest the reloaded one
+    assert set(game.inventory.items) == {"Pebble", "Gem"}
+    assert sum(game.inventory.items.values()) <= 20
+
+def test_replay_restores_earlier_sales(tmp_path):
+    path = tmp_path / "session.jsonl"
+    recorder = SessionRecorder(str(path), seed=3)
+    recorder.record(0, click((400, 275)))
+    recorder.record_inventory({"Crown": 2}, {"Crown": 2})
+    recorder.record_loot_table(compile_loot_table([
+        {"name": "Crown", "chance": 0.5, "stock": 2},
+        {"name": "Pebble", "chance": 0.5},
+    ]))
+    for i in range(20):
+        recorder.record(1 + i * 200, click((400, 300)))
+    recorder.close(4200)
+
+    header, _, _, _ = load_session(str(path))
+    assert header["sold"] == {"Crown": 2}
+    game = replay_session(str(path)).get("game")
+    assert game.sold == {"Crown": 2}
+    assert game.inventory.items.get("Crown", 0) <= 2  # sold out before the session
+    assert game.inventory.items["Pebble"] > 0
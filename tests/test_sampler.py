@@ -0,0 +1,68 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import random
+from lootbox_sim.sampler import CumulativeSampler, AliasSampler, FenwickSampler
+
+def test_cumulative_matches_linear_scan():
+    weights = [0.5, 0.3, 0.2]
+    sampler = CumulativeSampler(weights)
+    assert sampler.index_for(0.0) == 0
+    assert sampler.index_for(0.49) == 0
+    assert sampler.index_for(0.5) == 1
+    assert sampler.index_for(0.79) == 1
+    assert sampler.index_for(0.99) == 2
+
+def test_cumulative_past_total_returns_none():
+    sampler = CumulativeSampler([0.2, 0.3])
+    assert sampler.index_for(0.6) is None
+
+def test_cumulative_uses_injected_rng():
+    class FixedRng:
+        def random(self):
+            return 0.6
+    sampler = CumulativeSampler([0.5, 0.5], rng=FixedRng())
+    assert sampler.sample() == 1
+
+def test_alias_distribution():
+    weights = [1, 2, 7]
+    sampler = AliasSampler(weights, rng=random.Random(42))
+    counts = [0, 0, 0]
+    for _ in range(20000):
+        counts[sampler.sample()] += 1
+    for count, weight in zip(counts, weights):
+        assert abs(count / 20000 - weight / 10) < 0.02
+
+def test_alias_covers_every_index():
+    sampler = AliasSampler([0.25, 0.25, 0.25, 0.25])
+    seen = {sampler.index_for(i / 100) for i in range(100)}
+    assert seen == {0, 1, 2, 3}
+
+def test_fenwick_matches_cumulative_for_normalized_weights():
+    weights = [0.15, 0.0, 0.3, 0.05, 0.5]
+    fenwick = FenwickSampler(weights)
+    cumulative = CumulativeSampler(weights)
+    for i in range(1000):
+        assert fenwick.index_for(i / 1000) == cumulative.index_for(i / 1000)
+
+def test_fenwick_updates_shift_draws():
+    sampler = FenwickSampler([1, 1, 1, 1, 1])
+    assert sampler.prefix_sum(3) == 3.0
+    sampler.update(2, 0)
+    sampler.update(4, 7)
+    assert sampler.total == 10.0
+    seen = {sampler.index_for(i / 100) for i in range(100)}
+    assert seen == {0, 1, 3, 4}
+    assert sampler.index_for(0.35) == 4
+    for index in range(5):
+        sampler.update(index, 0)
+    assert sampler.index_for(0.5) is None
+
+def test_fenwick_distribution_after_updates():
+    sampler = FenwickSampler([5] * 100, rng=random.Random(3))
+    for index in range(100):
+        sampler.update(index, index % 2)  # only odd indices can drop
+    draws = [sampler.sample() for _ in range(5000)]
+    assert all(index % 2 for index in draws)
+    assert abs(sum(index < 50 for index in draws) / 5000 - 0.5) < 0.03
@@ -0,0 +1,58 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from lootbox_sim.simulation import BatchSimulator
+
+TABLE = [
+    {"name": "Sword", "chance": 0.7},
+    {"name": "Shield", "chance": 0.3},
+]
+
+def test_run_counts_every_open():
+    sim = BatchSimulator(TABLE, seed=1)
+    result = sim.run(10000, batch_size=999)
+    assert result.opens == 10000
+    assert result.drops + result.mimics == 10000
+    assert sum(result.counts) == result.drops - result.thefts
+
+def test_no_mimics_keeps_everything():
+    sim = BatchSimulator(TABLE, mimic_chance=0.0, seed=2)
+    result = sim.run(5000)
+    assert result.mimics == 0
+    assert sum(result.inventory.items.values()) == 5000
+    assert abs(result.counts[0] / 5000 - 0.7) < 0.05
+
+def test_mimic_steals_from_inventory():
+    sim = BatchSimulator(TABLE, seed=3)
+    result = sim.run(0)
+    sim.apply(result, [0, 0, 1, sim.mimic_outcome])
+    assert result.thefts == 1
+    assert sum(result.counts) == 2
+
+def test_mimic_with_empty_inventory_steals_nothing():
+    sim = BatchSimulator(TABLE, seed=4)
+    result = sim.run(0)
+    sim.apply(result, [sim.mimic_outcome, sim.empty_outcome])
+    assert result.mimics == 1
+    assert result.thefts == 0
+    assert result.as_dict() == {}
+
+def test_same_seed_is_reproducible():
+    first = BatchSimulator(TABLE, seed=5).run(2000).as_dict()
+    second = BatchSimulator(TABLE, seed=5).run(2000).as_dict()
+    assert first == second
+
+def test_table_past_one_is_clipped():
+    table = [{"name": "A", "chance": 0.9}, {"name": "B", "chance": 0.1}, {"name": "C", "chance": 0.5}]
+    sim = BatchSimulator(table, mimic_chance=0.0, seed=6)
+    result = sim.run(5000)
+    assert "C" not in result.as_dict()
+
+def test_held_items_outside_the_table_can_be_stolen_but_not_drawn():
+    sim = BatchSimulator(TABLE, mimic_chance=0.0, seed=7)
+    result = sim.run(0)
+    result.restore({"Relic": 1})
+    sim.apply(result, [0, sim.mimic_outcome, sim.mimic_outcome])
+    assert result.thefts == 2 and result.as_dict() == {}
+    assert result.item_names == ["Sword", "Shield", "Relic"]
@@ -0,0 +1,29 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from lootbox_sim.loot_table import CompiledLootTable
+from lootbox_sim.startup import StartupTimer, Preloader, import_times
+
+def test_first_mark_wins():
+    timer = StartupTimer(start=0.0)
+    timer.mark("display")
+    first = timer.marks["display"]
+    timer.mark("display")
+    assert timer.marks["display"] == first
+    assert "display" in timer.report()
+
+def test_preloader_inline_and_threaded():
+    inline = Preloader()
+    assert isinstance(inline.result(), CompiledLootTable)
+    threaded = Preloader()
+    threaded.start()
+    assert isinstance(threaded.result(), CompiledLootTable)
+    assert threaded.seconds is not None
+
+def test_game_module_defers_game_screen_import():
+    rows = import_times("lootbox_sim.game")
+    modules = {name for _, _, name in rows}
+    assert "lootbox_sim.game" in modules
+    assert "lootbox_sim.game_screen" not in modules
+    assert "lootbox_sim.loot_table" not in modules
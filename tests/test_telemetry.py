@@ -0,0 +1,135 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Headless Pygame setup
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+import json
+import random
+import time
+import pygame
+pygame.init()
+
+from unittest.mock import Mock
+from lootbox_sim.game_screen import GameScreen
+from lootbox_sim.telemetry import DropTelemetry, chi_square_p_value
+
+TABLE = [
+    {"name": "Sword", "chance": 0.6},
+    {"name": "Shield", "chance": 0.3},
+    {"name": "Crown", "chance": 0.1},
+]
+
+def test_chi_square_p_values():
+    # Textbook 5% critical values
+    assert abs(chi_square_p_value(3.841, 1) - 0.05) < 1e-3
+    assert abs(chi_square_p_value(18.307, 10) - 0.05) < 1e-3
+    assert abs(chi_square_p_value(2.0, 2) - 0.3679) < 1e-3
+    assert chi_square_p_value(500.0, 3) < 1e-100
+
+def fill(telemetry, weights, opens, seed=1):
+    rng = random.Random(seed)
+    bins = list(range(len(weights)))
+    for outcome in rng.choices(bins, weights=weights, k=opens):
+        if outcome == len(weights) - 1:
+            telemetry.record_mimic()
+        else:
+            telemetry.record_drop(outcome)
+
+def test_matching_rates_pass_and_drift_is_flagged():
+    telemetry = DropTelemetry()
+    telemetry.set_loot_table(TABLE, mimic_chance=0.2)
+    fill(telemetry, [0.48, 0.24, 0.08, 0.2], 20000)
+    assert telemetry.opens == 20000
+    assert telemetry.p_value() > telemetry.alpha
+    assert not telemetry.snapshot()["drift"]
+
+    telemetry.set_loot_table(TABLE)
+    fill(telemetry, [0.48, 0.28, 0.04, 0.2], 20000)
+    assert telemetry.snapshot()["drift"]
+
+def test_drift_check_follows_weight_changes():
+    telemetry = DropTelemetry()
+    telemetry.set_loot_table(TABLE, mimic_chance=0.2)
+    fill(telemetry, [0.48, 0.24, 0.08, 0.2], 10000)
+    telemetry.set_weight(0, 0.0)  # Sword sold out, Shield and Crown even
+    telemetry.set_weight(2, 0.3)
+    fill(telemetry, [0.0, 0.4, 0.4, 0.2], 10000, seed=2)
+    assert telemetry.opens == 20000  # weight changes keep the counts
+    expected = telemetry.expected_counts()
+    assert abs(expected[0] - 0.48 * 10000) < 1e-6
+    assert abs(expected[2] - (0.08 + 0.4) * 10000) < 1e-6
+    assert abs(sum(expected) - 20000) < 1e-6
+    assert not telemetry.snapshot()["drift"]
+
+    # Every weight at zero: item draws come up empty
+    for index in range(3):
+        telemetry.set_weight(index, 0.0)
+    assert telemetry.total == 0.0
+    for _ in range(100):
+        telemetry.record_empty()
+    assert abs(telemetry.expected_counts()[-1] - 0.8 * 100) < 1e-6
+
+def test_game_screen_reports_weight_changes(monkeypatch):
+    monkeypatch.setattr(pygame.font, "SysFont", Mock())
+    gs = GameScreen(800, 600, seed=3, loot_table=[
+        {"name": "Coin", "chance": 0.5, "rarity": "common", "icon": "coin"},
+        {"name": "Crown", "chance": 0.5, "rarity": "legendary", "icon": "crown", "stock": 5},
+    ])
+    telemetry = DropTelemetry()
+    gs.attach_telemetry(telemetry)
+    gs.chest_is_opening = False
+    gs.open_loot_boxes(2000)
+    assert telemetry.weights[1] == 0.0  # Crown sold out during the batch
+    assert telemetry.opens == 2000
+    assert abs(telemetry.expected_counts()[1] - 5) < 5
+    gs.chest_is_opening = False
+    gs.open_loot_boxes(2000)
+    gs.set_item_weight("Coin", 3.0)
+    assert telemetry.opens == 4000 and not telemetry.snapshot()["drift"]
+
+def test_game_screen_reports_to_telemetry(monkeypatch, capsys):
+    monkeypatch.setattr(pygame.font, "SysFont", Mock())
+    gs = GameScreen(800, 600, seed=3)
+    telemetry = DropTelemetry()
+    gs.attach_telemetry(telemetry)
+    for _ in range(50):
+        gs.chest_is_opening = gs.is_mimic = False
+        gs.open_loot_box()
+    snapshot = telemetry.snapshot()
+    assert snapshot["opens"] == 50
+    assert sum(snapshot["items"].values()) + snapshot["mimics"] == 50
+    assert snapshot["recent"][-1].startswith("You got:") or snapshot["mimics"]
+    assert capsys.readouterr().out == ""
+
+def test_writer_thread_snapshots_to_file(tmp_path):
+    path = str(tmp_path / "telemetry.json")
+    telemetry = DropTelemetry(path, interval=0.01)
+    telemetry.set_loot_table(TABLE, mimic_chance=0.0)
+    telemetry.start()
+    telemetry.record_drop(2)
+    telemetry.message("You got: Crown")
+    telemetry.close()
+    with open(path) as f:
+        snapshot = json.load(f)
+    assert snapshot["items"] == {"Crown": 1}
+    assert snapshot["recent"] == ["You got: Crown"]
+
+def test_failed_writes_are_logged_and_retried(tmp_path, monkeypatch):
+    logged = []
+    logger = Mock()
+    logger.error.side_effect = lambda event, **fields: logged.append(event)
+    monkeypatch.setattr("lootbox_sim.telemetry.get_logger", lambda: logger)
+    path = tmp_path / "missing" / "telemetry.json"
+    telemetry = DropTelemetry(str(path), interval=0.01)
+    telemetry.set_loot_table(TABLE, mimic_chance=0.0)
+    telemetry.start()
+    time.sleep(0.05)
+    assert telemetry.thread.is_alive()
+    assert logged == ["telemetry_write_failed"]  # once, not every tick
+    (tmp_path / "missing").mkdir()
+    telemetry.record_drop(2)
+    telemetry.close()
+    with open(path) as f:
+        assert json.load(f)["items"] == {"Crown": 1}
+    assert telemetry.error is None